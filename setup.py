@@ -29,6 +29,12 @@ if __name__ == '__main__':
         packages=['uisoup'],
         include_package_data=True,
         install_requires=parse_requirements('requirements.txt'),
+        extras_require={
+            # Element tables; also speeds up mouse motion paths.
+            'table': ['numpy'],
+            # Full XPath support for element trees.
+            'xpath': ['lxml'],
+        },
         zip_safe=False,
         entry_points={
             'console_scripts': [
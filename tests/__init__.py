@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import os
+import sys
+import types
+from platform import system
+
+if system() not in ('Windows', 'Darwin') and 'uisoup' not in sys.modules:
+    # uisoup package picks backend by OS on import and refuses unsupported
+    # ones, so backend independent modules are tested through package
+    # registered without running its __init__.
+    class TooSaltyUISoupException(Exception):
+        pass
+
+    TooSaltyUISoupException.__module__ = 'uisoup'
+
+    _package = types.ModuleType('uisoup')
+    _package.__path__ = [os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), 'uisoup')]
+    _package.TooSaltyUISoupException = TooSaltyUISoupException
+    _package.uisoup = None
+    sys.modules['uisoup'] = _package
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import itertools
+import os
+
+from uisoup.interfaces.i_element import IElement
+from uisoup.utils.element_cache import ElementCache
+
+# Timing benchmarks depend on machine load, so they run only on demand.
+BENCHMARK = bool(os.environ.get('UISOUP_BENCHMARK'))
+
+
+class FakeElement(IElement):
+    """
+    In-memory element that counts property reads, visited elements are
+    counted by is_visible reads.
+    """
+
+    calls = dict()
+    is_top_level_window = False
+    _is_element_cache_enabled = True
+
+    def __init__(self, role_name, name, children=(), location=(0, 0, 10, 10)):
+        self._role_name = role_name
+        self._name = name
+        self._children = list(children)
+        self._location = location
+        self._parent = None
+        self.same_process_windows = []
+        for obj_child in self._children:
+            obj_child._parent = self
+
+    @classmethod
+    def reset_calls(cls):
+        cls.calls.clear()
+
+    @classmethod
+    def get_calls(cls, str_property):
+        return cls.calls.get(str_property, 0)
+
+    @classmethod
+    def _count(cls, str_property):
+        cls.calls[str_property] = cls.calls.get(str_property, 0) + 1
+
+    def click(self, x_offset=None, y_offset=None):
+        ElementCache.invalidate_all()
+
+    def right_click(self, x_offset=None, y_offset=None):
+        ElementCache.invalidate_all()
+
+    def double_click(self, x_offset=None, y_offset=None):
+        ElementCache.invalidate_all()
+
+    def drag_to(self, x, y, x_offset=None, y_offset=None, smooth=True):
+        ElementCache.invalidate_all()
+
+    def set_focus(self):
+        ElementCache.invalidate_all()
+
+    def set_value(self, value):
+        self._name = value
+        ElementCache.invalidate_all()
+
+    @property
+    def key(self):
+        return id(self)
+
+    @property
+    def proc_id(self):
+        return 1
+
+    @property
+    def is_selected(self):
+        return False
+
+    @property
+    def is_checked(self):
+        return False
+
+    @property
+    def is_visible(self):
+        self._count('visible')
+        return True
+
+    @property
+    def is_enabled(self):
+        return True
+
+    @property
+    def acc_parent_count(self):
+        self._count('parent_count')
+        parent_count, obj_parent = 0, self._parent
+        while obj_parent is not None:
+            parent_count += 1
+            obj_parent = obj_parent._parent
+
+        return parent_count
+
+    @property
+    def acc_child_count(self):
+        return len(self._children)
+
+    @property
+    def acc_name(self):
+        self._count('name')
+        return self._name
+
+    @property
+    def acc_c_name(self):
+        return self.acc_role_name + self.acc_name
+
+    @property
+    def acc_location(self):
+        self._count('location')
+        return self._location
+
+    @property
+    def acc_value(self):
+        return None
+
+    @property
+    def acc_description(self):
+        return None
+
+    @property
+    def acc_parent(self):
+        self._count('parent')
+        return self._parent
+
+    @property
+    def acc_selection(self):
+        return None
+
+    @property
+    def acc_focused_element(self):
+        return None
+
+    @property
+    def acc_role_name(self):
+        self._count('role_name')
+        return self._role_name
+
+    def __iter__(self):
+        self._count('iter')
+        return iter(self._children)
+
+    def _find_windows_by_same_proc(self):
+        return list(self.same_process_windows)
+
+
+def build_tree(width=10, depth=3, role_name='pane'):
+    """
+    Builds tree of width ** depth leaves, leaves are 'btn' and 'lbl'
+    elements named itemN and containers are named nodeN.
+
+    :param int width: number of children of every container.
+    :param int depth: depth of leaves.
+    :param str role_name: role name of containers.
+    :rtype: FakeElement
+    :return: root element.
+    """
+    counter = itertools.count()
+
+    def build(level):
+        i = next(counter)
+        if level == depth:
+            return FakeElement('lbl' if i % 3 == 0 else 'btn', 'item%d' % i,
+                               location=(i % 1000, i // 1000 * 20, 10, 10))
+
+        return FakeElement(role_name, 'node%d' % i,
+                           [build(level + 1) for _ in range(width)])
+
+    return build(0)
+
+
+def walk(obj_element):
+    """
+    Gets element and all its descendants in preorder.
+
+    :param FakeElement obj_element: root element.
+    :rtype: list[FakeElement]
+    """
+    result = []
+    lst_stack = [obj_element]
+    while lst_stack:
+        obj_element = lst_stack.pop()
+        result.append(obj_element)
+        lst_stack.extend(reversed(obj_element._children))
+
+    return result
@@ -0,0 +1,100 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+# Doubles of Quartz, AppKit and Carbon that let Mac backend run on machines
+# without them. Backend is imported only when real Quartz is absent,
+# otherwise MAC_DOUBLES is False and tests that use it are skipped.
+
+import os
+import sys
+import types
+from platform import system
+
+try:
+    import Quartz
+    MAC_DOUBLES = False
+except ImportError:
+    MAC_DOUBLES = system() not in ('Windows', 'Darwin')
+
+MacSoup = None
+keyboard_module = None
+CG = None
+
+
+class FakeCoreGraphics(types.ModuleType):
+    """
+    CoreGraphics of on-screen windows that records posted events.
+    Constants are distinct integers and functions that aren't defined
+    return their name and arguments.
+    """
+
+    def __init__(self):
+        super(FakeCoreGraphics, self).__init__('Quartz.CoreGraphics')
+        self.windows = []
+        self.posted = []
+        self._constants = dict()
+
+    def __getattr__(self, str_name):
+        if str_name.startswith('_'):
+            raise AttributeError(str_name)
+        if str_name.startswith('k'):
+            return self._constants.setdefault(str_name,
+                                              len(self._constants) + 1)
+
+        return lambda *args: (str_name,) + args
+
+    def CGWindowListCopyWindowInfo(self, options, window_id):
+        return list(self.windows)
+
+    def CGEventPost(self, tap, event):
+        self.posted.append(event)
+
+
+class _AppleEvents(object):
+
+    def __getattr__(self, str_name):
+        return 0
+
+
+def _install():
+    global MacSoup, keyboard_module, CG
+
+    CG = FakeCoreGraphics()
+    quartz = types.ModuleType('Quartz')
+    quartz.CoreGraphics = CG
+    app_kit = types.ModuleType('AppKit')
+    app_kit.NSAppleScript = object
+    carbon = types.ModuleType('Carbon')
+    carbon.AppleEvents = _AppleEvents()
+    for module in (quartz, CG, app_kit, carbon):
+        sys.modules[module.__name__] = module
+
+    package = types.ModuleType('uisoup.mac_soup')
+    package.__path__ = [os.path.join(sys.modules['uisoup'].__path__[0],
+                                     'mac_soup')]
+    sys.modules['uisoup.mac_soup'] = package
+
+    from uisoup.mac_soup import keyboard, mac_soup
+
+    keyboard_module = keyboard
+    MacSoup = mac_soup.MacSoup
+
+
+if MAC_DOUBLES:
+    _install()
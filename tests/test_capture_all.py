@@ -0,0 +1,145 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import threading
+import time
+import unittest
+
+from tests.doubles import FakeElement, build_tree
+from uisoup.interfaces.i_soup import ISoup
+
+
+class FakeSoup(ISoup):
+    """
+    Soup of in-memory windows that records threads windows are captured in.
+    """
+
+    mouse = None
+    keyboard = None
+
+    def __init__(self, window_count):
+        self.windows = [build_tree(3, 1) for _ in range(window_count)]
+        self.threads = []
+        self.init_count = 0
+
+    def get_object_by_coordinates(self, x, y):
+        return None
+
+    def is_window_exists(self, obj_handle):
+        return obj_handle in self.windows
+
+    def get_window(self, obj_handle=None):
+        return obj_handle
+
+    def get_visible_window_list(self, limit=None):
+        return self.windows[:limit]
+
+    def get_visible_object_list(self, window_name, limit=None):
+        return []
+
+    def _capture_window(self, handle, properties=None, max_depth=None):
+        self.threads.append(threading.current_thread())
+        if handle is self.windows[1]:
+            raise RuntimeError('Window was closed.')
+
+        return super(FakeSoup, self)._capture_window(handle, properties,
+                                                     max_depth)
+
+    def _init_capture_thread(self):
+        self.init_count += 1
+
+
+class SequentialSoup(FakeSoup):
+
+    MAX_CAPTURE_WORKERS = 1
+
+
+class SlowElement(FakeElement):
+    """
+    Element whose name is read with delay like cross-process call, sleep
+    releases GIL as blocking backend calls do.
+    """
+
+    @property
+    def acc_name(self):
+        time.sleep(.005)
+        return self._name
+
+
+class SlowSoup(FakeSoup):
+
+    def __init__(self, window_count):
+        super(SlowSoup, self).__init__(0)
+        self.windows = [
+            SlowElement('frm', 'window%d' % i,
+                        [SlowElement('btn', 'ok'), SlowElement('btn', 'no')])
+            for i in range(window_count)]
+
+    def _capture_window(self, handle, properties=None, max_depth=None):
+        return ISoup._capture_window(self, handle, properties, max_depth)
+
+
+class CaptureAllTest(unittest.TestCase):
+
+    def test_windows_are_captured_in_order(self):
+        soup = FakeSoup(6)
+        dct_snapshots = soup.capture_all(workers=3)
+
+        # Window that failed is skipped.
+        self.assertEqual(list(dct_snapshots),
+                         [x for i, x in enumerate(soup.windows) if i != 1])
+        self.assertEqual(
+            [len(list(x)) for x in dct_snapshots.values()], [3] * 5)
+        self.assertEqual(soup.init_count, 3)
+        self.assertNotIn(threading.current_thread(), soup.threads)
+
+    def test_workers_are_limited_by_window_count(self):
+        soup = FakeSoup(2)
+        soup.capture_all(workers=8)
+
+        self.assertEqual(soup.init_count, 2)
+
+    def test_sequential_capture_is_done_in_calling_thread(self):
+        soup = SequentialSoup(4)
+        dct_snapshots = soup.capture_all(workers=4)
+
+        self.assertEqual(len(dct_snapshots), 3)
+        self.assertEqual(soup.init_count, 1)
+        self.assertEqual(set(soup.threads), {threading.current_thread()})
+
+
+    def test_workers_speed_up_capture(self):
+        soup = SlowSoup(8)
+
+        def measure(workers):
+            start = time.time()
+            dct_snapshots = soup.capture_all(workers, ['name'])
+            self.assertEqual(len(dct_snapshots), 8)
+            return time.time() - start
+
+        # 8 windows of 3 elements, 5 ms per element.
+        sequential_time = measure(1)
+        parallel_time = measure(4)
+
+        self.assertGreater(sequential_time, .12)
+        self.assertLess(parallel_time, sequential_time * .6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests.doubles import FakeElement, build_tree, walk
+from uisoup import TooSaltyUISoupException
+from uisoup.utils.element_cache import ElementCache
+from uisoup.utils.locator import Locator
+
+
+class ElementCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build_tree(10, 3)
+        self.elements = walk(self.root)[1:]
+
+    def test_cache_is_created_on_first_search(self):
+        self.assertIsNone(self.root._element_cache)
+        self.assertTrue(all(el._element_cache is None for el in
+                            self.elements))
+
+        self.root.findall()
+
+        self.assertEqual(len(self.root._element_cache), 1110)
+        self.assertTrue(all(el._element_cache is None for el in
+                            self.elements))
+
+    def test_find_uses_index(self):
+        self.root.findall()
+        cache = self.root._element_cache
+        FakeElement.reset_calls()
+
+        self.assertEqual(self.root.find(name='item500').acc_name, 'item500')
+        # Index is built once, then only candidate is matched.
+        self.assertEqual(FakeElement.get_calls('iter'), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        FakeElement.reset_calls()
+
+        self.root.find(name='item502')
+        self.assertEqual(FakeElement.get_calls('name'), 1)
+        self.assertEqual(FakeElement.get_calls('iter'), 0)
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+
+    def test_stale_element_is_not_returned(self):
+        self.root.findall()
+        obj_element = self.root.find(name='item500')
+        obj_element._name = 'renamed'
+        cache = self.root._element_cache
+
+        self.assertIsNone(cache.find(Locator(name='item500')))
+        self.assertEqual(cache.misses, 1)
+        self.assertRaises(TooSaltyUISoupException, self.root.find,
+                          name='item500')
+
+    def test_eviction(self):
+        cache = ElementCache(max_size=50)
+        for obj_element in self.elements:
+            cache.add(obj_element)
+
+        self.assertEqual(len(cache), 50)
+        self.assertEqual(list(cache), self.elements[-50:])
+        self.assertIsNone(cache.find(Locator(name=self.elements[0]._name)))
+        self.assertIs(cache.find(Locator(name=self.elements[-50]._name)),
+                      self.elements[-50])
+
+    def test_recently_used_element_is_kept(self):
+        cache = ElementCache(max_size=3)
+        first, second, third, fourth = self.elements[:4]
+        for obj_element in (first, second, third):
+            cache.add(obj_element)
+
+        cache.find(Locator(name=first._name))
+        cache.add(fourth)
+
+        self.assertEqual(list(cache), [third, first, fourth])
+
+    def test_first_match_in_document_order_is_returned(self):
+        self.root.findall()
+        cache = self.root._element_cache
+        # item5 becomes most recently used button.
+        self.assertEqual(self.root.find(name='item5').acc_name, 'item5')
+
+        # Same elements as uncached search through the tree finds.
+        self.assertEqual(self.root.find(role_name='btn').acc_name, 'item4')
+        self.assertEqual(self.root.find(name='item1*').acc_name,
+                         build_tree(10, 3).find(name='item1*').acc_name)
+        self.assertEqual(cache.hits, 3)
+
+    def test_invalidation(self):
+        self.root.findall()
+        cache = self.root._element_cache
+
+        self.elements[0].click()
+
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.find(Locator(name='item3')))
+        FakeElement.reset_calls()
+        self.assertEqual(self.root.find(name='item3').acc_name, 'item3')
+        self.assertGreater(FakeElement.get_calls('iter'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import itertools
+from collections import Counter
+import timeit
+import unittest
+
+from tests.doubles import BENCHMARK, FakeElement, build_tree, walk
+from uisoup.utils import element_table
+
+RECT = (100, 0, 300, 40)
+
+
+def is_inside(location, rect):
+    x, y, w, h = location
+    left, top, width, height = rect
+
+    return x >= left and y >= top and x + w <= left + width and \
+        y + h <= top + height
+
+
+def is_overlapping(location1, location2):
+    x1, y1, w1, h1 = location1
+    x2, y2, w2, h2 = location2
+
+    return w1 > 0 and h1 > 0 and w2 > 0 and h2 > 0 and \
+        x1 < x2 + w2 and x2 < x1 + w1 and y1 < y2 + h2 and y2 < y1 + h1
+
+
+@unittest.skipIf(element_table.numpy is None, 'numpy is not installed')
+class ElementTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build_tree(10, 3)
+        self.elements = walk(self.root)
+        self.table = self.root.to_table()
+
+    def test_rows_are_in_preorder(self):
+        self.assertEqual(len(self.table), 1111)
+        self.assertEqual(self.table.elements, self.elements)
+        self.assertEqual(self.table.parent_indices[0], -1)
+        self.assertEqual(self.table.parent_indices[1], 0)
+
+    def test_inside(self):
+        self.assertEqual(
+            self.table.get_elements(self.table.inside(RECT, 'btn')),
+            [el for el in self.elements if el.acc_role_name == 'btn' and
+             is_inside(el.acc_location, RECT)])
+
+    def test_zero_size(self):
+        self.elements[5]._location = (1, 1, 0, 10)
+        table = self.root.to_table()
+
+        self.assertEqual(list(table.zero_size()), [5])
+
+    def test_overlapping_pairs(self):
+        root = build_tree(6, 2)
+        lst_elements = walk(root)
+        table = root.to_table()
+
+        self.assertEqual(
+            [tuple(pair) for pair in table.overlapping_pairs()],
+            [(i, j) for i, j in itertools.combinations(
+                range(len(lst_elements)), 2) if
+             is_overlapping(lst_elements[i].acc_location,
+                            lst_elements[j].acc_location)])
+
+    def test_role_histogram(self):
+        self.assertEqual(
+            self.table.role_histogram(),
+            dict(Counter(el.acc_role_name for el in self.elements)))
+
+    def test_queries_dont_read_properties(self):
+        FakeElement.reset_calls()
+
+        self.table.inside(RECT, 'btn')
+        self.table.zero_size()
+        self.table.role_histogram()
+
+        self.assertEqual(FakeElement.calls, dict())
+
+    @unittest.skipUnless(BENCHMARK, 'UISOUP_BENCHMARK is not set')
+    def test_benchmark(self):
+        # Table is captured once and queried many times, loop reads
+        # properties of every element on every query.
+        loop_time = min(timeit.repeat(
+            lambda: [el for el in self.elements if
+                     el.acc_role_name == 'btn' and
+                     is_inside(el.acc_location, RECT)],
+            number=5, repeat=5))
+        table_time = min(timeit.repeat(
+            lambda: self.table.inside(RECT, 'btn'), number=5, repeat=5))
+
+        self.assertLess(table_time * 5, loop_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests.doubles import FakeElement, build_tree
+from uisoup.utils.snapshot_file import load_snapshot
+
+
+class MapLocationElement(FakeElement):
+    """
+    Element that returns location as one-shot iterator like Mac backend
+    does on python 3.
+    """
+
+    @property
+    def acc_location(self):
+        return map(int, self._location)
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = MapLocationElement(
+            'pane', 'root', [MapLocationElement('btn', 'OK', (),
+                                                (1, 2, 3, 4))])
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_xml_of_iterator_value(self):
+        self.assertIn(u'<btn Name="OK" Location="1,2,3,4"/>',
+                      self.root.toxml())
+
+    def test_snapshot_of_iterator_value(self):
+        obj_button = list(self.root.snapshot())[0]
+
+        self.assertEqual(obj_button.acc_location, (1, 2, 3, 4))
+        # Value is stored, not iterator that is exhausted by first read.
+        self.assertEqual(obj_button.acc_location, (1, 2, 3, 4))
+
+    def test_snapshot_file_of_iterator_value(self):
+        file_path = os.path.join(self.temp_dir, 'tree.snap')
+        self.root.save_snapshot(file_path)
+
+        with load_snapshot(file_path) as obj_snapshot:
+            obj_button = list(obj_snapshot.root)[0]
+            self.assertEqual(tuple(obj_button.acc_location), (1, 2, 3, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests.doubles import FakeElement, build_tree
+from uisoup import TooSaltyUISoupException
+from uisoup.utils.locator import Locator
+
+LOCATORS = {'first': {'name': 'item3'},
+            'middle': Locator(name='item500'),
+            'last': {'name': 'item1110', 'role_name': 'lbl'}}
+
+
+def get_names(dct_elements):
+    return dict((key, obj_element and obj_element.acc_name) for
+                key, obj_element in dct_elements.items())
+
+
+class FindManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build_tree(10, 3)
+
+    def get_visited(self, fn, *args, **kwargs):
+        """
+        Calls function and gets number of containers whose children were
+        walked through.
+        """
+        FakeElement.reset_calls()
+        result = fn(*args, **kwargs)
+
+        return result, FakeElement.get_calls('iter')
+
+    def test_one_walk_serves_all_locators(self):
+        dct_found, visited = self.get_visited(self.root.find_many, LOCATORS)
+
+        self.assertEqual(get_names(dct_found), dict(
+            first='item3', middle='item500', last='item1110'))
+
+        # Separate searches are done in fresh trees, so they aren't served
+        # by element cache.
+        lst_visited = [self.get_visited(
+            build_tree(10, 3).find, locator=locator if
+            isinstance(locator, Locator) else Locator(**locator))[1] for
+            locator in LOCATORS.values()]
+        # Walk is as long as walk to the farthest element.
+        self.assertEqual(visited, max(lst_visited))
+        self.assertLess(visited, sum(lst_visited))
+
+    def test_search_stops_when_required_are_found(self):
+        dct_found, visited = self.get_visited(
+            self.root.find_many, LOCATORS, required=['first'])
+
+        self.assertEqual(get_names(dct_found),
+                         dict(first='item3', middle=None, last=None))
+        self.assertEqual(visited, 3)
+
+    def test_optional_elements_met_before_required_are_found(self):
+        dct_found = self.root.find_many(LOCATORS, required=['last'])
+
+        self.assertEqual(get_names(dct_found), dict(
+            first='item3', middle='item500', last='item1110'))
+
+    def test_all_optional(self):
+        dct_found = self.root.find_many(
+            dict(LOCATORS, missing={'name': 'nope'}), required=[])
+
+        self.assertEqual(get_names(dct_found), dict(
+            first='item3', middle='item500', last='item1110', missing=None))
+
+    def test_missing_required_element(self):
+        with self.assertRaises(TooSaltyUISoupException) as context:
+            self.root.find_many(dict(LOCATORS, missing={'name': 'nope'}),
+                                required=['first', 'missing'])
+
+        self.assertIn('missing: name=nope', str(context.exception))
+        self.assertNotIn('first', str(context.exception))
+
+    def test_duplicate_locators(self):
+        locator = Locator(role_name='btn')
+        dct_found = self.root.find_many(dict(
+            a=locator, b=locator, c={'role_name': 'btn'}))
+
+        self.assertEqual(get_names(dct_found),
+                         dict(a='item4', b='item4', c='item4'))
+        self.assertIs(dct_found['a'], dct_found['c'])
+
+    def test_empty_locators(self):
+        self.assertEqual(self.get_visited(self.root.find_many, {}), ({}, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
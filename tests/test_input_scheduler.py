@@ -0,0 +1,274 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+from functools import partial
+import unittest
+
+from tests import mac_doubles, win_doubles
+from uisoup.interfaces.i_keyboard import IKeyboard, Key
+from uisoup.utils.input_scheduler import InputScheduleReport, \
+    InputScheduler, InputSchedulerThread
+from uisoup.utils.motion import MotionProfile
+
+
+class FakeClock(object):
+    """
+    Clock that advances only when it is read or slept on. Every sleep
+    oversleeps by given time, like sleep on loaded machine does.
+    """
+
+    def __init__(self, tick=.0001, oversleep=0.0):
+        self.now = 100.0
+        self.tick = tick
+        self.oversleep = oversleep
+        self.sleeps = []
+
+    def clock(self):
+        self.now += self.tick
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds + self.oversleep
+
+
+class RecordingSink(object):
+    """
+    Sink of input events that records names and clock times of events.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+
+    def __call__(self, str_name):
+        self.events.append((str_name, self.clock.now))
+
+
+class InputScheduleReportTest(unittest.TestCase):
+
+    def test_statistics(self):
+        report = InputScheduleReport()
+        report.add(0, .001)
+        report.add(.01, .013)
+
+        self.assertEqual(len(report), 2)
+        self.assertAlmostEqual(report.max_lag, .003)
+        self.assertAlmostEqual(report.mean_lag, .002)
+        self.assertAlmostEqual(report.jitter, .001)
+
+    def test_empty_report(self):
+        report = InputScheduleReport()
+
+        self.assertEqual((report.max_lag, report.mean_lag, report.jitter),
+                         (0.0, 0.0, 0.0))
+
+
+class InputSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sink = RecordingSink(self.clock)
+        self.scheduler = InputScheduler(clock=self.clock.clock,
+                                        sleep=self.clock.sleep)
+
+    def schedule(self, *events):
+        return [(event_time, partial(self.sink, str_name)) for
+                event_time, str_name in events]
+
+    def test_events_are_dispatched_in_time_order(self):
+        report = self.scheduler.run(self.schedule(
+            (.03, 'up'), (0, 'move'), (.01, 'down'), (.01, 'down2')))
+
+        # Events with equal time keep given order.
+        self.assertEqual([x[0] for x in self.sink.events],
+                         ['move', 'down', 'down2', 'up'])
+        self.assertEqual(report.requested, [0, .01, .01, .03])
+        self.assertIs(self.scheduler.last_report, report)
+
+    def test_events_are_dispatched_at_their_deadlines(self):
+        report = self.scheduler.run(self.schedule(
+            (0, 'a'), (.05, 'b'), (.1, 'c')))
+        start = self.sink.events[0][1]
+
+        for (_, event_time), requested in zip(self.sink.events, (0, .05,
+                                                                  .1)):
+            self.assertGreaterEqual(event_time - start, requested - .0002)
+        # Lag is within few clock reads as scheduler spins near deadline.
+        self.assertLess(report.max_lag, .001)
+        self.assertLess(report.jitter, .001)
+
+    def test_sleep_stops_before_deadline(self):
+        self.scheduler.sleep(.05)
+
+        self.assertAlmostEqual(self.clock.sleeps[0],
+                               .05 - self.scheduler.spin_threshold,
+                               delta=.001)
+        self.assertEqual(set(self.clock.sleeps[1:]), {0})
+
+    def test_oversleep_is_reported_as_lag(self):
+        self.clock.oversleep = .004
+        report = self.scheduler.run(self.schedule(
+            (0, 'a'), (.05, 'b'), (.1, 'c')))
+
+        # Delays of events don't accumulate.
+        self.assertLess(report.max_lag, .004)
+        self.assertGreater(report.max_lag, .001)
+        self.assertEqual(len(self.sink.events), 3)
+
+    def test_background_thread(self):
+        thread = self.scheduler.start(self.schedule(
+            (0, 'a'), (.01, 'b'), (.02, 'c')))
+        report = thread.wait(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(report), 3)
+        self.assertEqual([x[0] for x in self.sink.events], ['a', 'b', 'c'])
+
+    def test_stopped_thread_drops_remaining_events(self):
+        lst_events = self.schedule((0, 'a'), (.02, 'c'))
+        thread = InputSchedulerThread(
+            self.scheduler, lst_events + [(.01, lambda: thread.stop())])
+        thread.start()
+        report = thread.wait(5)
+
+        self.assertEqual([x[0] for x in self.sink.events], ['a'])
+        self.assertEqual(report.requested, [0, .01])
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class MouseSchedulingTest(unittest.TestCase):
+
+    def test_smooth_move_is_paced_by_scheduler(self):
+        clock = FakeClock()
+        lst_times = []
+        obj_mouse = win_doubles.element_module.WinMouse(
+            submit=lambda inputs: lst_times.append(clock.now))
+        obj_mouse.scheduler = InputScheduler(clock=clock.clock,
+                                             sleep=clock.sleep)
+
+        obj_mouse.move(500, 0, motion_profile=MotionProfile(steps=5,
+                                                            duration=.05))
+
+        # One event per point, 10 ms apart.
+        self.assertEqual(len(lst_times), 5)
+        for i in range(1, 5):
+            self.assertAlmostEqual(lst_times[i] - lst_times[0], i * .01,
+                                   delta=.001)
+        self.assertEqual(len(obj_mouse.scheduler.last_report), 5)
+
+
+
+class RecordingKeys(object):
+    """
+    Keyboard mixin that records key events with clock times, every event
+    takes 3 ms to be sent.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+        self.scheduler = InputScheduler(clock=clock.clock, sleep=clock.sleep)
+
+    def _record(self, str_action, code):
+        self.events.append((str_action, code, self.clock.now))
+        self.clock.now += .003
+
+    def press_key_and_hold(self, hex_key_code):
+        self._record('down', hex_key_code)
+
+    def release_key(self, hex_key_code):
+        self._record('up', hex_key_code)
+
+
+class KeyboardDouble(RecordingKeys, IKeyboard):
+
+    codes = None
+
+    def press_key(self, hex_key_code):
+        self.press_key_and_hold(hex_key_code)
+        self.release_key(hex_key_code)
+
+    def send(self, *args, **kwargs):
+        self._send_keys(args, kwargs.get('delay', 0))
+
+
+class KeyboardSchedulingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def get_times(self, obj_keyboard, str_action='down'):
+        start = obj_keyboard.events[0][2]
+
+        return [(code, round(event_time - start, 3)) for
+                action, code, event_time in obj_keyboard.events if
+                action == str_action]
+
+    def check_long_send(self, obj_keyboard):
+        keys = [Key(i) for i in range(50)]
+
+        obj_keyboard.send(*keys, delay=.01)
+
+        lst_times = self.get_times(obj_keyboard)
+        self.assertEqual([code for code, _ in lst_times], list(range(50)))
+        # Sending takes 6 ms per key, but it doesn't shift deadlines.
+        self.assertAlmostEqual(lst_times[-1][1], 49 * .06, delta=.001)
+        # Last key is given time to be processed.
+        self.assertGreaterEqual(
+            round(self.clock.now - obj_keyboard.events[0][2], 3), 50 * .06)
+
+    def test_keys_are_sent_at_deadlines(self):
+        self.check_long_send(KeyboardDouble(self.clock))
+
+    def test_modifier_is_held_while_children_are_sent(self):
+        obj_keyboard = KeyboardDouble(self.clock)
+        obj_keyboard.send(Key(1).modify(Key(2), Key(3)), Key(4))
+
+        self.assertEqual([x[:2] for x in obj_keyboard.events],
+                         [('down', 1), ('down', 2), ('up', 2), ('down', 3),
+                          ('up', 3), ('up', 1), ('down', 4), ('up', 4)])
+        self.assertEqual(self.get_times(obj_keyboard),
+                         [(1, 0), (2, 0.003), (3, .05), (4, .15)])
+        self.assertEqual(self.get_times(obj_keyboard, 'up')[-2], (1, .1))
+
+    @unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+    def test_windows_keyboard(self):
+        keyboard_class = type('RecordingWinKeyboard', (
+            RecordingKeys, win_doubles.WinSoup.keyboard.__class__), {})
+
+        self.check_long_send(keyboard_class(self.clock))
+
+    @unittest.skipUnless(mac_doubles.MAC_DOUBLES, 'Quartz doubles are off')
+    def test_mac_keyboard(self):
+        keyboard_class = type('RecordingMacKeyboard', (
+            RecordingKeys, mac_doubles.keyboard_module.MacKeyboard), {})
+        obj_keyboard = keyboard_class(self.clock)
+
+        obj_keyboard.send(Key(1).modify(Key(2)), Key(4))
+
+        # Modifier is given time to be processed.
+        self.assertEqual(self.get_times(obj_keyboard),
+                         [(1, 0), (2, .05), (4, .15)])
+        self.clock = FakeClock()
+        self.check_long_send(keyboard_class(self.clock))
+
+
+if __name__ == '__main__':
+    unittest.main()
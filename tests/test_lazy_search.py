@@ -0,0 +1,103 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+from itertools import islice
+import unittest
+
+from tests import mac_doubles
+from tests.doubles import FakeElement, build_tree, walk
+
+
+class LazySearchTest(unittest.TestCase):
+
+    def setUp(self):
+        # 10 + 100 + 1000 elements below root.
+        self.root = build_tree(10, 3)
+        FakeElement.reset_calls()
+
+    def test_iterfind_walks_tree_on_demand(self):
+        iter_ = self.root.iterfind(name='item*')
+        self.assertEqual(FakeElement.get_calls('visible'), 0)
+
+        # Preorder: node1, node2, item3.
+        self.assertEqual(next(iter_).acc_name, 'item3')
+        self.assertEqual(FakeElement.get_calls('visible'), 3)
+
+        self.assertEqual([el.acc_name for el in islice(iter_, 2)],
+                         ['item4', 'item5'])
+        self.assertEqual(FakeElement.get_calls('visible'), 5)
+
+    def test_findall_limit_stops_traversal(self):
+        self.assertEqual(
+            [el.acc_name for el in self.root.findall(name='item*', limit=2)],
+            ['item3', 'item4'])
+        self.assertEqual(FakeElement.get_calls('visible'), 4)
+
+        FakeElement.reset_calls()
+        self.assertEqual(len(self.root.findall(limit=50)), 50)
+        self.assertEqual(FakeElement.get_calls('visible'), 50)
+
+    def test_limit_above_match_count(self):
+        self.assertEqual(self.root.findall(role_name='pane', limit=1000),
+                         self.root.findall(role_name='pane'))
+
+    def test_count(self):
+        for kwargs in [dict(), dict(role_name='btn'), dict(name='item1*'),
+                       dict(max_depth=2), dict(name='nope')]:
+            self.assertEqual(self.root.count(**kwargs),
+                             len(self.root.findall(**kwargs)), kwargs)
+
+        self.assertEqual(self.root.count(role_name='lbl'),
+                         len([el for el in walk(self.root) if
+                              el.acc_role_name == 'lbl']))
+
+
+@unittest.skipUnless(mac_doubles.MAC_DOUBLES, 'Quartz doubles are off')
+class MacVisibleListTest(unittest.TestCase):
+
+    def setUp(self):
+        mac_doubles.CG.windows = [
+            {'kCGWindowName': 'Window%d' % i, 'kCGWindowOwnerName': 'App',
+             'kCGWindowBounds': {'Width': 100, 'Height': 100}} for i in
+            range(10)]
+        self.soup = mac_doubles.MacSoup()
+        self.window_names = []
+        self.window = build_tree(10, 2)
+        self.soup.get_window = lambda name: \
+            self.window_names.append(name) or self.window
+        FakeElement.reset_calls()
+
+    def test_window_list_limit(self):
+        self.assertEqual(len(self.soup.get_visible_window_list(limit=3)), 3)
+        self.assertEqual(self.window_names,
+                         ['Window0App', 'Window1App', 'Window2App'])
+
+        self.assertEqual(len(self.soup.get_visible_window_list()), 10)
+
+    def test_object_list_limit(self):
+        self.assertEqual(
+            len(self.soup.get_visible_object_list('Window0App', limit=5)), 5)
+        self.assertEqual(FakeElement.get_calls('visible'), 5)
+
+        self.assertEqual(
+            len(self.soup.get_visible_object_list('Window0App')), 110)
+
+
+if __name__ == '__main__':
+    unittest.main()
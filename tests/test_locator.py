@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import re
+import timeit
+import unittest
+
+from tests.doubles import BENCHMARK, FakeElement, build_tree, walk
+from uisoup import TooSaltyUISoupException
+from uisoup.utils.common import CommonUtils
+from uisoup.utils.locator import Locator
+
+
+def legacy_match(obj_element, only_visible, **kwargs):
+    """
+    Matching as it was done before Locator: wildcard is converted to regex
+    and matched without compilation for every property of every element.
+    """
+    try:
+        if only_visible and not obj_element.is_visible:
+            return False
+
+        for str_property, expected_result in kwargs.items():
+            attr = getattr(obj_element, 'acc_' + str_property)
+            if callable(expected_result):
+                if not expected_result(attr):
+                    return False
+            elif not re.match(
+                    CommonUtils.convert_wildcard_to_regex(expected_result),
+                    attr):
+                return False
+    except:
+        return False
+
+    return True
+
+
+class LocatorTest(unittest.TestCase):
+
+    QUERIES = [dict(name='item5'),
+               dict(name='item1*', role_name='btn'),
+               dict(name='*5', role_name='b?n'),
+               dict(c_name='btnitem1?3'),
+               dict(name=lambda x: x.endswith('7'))]
+
+    def setUp(self):
+        self.root = build_tree(20, 2)
+        self.elements = walk(self.root)
+
+    def test_same_results_as_legacy_match(self):
+        for kwargs in self.QUERIES:
+            locator = Locator(**kwargs)
+            self.assertEqual(
+                [el for el in self.elements if locator.match(el)],
+                [el for el in self.elements if
+                 legacy_match(el, True, **kwargs)], kwargs)
+
+    def test_matchers(self):
+        obj_element = FakeElement('btn', 'Save as...')
+
+        self.assertTrue(Locator(name='Save as...').match(obj_element))
+        self.assertTrue(Locator(name='Save*').match(obj_element))
+        self.assertTrue(Locator(name='*...').match(obj_element))
+        self.assertTrue(Locator(name='S?ve*').match(obj_element))
+        self.assertTrue(Locator(name=re.compile('Save')).match(obj_element))
+        self.assertTrue(Locator(name=lambda x: 'as' in x).match(obj_element))
+        self.assertFalse(Locator(name='Save').match(obj_element))
+        self.assertFalse(Locator(name='*as').match(obj_element))
+        self.assertFalse(Locator(role_name='lbl').match(obj_element))
+        self.assertFalse(Locator(unknown='x').match(obj_element))
+
+    def test_build(self):
+        locator = Locator(role_name='btn')
+
+        self.assertIs(Locator.build(locator), locator)
+        self.assertEqual(
+            Locator.build(locator, name='OK').conditions,
+            dict(role_name='btn', name='OK'))
+        self.assertEqual(locator.exact_conditions, dict(role_name='btn'))
+
+    def test_reuse_in_find(self):
+        locator = Locator(role_name='btn', name='item2*')
+
+        self.assertEqual(self.root.find(locator=locator).acc_name, 'item2')
+        self.assertEqual(
+            self.root.findall(locator=locator),
+            [el for el in self.elements[1:] if
+             legacy_match(el, True, role_name='btn', name='item2*')])
+        self.assertTrue(self.root.is_object_exists(locator))
+        self.assertFalse(self.root.is_object_exists(Locator(name='nope')))
+        self.assertRaises(TooSaltyUISoupException, self.root.find,
+                          locator=locator, name='nope')
+
+    def test_cheap_condition_is_evaluated_first(self):
+        root = build_tree(10, 3)
+        lst_labels = [el for el in walk(root) if el.acc_role_name == 'lbl']
+        FakeElement.reset_calls()
+
+        self.assertEqual(root.findall(parent_count=3, role_name='lbl'),
+                         lst_labels)
+        # Role name is read for every visited element and expensive parent
+        # count only for elements that passed role name condition.
+        self.assertEqual(FakeElement.get_calls('role_name'),
+                         FakeElement.get_calls('visible'))
+        self.assertEqual(FakeElement.get_calls('parent_count'),
+                         len(lst_labels))
+
+    def test_order_adapts_to_observed_selectivity(self):
+        # Conditions have equal cost, so location is evaluated first until
+        # locator sees that it never rejects elements.
+        locator = Locator(location=lambda x: True, name='item1*')
+        FakeElement.reset_calls()
+
+        lst_matched = [el for el in self.elements if locator.match(el)]
+
+        window = Locator._REORDER_INTERVAL - 1
+        self.assertEqual(
+            FakeElement.get_calls('location'),
+            window + len([el for el in self.elements[window:] if
+                          el._name.startswith('item1')]))
+        self.assertEqual(FakeElement.get_calls('name'), len(self.elements))
+        self.assertEqual(lst_matched, [el for el in self.elements if
+                                       el._name.startswith('item1')])
+
+    @unittest.skipUnless(BENCHMARK, 'UISOUP_BENCHMARK is not set')
+    def test_benchmark(self):
+        elements = walk(build_tree(30, 2))
+
+        for kwargs in self.QUERIES[:4]:
+            locator = Locator(**kwargs)
+            legacy_time = min(timeit.repeat(
+                lambda: [legacy_match(el, True, **kwargs) for el in elements],
+                number=5, repeat=7))
+            locator_time = min(timeit.repeat(
+                lambda: [locator.match(el) for el in elements],
+                number=5, repeat=7))
+
+            self.assertLess(locator_time, legacy_time, kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from uisoup import TooSaltyUISoupException
+from uisoup.utils import motion
+from uisoup.utils.motion import EASINGS, MotionProfile
+
+
+class MotionProfileTest(unittest.TestCase):
+
+    def test_invalid_profiles(self):
+        for kwargs in [dict(duration=1, speed=100), dict(speed=0),
+                       dict(steps=0), dict(easing='bounce')]:
+            self.assertRaises(TooSaltyUISoupException, MotionProfile,
+                              **kwargs)
+
+    def test_teleport(self):
+        self.assertEqual(MotionProfile.teleport().get_path(0, 0, 500, 300),
+                         [(500, 300, 0.0)])
+
+    def test_legacy(self):
+        lst_path = MotionProfile.legacy().get_path(0, 0, 5, 5)
+
+        # Points don't depend on distance.
+        self.assertEqual(len(lst_path), 100)
+        self.assertAlmostEqual(lst_path[0][2], .01)
+        self.assertEqual(lst_path[-1], (5, 5, 1.0))
+
+    def test_duration_by_speed(self):
+        obj_profile = MotionProfile(speed=1000)
+
+        self.assertAlmostEqual(obj_profile.get_duration(500), .5)
+        lst_path = obj_profile.get_path(0, 0, 300, 400)
+        self.assertEqual(len(lst_path), 50)
+        self.assertEqual(lst_path[-1][:2], (300, 400))
+        self.assertAlmostEqual(lst_path[-1][2], .5)
+
+    def test_steps_dont_exceed_distance(self):
+        obj_profile = MotionProfile(duration=1)
+
+        self.assertEqual(obj_profile.get_steps(3, 1), 3)
+        self.assertEqual(len(obj_profile.get_path(10, 10, 10, 10)), 1)
+        self.assertEqual(len(obj_profile.get_path(0, 0, 1000, 0)), 100)
+        # Steps given explicitly are kept.
+        self.assertEqual(len(MotionProfile(steps=20).get_path(0, 0, 3, 0)),
+                         20)
+
+    def test_easings(self):
+        for str_name, easing in EASINGS.items():
+            lst_path = MotionProfile(steps=10, easing=str_name).get_path(
+                0, 0, 1000, 0)
+            lst_xs = [x for x, _, _ in lst_path]
+
+            self.assertEqual(easing(0), 0, str_name)
+            self.assertEqual(easing(1), 1, str_name)
+            self.assertEqual(lst_xs, sorted(lst_xs), str_name)
+            self.assertEqual(lst_xs[-1], 1000, str_name)
+
+        # Slow start covers less path in first half than fast start.
+        ease_in = MotionProfile(steps=10, easing='ease_in').get_path(
+            0, 0, 1000, 0)
+        ease_out = MotionProfile(steps=10, easing='ease_out').get_path(
+            0, 0, 1000, 0)
+        self.assertLess(ease_in[4][0], 500)
+        self.assertGreater(ease_out[4][0], 500)
+
+    def test_custom_easing(self):
+        lst_path = MotionProfile(steps=4, easing=lambda t: t ** 0).get_path(
+            0, 0, 100, 100)
+
+        self.assertEqual([(x, y) for x, y, _ in lst_path], [(100, 100)] * 4)
+
+    @unittest.skipIf(motion.numpy is None, 'numpy is not installed')
+    def test_numpy_path_is_same_as_python_one(self):
+        obj_profile = MotionProfile(speed=700, easing='ease_in_out')
+        lst_numpy_path = obj_profile.get_path(1200, 40, -300, 900)
+
+        numpy_module, motion.numpy = motion.numpy, None
+        try:
+            lst_python_path = obj_profile.get_path(1200, 40, -300, 900)
+        finally:
+            motion.numpy = numpy_module
+
+        self.assertEqual([x[:2] for x in lst_numpy_path],
+                         [x[:2] for x in lst_python_path])
+        for numpy_point, python_point in zip(lst_numpy_path,
+                                             lst_python_path):
+            self.assertAlmostEqual(numpy_point[2], python_point[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
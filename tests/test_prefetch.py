@@ -0,0 +1,84 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests import win_doubles
+from tests.win_doubles import FakeAcc, build_acc_tree
+from uisoup.utils.element_cache import ElementCache
+from uisoup.utils.motion import MotionProfile
+
+PREFETCH = ['name', 'role_name', 'location', 'state']
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class PrefetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.acc_root = build_acc_tree(3, 2)
+        self.root = win_doubles.WinElement(self.acc_root, 0, (), 0)
+
+    def test_prefetched_properties_are_served_without_com_calls(self):
+        lst_elements = self.root.findall(prefetch=PREFETCH)
+        FakeAcc.reset_calls()
+
+        for obj_element in lst_elements:
+            obj_element.acc_c_name
+            obj_element.acc_location
+            obj_element.is_visible
+
+        self.assertEqual(FakeAcc.calls, dict())
+
+        lst_elements[0].refresh()
+        lst_elements[0].acc_name
+        self.assertEqual(FakeAcc.calls, dict(name=1))
+
+    def test_each_property_is_read_once_per_element(self):
+        FakeAcc.reset_calls()
+        self.root.findall(prefetch=PREFETCH, name='item*', role_name='btn',
+                          location=lambda x: x[2] > 0)
+
+        for str_call in ('name', 'role', 'location', 'state'):
+            self.assertEqual(FakeAcc.calls[str_call], 12, str_call)
+
+    def test_keyboard_input_drops_prefetched_values(self):
+        self.root.findall(prefetch=PREFETCH)
+        self.acc_root.children[0].children[0].name = 'renamed'
+        self.assertTrue(self.root.is_object_exists(name='item2'))
+
+        win_doubles.WinSoup.keyboard.press_key(0x41)
+
+        self.assertFalse(self.root.is_object_exists(name='item2'))
+        self.assertTrue(self.root.is_object_exists(name='renamed'))
+
+    def test_mouse_input_drops_prefetched_values(self):
+        lst_inputs = []
+        obj_mouse = win_doubles.element_module.WinMouse(
+            submit=lst_inputs.append)
+        obj_mouse.motion_profile = MotionProfile.teleport()
+        generation = ElementCache._generation
+
+        obj_mouse.click(10, 10)
+
+        self.assertEqual(len(lst_inputs), 2)
+        self.assertGreater(ElementCache._generation, generation)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests.doubles import FakeElement
+from uisoup import TooSaltyUISoupException
+from uisoup.utils.relation import Relation
+
+
+class MapLocationElement(FakeElement):
+    """
+    Element that returns location as one-shot iterator like Mac backend
+    does on python 3.
+    """
+
+    @property
+    def acc_location(self):
+        return map(int, self._location)
+
+
+class RelationTest(unittest.TestCase):
+
+    def setUp(self):
+        # Form of two rows: label, text field and button in every row.
+        self.name_label = FakeElement('lbl', 'Name', (), (10, 10, 50, 20))
+        self.name_text = FakeElement('txt', 'name', (), (70, 10, 150, 20))
+        self.name_button = FakeElement('btn', 'Go1', (), (230, 10, 40, 20))
+        self.mail_label = FakeElement('lbl', 'Mail', (), (10, 40, 50, 20))
+        self.mail_text = FakeElement('txt', 'mail', (), (70, 40, 150, 20))
+        self.mail_button = FakeElement('btn', 'Go2', (), (230, 40, 40, 20))
+        self.hidden = FakeElement('txt', 'hidden', (), (300, 10, 0, 0))
+        self.root = FakeElement('frm', 'form', [
+            self.name_label, self.name_text, self.name_button,
+            self.mail_label, self.mail_text, self.mail_button, self.hidden],
+            (0, 0, 400, 100))
+
+    def test_right_of(self):
+        self.assertEqual(self.root.findall(right_of=self.mail_label),
+                         [self.mail_text, self.mail_button])
+        self.assertIs(
+            self.root.find(role_name='txt', right_of=self.name_label),
+            self.name_text)
+
+    def test_below(self):
+        self.assertEqual(self.root.findall(below=self.name_text),
+                         [self.mail_text])
+
+    def test_within(self):
+        self.assertEqual(self.root.findall(within=(0, 0, 230, 35)),
+                         [self.name_label, self.name_text])
+
+    def test_nearest_to(self):
+        self.assertIs(self.root.find(role_name='btn', nearest_to=(200, 55)),
+                      self.mail_button)
+        # Smaller element wins when point is inside of several.
+        self.assertIs(self.root.find(nearest_to=(240, 15)), self.name_button)
+
+    def test_combined_relations(self):
+        self.assertEqual(
+            self.root.findall(right_of=self.mail_label, within=(0, 0, 225,
+                                                                100)),
+            [self.mail_text])
+
+    def test_anchor_and_zero_size_are_skipped(self):
+        self.assertNotIn(self.name_text, self.root.findall(
+            within=(0, 0, 400, 100), nearest_to=self.name_text))
+        self.assertNotIn(self.hidden, self.root.findall(
+            within=(0, 0, 400, 100)))
+
+    def test_iterator_locations(self):
+        label = MapLocationElement('lbl', 'Name', (), (10, 10, 50, 20))
+        text = MapLocationElement('txt', 'name', (), (70, 10, 150, 20))
+        root = FakeElement('frm', 'form', [label, text], (0, 0, 400, 100))
+
+        self.assertEqual(root.findall(right_of=label), [text])
+        self.assertEqual(Relation(nearest_to=label)._nearest_to, (35.0, 20.0))
+
+    def test_anchor_without_location(self):
+        self.assertRaises(TooSaltyUISoupException, Relation,
+                          right_of=FakeElement('lbl', 'x', (), ()))
+
+
+if __name__ == '__main__':
+    unittest.main()
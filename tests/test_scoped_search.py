@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests.doubles import FakeElement, build_tree
+from uisoup import TooSaltyUISoupException
+
+
+class ScopedSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        # 10 + 100 + 1000 elements below root, 10 + 100 in other window.
+        self.root = build_tree(10, 3)
+        self.root.is_top_level_window = True
+        self.root.same_process_windows = [build_tree(10, 2)]
+
+    def findall(self, **kwargs):
+        FakeElement.reset_calls()
+        result = self.root.findall(**kwargs)
+
+        return len(result), FakeElement.get_calls('visible')
+
+    def test_full_search(self):
+        self.assertEqual(self.findall(), (1221, 1221))
+
+    def test_max_depth(self):
+        self.assertEqual(self.findall(max_depth=1), (11, 11))
+        self.assertEqual(self.findall(max_depth=2), (121, 121))
+
+    def test_min_depth(self):
+        # Shallow elements are walked through but not matched.
+        self.assertEqual(self.findall(min_depth=3), (1100, 1100))
+        self.assertEqual(self.findall(min_depth=2, max_depth=2), (110, 110))
+
+    def test_same_process_windows(self):
+        self.assertEqual(self.findall(include_same_process_windows=False),
+                         (1110, 1110))
+
+    def test_descend(self):
+        # Children of node1 in both windows (10 + 100 and 10) aren't
+        # entered.
+        self.assertEqual(
+            self.findall(descend=lambda x: x.acc_name != 'node1'),
+            (1101, 1101))
+
+    def test_find_and_is_object_exists(self):
+        FakeElement.reset_calls()
+        self.assertEqual(self.root.find(name='item3').acc_name, 'item3')
+        self.assertEqual(FakeElement.get_calls('visible'), 3)
+
+        self.assertFalse(self.root.is_object_exists(name='item3',
+                                                    max_depth=1))
+        self.assertTrue(self.root.is_object_exists(name='node1',
+                                                   max_depth=1))
+        self.assertRaises(TooSaltyUISoupException, self.root.find,
+                          name='item3', max_depth=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests.doubles import FakeElement
+from uisoup import TooSaltyUISoupException
+from uisoup.utils.selector import Selector
+
+
+def element(role_name, name, *children):
+    return FakeElement(role_name, name, children)
+
+
+def table(name, row_count=500):
+    return element('tbl', name, *[element('tblc', 'c%d' % i,
+                                          element('lbl', 'x'))
+                                  for i in range(row_count)])
+
+
+class SelectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = element(
+            'frm', 'Main',
+            element('pane', 'Settings A',
+                    element('btn', 'OK'),
+                    element('btn', 'Cancel'),
+                    element('pane', 'Settings inner', element('btn', 'OK'))),
+            element('pane', 'Other', table('t1'), element('btn', 'OK')),
+            table('t2'))
+        FakeElement.reset_calls()
+
+    def select(self, selector):
+        return [(el.acc_name, el._parent.acc_name) for el in
+                self.root.selectall(selector)]
+
+    def test_descendant_axis(self):
+        self.assertEqual(
+            self.select('pane[name="Settings*"] btn[c_name="btnOK"]'),
+            [('OK', 'Settings A'), ('OK', 'Settings inner')])
+        self.assertEqual(
+            self.select('pane btn'),
+            [('OK', 'Settings A'), ('Cancel', 'Settings A'),
+             ('OK', 'Settings inner'), ('OK', 'Other')])
+
+    def test_child_axis(self):
+        self.assertEqual(self.select('pane[name="Settings*"] > btn[name=OK]'),
+                         [('OK', 'Settings A'), ('OK', 'Settings inner')])
+        self.assertEqual(self.select("* > btn[name='OK']"),
+                         [('OK', 'Settings A'), ('OK', 'Settings inner'),
+                          ('OK', 'Other')])
+
+    def test_child_axis_prunes_traversal(self):
+        self.root.findall(role_name='btn')
+        full_walk_visits = FakeElement.get_calls('visible')
+        FakeElement.reset_calls()
+
+        self.assertEqual(self.select('> pane > btn'),
+                         [('OK', 'Settings A'), ('Cancel', 'Settings A'),
+                          ('OK', 'Other')])
+        # Only children of root and of its panes are visited.
+        self.assertEqual(FakeElement.get_calls('visible'), 8)
+        self.assertGreater(full_walk_visits, 2000)
+
+    def test_steps_are_not_searched_below_match(self):
+        self.assertEqual(len(self.select('tbl[name=t2] > tblc[name="c49?"]')),
+                         10)
+        # Rows of t2 are visited, but labels inside of them are not.
+        self.assertLess(FakeElement.get_calls('visible'), 2600)
+
+    def test_select(self):
+        self.assertEqual(self.root.select('btn[name=Cancel]').acc_name,
+                         'Cancel')
+        self.assertRaises(TooSaltyUISoupException, self.root.select,
+                          'btn[name=Nope]')
+
+    def test_invalid_selectors(self):
+        for selector in ['', 'a >', 'a > > b', 'a[name=', 'a[=x]', 'a!b',
+                         'a[name="x"]b']:
+            self.assertRaises(TooSaltyUISoupException, Selector, selector)
+
+
+if __name__ == '__main__':
+    unittest.main()
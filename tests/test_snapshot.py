@@ -0,0 +1,113 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests.doubles import FakeElement, build_tree, walk
+from uisoup import TooSaltyUISoupException
+
+
+class DetachedElement(FakeElement):
+    """
+    Element whose parent count can't be read.
+    """
+
+    @property
+    def acc_parent_count(self):
+        raise RuntimeError('Element is not attached to window.')
+
+
+def get_names(lst_elements):
+    return [el.acc_name for el in lst_elements]
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build_tree(4, 3)
+        self.snapshot = self.root.snapshot()
+
+    def test_search_without_live_calls(self):
+        lst_buttons = get_names(self.root.findall(role_name='btn'))
+        lst_children = get_names(self.root.findall(max_depth=1))
+        FakeElement.reset_calls()
+
+        self.assertEqual(self.snapshot.find(name='item3').acc_name, 'item3')
+        self.assertEqual(get_names(self.snapshot.findall(role_name='btn')),
+                         lst_buttons)
+        self.assertEqual(get_names(self.snapshot.findall(max_depth=1)),
+                         lst_children)
+        self.assertRaises(TooSaltyUISoupException, self.snapshot.find,
+                          name='nope')
+        self.assertEqual(get_names(self.snapshot), ['node1', 'node22',
+                                                    'node43', 'node64'])
+        self.assertEqual(FakeElement.calls, dict())
+
+    def test_structure(self):
+        lst_live = walk(self.root)
+        lst_captured = [self.snapshot] + self.snapshot.findall()
+
+        self.assertEqual(get_names(lst_captured), get_names(lst_live))
+        for obj_live, obj_captured in zip(lst_live, lst_captured):
+            self.assertEqual(obj_captured.acc_parent_count,
+                             obj_live.acc_parent_count)
+            self.assertEqual(obj_captured.acc_child_count,
+                             obj_live.acc_child_count)
+
+    def test_toxml(self):
+        self.assertEqual(self.snapshot.toxml(), self.root.toxml())
+
+    def test_max_depth(self):
+        obj_snapshot = self.root.snapshot(max_depth=1)
+
+        self.assertEqual(len(obj_snapshot.findall()), 4)
+        self.assertEqual(obj_snapshot.find(name='node1').acc_child_count, 0)
+
+    def test_subtree_parent_count(self):
+        # Parent count wasn't asked for but it is captured for root.
+        obj_subtree = self.root._children[0]
+        obj_snapshot = obj_subtree.snapshot(['name'])
+
+        self.assertEqual(obj_snapshot.acc_parent_count, 1)
+        for parent_count in (2, 3):
+            self.assertEqual(
+                get_names(obj_snapshot.findall(parent_count=parent_count)),
+                get_names(obj_subtree.findall(parent_count=parent_count)))
+        self.assertEqual(len(obj_snapshot.findall(parent_count=2)), 4)
+
+    def test_parent_count_that_wasnt_read(self):
+        obj_snapshot = DetachedElement(
+            'pane', 'root', [FakeElement('btn', 'ok')]).snapshot()
+
+        self.assertRaises(TooSaltyUISoupException,
+                          lambda: obj_snapshot.acc_parent_count)
+        self.assertEqual(obj_snapshot.findall(parent_count=1), [])
+        self.assertEqual(obj_snapshot.find(name='ok').acc_name, 'ok')
+
+    def test_properties_that_werent_captured(self):
+        obj_snapshot = self.root.snapshot(['name'])
+
+        self.assertEqual(obj_snapshot.acc_name, 'node0')
+        self.assertRaises(TooSaltyUISoupException,
+                          lambda: obj_snapshot.acc_role_name)
+        self.assertRaises(TooSaltyUISoupException, obj_snapshot.click)
+
+
+if __name__ == '__main__':
+    unittest.main()
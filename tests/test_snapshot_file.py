@@ -0,0 +1,121 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests.doubles import FakeElement, build_tree, walk
+from uisoup import TooSaltyUISoupException
+from uisoup.utils.snapshot_file import load_snapshot
+
+PROPERTIES = ['name', 'role_name', 'location', 'is_enabled']
+
+
+class SnapshotFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build_tree(10, 2)
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'tree.snap')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        self.assertEqual(
+            self.root.save_snapshot(self.file_path, PROPERTIES), 111)
+
+        with load_snapshot(self.file_path) as obj_snapshot:
+            lst_live = walk(self.root)
+            lst_mapped = walk_mapped(obj_snapshot.root)
+
+            self.assertEqual(len(lst_mapped), len(lst_live))
+            for obj_live, obj_mapped in zip(lst_live, lst_mapped):
+                self.assertEqual(obj_mapped.acc_name, obj_live.acc_name)
+                self.assertEqual(obj_mapped.acc_role_name,
+                                 obj_live.acc_role_name)
+                self.assertEqual(tuple(obj_mapped.acc_location),
+                                 obj_live.acc_location)
+                self.assertIs(obj_mapped.is_enabled, True)
+                self.assertEqual(obj_mapped.acc_child_count,
+                                 obj_live.acc_child_count)
+                self.assertEqual(obj_mapped.acc_parent_count,
+                                 obj_live.acc_parent_count)
+
+    def test_equal_values_are_stored_once(self):
+        self.root.save_snapshot(self.file_path, PROPERTIES)
+
+        with load_snapshot(self.file_path) as obj_snapshot:
+            # 111 names, 3 role names, 100 leaf locations and 1 container
+            # location, 1 state shared by is_enabled and is_visible.
+            self.assertEqual(obj_snapshot.value_count, 111 + 3 + 101 + 1)
+
+    def test_long_values(self):
+        str_name = u'very long name ' * 10
+        obj_root = FakeElement('pane', str_name, [
+            FakeElement('btn', str_name), FakeElement('btn', str_name + '!')])
+        obj_root.save_snapshot(self.file_path, ['name'])
+
+        with load_snapshot(self.file_path) as obj_snapshot:
+            # Two names and visibility state that is always captured.
+            self.assertEqual(obj_snapshot.value_count, 3)
+            self.assertEqual(
+                [el.acc_name for el in walk_mapped(obj_snapshot.root)],
+                [str_name, str_name, str_name + '!'])
+
+    def test_search_in_snapshot(self):
+        self.root.save_snapshot(self.file_path, PROPERTIES)
+
+        with load_snapshot(self.file_path) as obj_snapshot:
+            self.assertEqual(
+                obj_snapshot.root.find(name='item5').acc_location,
+                (5, 0, 10, 10))
+            self.assertEqual(
+                len(obj_snapshot.root.findall(role_name='lbl')), 33)
+
+    def test_max_depth(self):
+        self.assertEqual(
+            self.root.save_snapshot(self.file_path, PROPERTIES, 1), 11)
+
+        with load_snapshot(self.file_path) as obj_snapshot:
+            self.assertEqual(len(walk_mapped(obj_snapshot.root)), 11)
+
+    def test_not_snapshot_file(self):
+        with open(self.file_path, 'wb') as file_:
+            file_.write(b'\0' * 128)
+
+        self.assertRaises(TooSaltyUISoupException, load_snapshot,
+                          self.file_path)
+
+
+def walk_mapped(obj_element):
+    """
+    Gets snapshot element and all its descendants in preorder.
+    """
+    result = [obj_element]
+    for obj_child in obj_element:
+        result.extend(walk_mapped(obj_child))
+
+    return result
+
+
+if __name__ == '__main__':
+    unittest.main()
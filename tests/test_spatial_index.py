@@ -0,0 +1,119 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import random
+import unittest
+
+from tests.doubles import FakeElement, build_tree
+from uisoup.utils.spatial_index import SpatialIndex
+
+
+def contains(rect, x, y):
+    left, top, width, height = rect
+
+    return left <= x < left + width and top <= y < top + height
+
+
+def intersects(rect1, rect2):
+    left1, top1, width1, height1 = rect1
+    left2, top2, width2, height2 = rect2
+
+    return left1 < left2 + width2 and left2 < left1 + width1 and \
+        top1 < top2 + height2 and top2 < top1 + height1
+
+
+class SpatialIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        obj_random = random.Random(12)
+        self.rects = [(obj_random.randint(-100, 1900),
+                       obj_random.randint(-100, 1000),
+                       obj_random.randint(0, 300),
+                       obj_random.randint(0, 200)) for _ in range(500)]
+        # Scroll containers that report their full content size.
+        self.rects.extend([(0, -50000, 1920, 100000), (100, 0, 400, 200000),
+                           (-100000, 500, 300000, 30)])
+        self.depths = [obj_random.randint(0, 5) for _ in self.rects]
+        self.index = SpatialIndex()
+        for i, rect in enumerate(self.rects):
+            self.index.insert(rect, i, self.depths[i])
+
+    def brute_force(self, predicate):
+        # Deepest first, insertion order among equal depths.
+        return sorted(
+            (i for i, rect in enumerate(self.rects) if
+             rect[2] > 0 and rect[3] > 0 and predicate(rect)),
+            key=lambda i: (-self.depths[i], i))
+
+    def test_zero_size_rects_are_ignored(self):
+        self.assertEqual(
+            len(self.index),
+            len([x for x in self.rects if x[2] > 0 and x[3] > 0]))
+
+    def test_query_point(self):
+        for x, y in [(0, 0), (-50, -50), (500, 300), (1999, 999),
+                     (63, 64), (1000, 500)]:
+            self.assertEqual(self.index.query_point(x, y),
+                             self.brute_force(lambda r: contains(r, x, y)))
+
+    def test_hit_test(self):
+        for x, y in [(500, 300), (100, 100), (5000, 5000)]:
+            expected = self.brute_force(lambda r: contains(r, x, y))
+            self.assertEqual(self.index.hit_test(x, y),
+                             expected[0] if expected else None)
+
+    def test_query_rect(self):
+        # Third query covers more cells than are occupied.
+        for query in [(0, 0, 100, 100), (500, 300, 1, 1), (-1000, -1000,
+                      5000, 5000), (1000, 0, 64, 2000)]:
+            self.assertEqual(self.index.query_rect(query),
+                             self.brute_force(lambda r: intersects(r, query)))
+        self.assertEqual(self.index.query_rect((0, 0, 0, 10)), [])
+
+    def test_large_rects_dont_fill_grid(self):
+        # Other rects lie in -100..2200 x -100..1200 area.
+        self.assertLessEqual(len(self.index._cells), 37 * 21)
+        self.assertEqual(len(self.index._large), 3)
+        self.assertIn(501, self.index.query_point(200, 150000))
+        self.assertEqual(self.index.query_rect((150, 100000, 10, 10)), [501])
+
+    def test_edges_are_exclusive(self):
+        index = SpatialIndex(cell_size=10)
+        index.insert((0, 0, 10, 10), 'a')
+        index.insert((10, 0, 10, 10), 'b')
+
+        self.assertEqual(index.query_point(9, 9), ['a'])
+        self.assertEqual(index.query_point(10, 0), ['b'])
+        self.assertEqual(index.query_rect((10, 10, 5, 5)), [])
+
+    def test_from_element(self):
+        obj_root = build_tree(3, 2)
+        obj_root._children[0]._location = (0, 0, 100, 100)
+        index = SpatialIndex.from_element(obj_root)
+        FakeElement.reset_calls()
+
+        # Leaf is deeper than its container.
+        self.assertEqual(index.hit_test(5, 5).acc_name, 'item2')
+        self.assertEqual(
+            [el.acc_name for el in index.query_point(50, 50)], ['node1'])
+        self.assertEqual(FakeElement.get_calls('location'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import types
+import unittest
+
+from tests import win_doubles
+from tests.win_doubles import FakeAcc, build_acc_tree
+from uisoup.utils.locator import Locator
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class WinElementKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.acc_root = build_acc_tree(3, 2)
+        # Window root element, the same as element made of window handle.
+        self.root = win_doubles.WinElement(self.acc_root, 0, (), 0)
+        FakeAcc.reset_calls()
+
+    def test_children_keys_are_unique(self):
+        lst_elements = self.root.findall(only_visible=False)
+
+        self.assertEqual(len(lst_elements), 12)
+        self.assertEqual(len(set(el.key for el in lst_elements)), 12)
+        self.assertNotIn(self.root.key, [el.key for el in lst_elements])
+
+    def test_children_of_element_of_unknown_origin(self):
+        item = win_doubles.WinElement(self.acc_root.children[1].children[0], 0)
+        parent = item.acc_parent
+        lst_children = list(parent)
+
+        self.assertEqual(len(set(el.key for el in lst_children)), 3)
+        self.assertNotIn(self.root.key, [el.key for el in lst_children])
+        self.assertNotIn(parent.key, [el.key for el in lst_children])
+
+    def test_relation_to_window_root(self):
+        for acc_item in self.acc_root.children[1].children:
+            acc_item.location = (20, 0, 10, 10)
+        parent = win_doubles.WinElement(
+            self.acc_root.children[1].children[0], 0).acc_parent
+
+        lst_elements = parent.findall(only_visible=False, right_of=self.root)
+
+        self.assertEqual(len(lst_elements), 3)
+
+    def test_simple_children_keys_are_unique(self):
+        acc_list = FakeAcc(33, 'list', range(1, 6))
+        obj_list = win_doubles.WinElement(acc_list, 0, (), 0)
+        lst_items = list(obj_list)
+
+        self.assertEqual(len(set(el.key for el in lst_items)), 5)
+        self.assertNotIn(obj_list.key, [el.key for el in lst_items])
+
+    def test_keys_are_computed_when_cache_is_queried(self):
+        self.root.findall(only_visible=False)
+        self.assertEqual(FakeAcc.calls.get('hwnd', 0), 0)
+
+        obj_element = self.root._get_element_cache().find(
+            Locator(name='item7'), only_visible=False)
+
+        self.assertEqual(obj_element.acc_name, 'item7')
+        self.assertGreater(FakeAcc.calls.get('hwnd', 0), 0)
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class WinElementExportTest(unittest.TestCase):
+
+    def setUp(self):
+        # Three lists of three simple items.
+        self.root = win_doubles.WinElement(
+            build_acc_tree(3, 2, simple_leaves=True), 0, (), 0)
+
+    def test_search_skips_simple_children(self):
+        self.assertEqual(len(self.root.findall(only_visible=False)), 3)
+
+    def test_xml_keeps_simple_children(self):
+        str_xml = self.root.toxml(['name'])
+
+        # Double reports role and name of container for its items.
+        self.assertEqual(str_xml.count('<lst'), 12)
+        self.assertEqual(str_xml.count('<lst Name="node1"/>'), 3)
+
+    def test_snapshot_keeps_simple_children(self):
+        obj_snapshot = self.root.snapshot()
+
+        self.assertEqual(len(list(obj_snapshot)), 3)
+        self.assertEqual([el.acc_child_count for el in obj_snapshot],
+                         [3, 3, 3])
+
+    def test_xpath_finds_simple_children(self):
+        self.assertEqual(len(self.root.xpath('.//lst/lst')), 9)
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class WinPropertyCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [1000.0]
+        self.element_time = win_doubles.element_module.time
+        win_doubles.element_module.time = types.SimpleNamespace(
+            time=lambda: self.now[0])
+        win_doubles.WinElement.PROPERTY_CACHE_TTL = 1.0
+        self.element = win_doubles.WinElement(FakeAcc(43, 'OK'), 0, (), 0)
+        self.element._mouse = types.SimpleNamespace(
+            click=lambda *args: None, double_click=lambda *args: None,
+            drag=lambda *args: None, RIGHT_BUTTON='right')
+        FakeAcc.reset_calls()
+
+    def tearDown(self):
+        win_doubles.element_module.time = self.element_time
+        win_doubles.WinElement.PROPERTY_CACHE_TTL = None
+
+    def test_cache_is_disabled_by_default(self):
+        win_doubles.WinElement.PROPERTY_CACHE_TTL = None
+        self.element.acc_c_name
+
+        self.assertEqual(FakeAcc.calls, dict(name=2, role=1))
+
+    def test_values_are_reused_during_ttl(self):
+        self.element.acc_c_name
+        self.element.acc_c_name
+        self.now[0] += 0.5
+        self.element.acc_name
+
+        self.assertEqual(FakeAcc.calls, dict(name=1, role=1))
+
+        self.now[0] += 1
+        self.element.acc_name
+        self.assertEqual(FakeAcc.calls, dict(name=2, role=1))
+
+    def test_refresh(self):
+        self.element.acc_name
+        self.element.refresh()
+        self.element.acc_name
+
+        self.assertEqual(FakeAcc.calls, dict(name=2))
+
+    def test_actions_invalidate_cache(self):
+        for action in (self.element.click, self.element.double_click,
+                       self.element.set_focus,
+                       lambda: self.element.drag_to(0, 0),
+                       lambda: self.element.set_value('Cancel')):
+            self.element.refresh()
+            FakeAcc.reset_calls()
+            self.element.acc_name
+            action()
+            self.element.acc_name
+
+            self.assertEqual(FakeAcc.calls.get('name'), 2, action)
+
+        self.assertEqual(self.element.acc_name, 'Cancel')
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class WinDepthTest(unittest.TestCase):
+
+    def setUp(self):
+        win_doubles.set_desktop({1: (100, 'Form', True, (0, 0, 100, 100),
+                                     'Window')})
+        win_doubles.WinWindowTable.invalidate()
+
+    def count_parent_calls(self, width, depth):
+        acc_root = build_acc_tree(width, depth)
+        # Window is below desktop client and frame.
+        FakeAcc(10, 'desktop', [FakeAcc(9, 'frame', [acc_root])])
+        obj_root = win_doubles.WinElement(acc_root, 0)
+        FakeAcc.reset_calls()
+
+        lst_elements = obj_root.findall(only_visible=False,
+                                        parent_count=depth + 2)
+        self.assertEqual(len(lst_elements), width ** depth)
+
+        return FakeAcc.calls.get('parent', 0)
+
+    def test_parent_lookups_dont_depend_on_tree_size(self):
+        self.assertEqual(self.count_parent_calls(2, 1),
+                         self.count_parent_calls(5, 3))
+
+    def test_depth_is_passed_to_parent(self):
+        obj_root = win_doubles.WinElement(build_acc_tree(3, 2), 0, (), 0)
+        obj_item = obj_root.find(only_visible=False, name='item3')
+        FakeAcc.reset_calls()
+
+        self.assertEqual(obj_item.acc_parent_count, 2)
+        self.assertEqual(obj_item.acc_parent.acc_parent_count, 1)
+        self.assertEqual(FakeAcc.calls.get('parent', 0), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests import win_doubles
+from uisoup.utils.input_scheduler import InputScheduler
+from uisoup.utils.motion import MotionProfile
+from uisoup.utils.win_input import build_mouse_inputs, normalize_point
+
+MOVE = 0x0001 + 0x8000
+LEFT_DOWN = 0x0002
+VIRTUALDESK = 0x4000
+
+
+class FakeMetrics(object):
+    """
+    Virtual desktop metrics that records refreshes.
+    """
+
+    def __init__(self, *metrics):
+        self.metrics = list(metrics)
+        self.refresh_count = 0
+
+    def __call__(self, refresh=False):
+        if refresh:
+            self.refresh_count += 1
+            self.metrics.pop(0)
+
+        return self.metrics[0]
+
+
+def get_points(inputs):
+    return [(x.ii.mi.dx, x.ii.mi.dy, x.ii.mi.dwFlags) for x in inputs]
+
+
+class WinInputTest(unittest.TestCase):
+
+    def test_normalize_point(self):
+        self.assertEqual(normalize_point(0, 0, (0, 0, 1920, 1080)), (0, 0))
+        self.assertEqual(normalize_point(1919, 1079, (0, 0, 1920, 1080)),
+                         (65535, 65535))
+        # Monitor on the left of primary one.
+        self.assertEqual(normalize_point(-1920, 0, (-1920, 0, 3840, 1080)),
+                         (0, 0))
+        self.assertEqual(normalize_point(0, 0, (0, 0, 1, 1)), (0, 0))
+
+    def test_absolute_events_are_mapped_to_virtual_desktop(self):
+        get_metrics = FakeMetrics((0, 0, 1920, 1080))
+        inputs = build_mouse_inputs([(MOVE, 1919, 0, 0), (LEFT_DOWN, 5, 5, 0)],
+                                    get_metrics)
+
+        self.assertEqual(len(inputs), 2)
+        self.assertEqual([x.type for x in inputs], [0, 0])
+        self.assertEqual(get_points(inputs), [(65535, 0, MOVE | VIRTUALDESK),
+                                              (5, 5, LEFT_DOWN)])
+        self.assertEqual(get_metrics.refresh_count, 0)
+
+    def test_metrics_are_refreshed_once_for_point_out_of_desktop(self):
+        # Second monitor was attached on the right.
+        get_metrics = FakeMetrics((0, 0, 1920, 1080), (0, 0, 3840, 1080),
+                                  (0, 0, 1, 1))
+        inputs = build_mouse_inputs(
+            [(MOVE, 3839, 0, 0), (MOVE, 5000, 0, 0)], get_metrics)
+
+        self.assertEqual(get_metrics.refresh_count, 1)
+        # Point that is still out of desktop isn't worth another refresh.
+        self.assertEqual(
+            [x[0] for x in get_points(inputs)],
+            [65535, normalize_point(5000, 0, (0, 0, 3840, 1080))[0]])
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class WinMouseBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+        self.mouse = win_doubles.element_module.WinMouse(
+            submit=self.batches.append)
+        self.mouse.motion_profile = MotionProfile(steps=10)
+
+    def test_path_is_sent_in_one_batch(self):
+        self.mouse.move(100, 100, smooth=False)
+
+        self.assertEqual([len(x) for x in self.batches], [10])
+        self.assertEqual(self.batches[0][-1].ii.mi.dx,
+                         normalize_point(100, 100, (0, 0, 1920, 1080))[0])
+
+    def test_smooth_path_is_sent_point_by_point(self):
+        self.mouse.scheduler = InputScheduler(clock=lambda: 0,
+                                              sleep=lambda x: None)
+        self.mouse.motion_profile = MotionProfile(steps=10, duration=0)
+
+        self.mouse.move(100, 100)
+
+        self.assertEqual([len(x) for x in self.batches], [1] * 10)
+
+    def test_double_click_is_sent_in_one_batch(self):
+        self.mouse.double_click(10, 10)
+
+        self.assertEqual(len(self.batches[-1]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import unittest
+
+from tests import win_doubles
+from uisoup import TooSaltyUISoupException
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class WinWindowLookupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.user32 = win_doubles.set_desktop({
+            1: (100, 'Notepad', True, (0, 0, 100, 100), 'Untitled - Notepad'),
+            2: (200, 'Calc', True, (0, 0, 100, 100), 'Calculator')})
+        win_doubles.WinWindowTable.invalidate()
+        self.soup = win_doubles.WinSoup()
+
+    def find_hwnds(self, *args, **kwargs):
+        return [obj_window.hwnd for obj_window in
+                self.soup._find_window_records(*args, **kwargs)]
+
+    def test_cached_table_is_reused(self):
+        self.assertEqual(self.find_hwnds('*Notepad'), [1])
+        self.assertEqual(self.find_hwnds(pid=200), [2])
+
+        self.assertEqual(self.user32.calls['EnumWindows'], 1)
+
+    def test_closed_window_is_not_reported(self):
+        self.assertTrue(self.soup.is_window_exists('*Notepad'))
+        self.assertTrue(self.soup.is_window_exists(1))
+
+        # Window is closed by input that doesn't touch element caches.
+        del self.user32.windows[1]
+
+        self.assertTrue(win_doubles.WinWindowTable.is_fresh())
+        self.assertFalse(self.soup.is_window_exists('*Notepad'))
+        self.assertFalse(self.soup.is_window_exists(1))
+        self.assertEqual(self.find_hwnds(), [2])
+
+    def test_renamed_window_is_matched_by_new_title(self):
+        self.assertEqual(self.find_hwnds('Calculator'), [2])
+
+        self.user32.windows[2] = (200, 'Calc', True, (0, 0, 100, 100),
+                                  'Calculator - Scientific')
+
+        self.assertEqual(self.find_hwnds('Calculator'), [])
+        self.assertEqual(self.find_hwnds('Calculator - *'), [2])
+
+    def test_reused_handle_is_not_reported(self):
+        self.assertEqual(self.find_hwnds(pid=100), [1])
+
+        self.user32.windows[1] = (300, 'Notepad', True, (0, 0, 100, 100),
+                                  'Untitled - Notepad')
+
+        self.assertEqual(self.find_hwnds(pid=100), [])
+        self.assertEqual(self.find_hwnds(pid=300), [1])
+
+    def test_new_window_is_found(self):
+        self.find_hwnds()
+        self.user32.windows[3] = (300, 'Paint', True, (0, 0, 100, 100),
+                                  'Paint')
+
+        self.assertEqual(self.find_hwnds('Paint'), [3])
+
+
+@unittest.skipUnless(win_doubles.WIN_DOUBLES, 'comtypes doubles are off')
+class WinGetWindowTest(unittest.TestCase):
+
+    def setUp(self):
+        # Hidden IME window is above main window of the same process.
+        self.user32 = win_doubles.set_desktop({
+            1: (100, 'IME', False, (0, 0, 0, 0), 'Default IME'),
+            2: (100, 'Notepad', True, (0, 0, 100, 100), 'Untitled - Notepad'),
+            3: (200, 'Calc', False, (0, 0, 100, 100), 'Calculator')})
+        win_doubles.WinWindowTable.invalidate()
+        self.soup = win_doubles.WinSoup()
+        self.handles = []
+        self.soup_element = win_doubles.win_soup_module.WinElement
+        win_doubles.win_soup_module.WinElement = \
+            lambda hwnd, child_id: self.handles.append(hwnd) or hwnd
+
+    def tearDown(self):
+        win_doubles.win_soup_module.WinElement = self.soup_element
+
+    def test_hidden_windows_are_skipped_without_pattern(self):
+        self.assertEqual(self.soup.get_window(pid=100), 2)
+        self.assertEqual(self.soup.get_window(class_name='IME', pid=100), 1)
+        self.assertEqual(self.handles, [2, 1])
+
+    def test_hidden_windows_are_matched_by_title(self):
+        self.assertEqual(self.soup.get_window('Default IME', pid=100), 1)
+        self.assertEqual(self.soup.get_window('Calculator'), 3)
+
+    def test_process_without_visible_windows(self):
+        self.assertRaises(TooSaltyUISoupException,
+                          self.soup.get_window, pid=200)
+
+
+if __name__ == '__main__':
+    unittest.main()
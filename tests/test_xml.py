@@ -0,0 +1,150 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import io
+import time
+import unittest
+import xml.dom.minidom
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from tests.doubles import BENCHMARK, FakeElement, build_tree, walk
+
+
+def legacy_toxml(obj_root):
+    """
+    XML conversion as it was done before streaming: minidom document of the
+    whole tree is built and pretty printed at once.
+    """
+    obj_document = xml.dom.minidom.Document()
+    lst_queue = [(obj_root, obj_document)]
+
+    while lst_queue:
+        obj_element, obj_tree = lst_queue.pop(0)
+        obj_sub_tree = obj_document.createElement(obj_element.acc_role_name)
+        obj_sub_tree.setAttribute('Name', obj_element.acc_name or '')
+        obj_sub_tree.setAttribute(
+            'Location', ','.join(str(x) for x in obj_element.acc_location))
+        obj_tree.appendChild(obj_sub_tree)
+
+        if obj_element.acc_child_count:
+            for obj_element_child in obj_element:
+                lst_queue.append((obj_element_child, obj_sub_tree))
+
+    return obj_document.toprettyxml()
+
+
+def get_nodes(str_xml):
+    """
+    Gets tag and attributes of XML elements in document order.
+    """
+    obj_document = xml.dom.minidom.parseString(str_xml.encode('utf-8'))
+
+    return [(node.tagName, sorted(node.attributes.items())) for node in
+            obj_document.getElementsByTagName('*')]
+
+
+class _NullWriter(object):
+    """
+    Text file that only counts written characters and remembers longest
+    write.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.max_chunk = 0
+
+    def write(self, text):
+        self.size += len(text)
+        self.max_chunk = max(self.max_chunk, len(text))
+
+
+def measure(fn):
+    """
+    Measures time and peak of traced memory allocations of call.
+
+    :rtype: tuple[float, int]
+    :return: seconds and bytes.
+    """
+    tracemalloc.start()
+    try:
+        start = time.time()
+        fn()
+        elapsed = time.time() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return elapsed, peak
+
+
+class XmlTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = build_tree(10, 3)
+
+    def test_same_document_as_legacy(self):
+        self.assertEqual(get_nodes(self.root.toxml()),
+                         get_nodes(legacy_toxml(self.root)))
+
+    def test_escaping(self):
+        obj_root = FakeElement('pane', u'a<b & "c"—')
+
+        self.assertEqual(get_nodes(obj_root.toxml())[0][1],
+                         [('Location', '0,0,10,10'),
+                          ('Name', u'a<b & "c"—')])
+
+    def test_write_xml(self):
+        obj_buffer = io.StringIO()
+        self.root.write_xml(obj_buffer, ['name', 'is_enabled'])
+
+        self.assertEqual(obj_buffer.getvalue().count('IsEnabled="True"'),
+                         1111)
+
+    def test_write_xml_streams_elements(self):
+        obj_writer = _NullWriter()
+        self.root.write_xml(obj_writer)
+
+        # Document isn't built in memory, it is written element by element.
+        self.assertEqual(obj_writer.size, len(self.root.toxml()))
+        self.assertLess(obj_writer.max_chunk, 100)
+
+    def test_xpath(self):
+        self.assertEqual(
+            self.root.xpath('.//lbl[@Name="item3"]'),
+            [el for el in walk(self.root) if el.acc_name == 'item3'])
+
+    @unittest.skipUnless(BENCHMARK, 'UISOUP_BENCHMARK is not set')
+    @unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+    def test_benchmark(self):
+        # 1 + 46 + 46 ** 2 + 46 ** 3 = 99499 elements.
+        obj_root = build_tree(46, 3)
+        stream_time, stream_peak = measure(
+            lambda: obj_root.write_xml(_NullWriter()))
+        legacy_time, legacy_peak = measure(lambda: legacy_toxml(obj_root))
+
+        self.assertLess(stream_time, legacy_time)
+        self.assertLess(stream_peak * 10, legacy_peak)
+
+
+if __name__ == '__main__':
+    unittest.main()
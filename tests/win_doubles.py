@@ -0,0 +1,360 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+# Doubles of comtypes, oleacc and user32 that let Windows backend run on
+# machines without them. Backend is imported only when real comtypes is
+# absent, otherwise WIN_DOUBLES is False and tests that use it are skipped.
+
+import ctypes
+import itertools
+import os
+import sys
+import types
+from platform import system
+
+try:
+    import comtypes
+    WIN_DOUBLES = False
+except ImportError:
+    WIN_DOUBLES = system() not in ('Windows', 'Darwin')
+
+WinElement = None
+WinWindowTable = None
+WinSoup = None
+element_module = None
+win_soup_module = None
+
+
+class Box(object):
+    """
+    Double of VARIANT and BSTR that holds value.
+    """
+
+    def __init__(self, *args):
+        self.value = None
+        self.vt = None
+
+
+class _VariantType(type):
+
+    def __mul__(cls, count):
+        return lambda: [cls() for _ in range(count)]
+
+
+Variant = _VariantType('VARIANT', (Box,), {})
+
+
+class COMError(Exception):
+    pass
+
+
+class FakeAcc(object):
+    """
+    IAccessible double that counts calls of COM methods.
+    """
+
+    calls = dict()
+    _iid_ = None
+
+    def __init__(self, role=43, name='n', children=(), location=(0, 0, 10, 10),
+                 hwnd=1, state=0):
+        """
+        Constructor.
+
+        :param int role: MSAA role.
+        :param str name: name.
+        :param children: child accessible objects.
+        :param tuple location: x, y, width, height.
+        :param int hwnd: window handle.
+        :param int state: MSAA state flags.
+        """
+        self.role = role
+        self.name = name
+        self.children = list(children)
+        self.location = location
+        self.hwnd = hwnd
+        self.state = state
+        self.parent = None
+        for child in self.children:
+            if isinstance(child, FakeAcc):
+                child.parent = self
+
+    @classmethod
+    def reset_calls(cls):
+        cls.calls.clear()
+
+    @classmethod
+    def _count(cls, str_name):
+        cls.calls[str_name] = cls.calls.get(str_name, 0) + 1
+
+    def _IAccessible__com__get_accRole(self, child_id, out):
+        self._count('role')
+        out.value = self.role
+
+    def _IAccessible__com__get_accName(self, child_id, out):
+        self._count('name')
+        out.value = self.name
+
+    def _IAccessible__com__get_accState(self, child_id, out):
+        self._count('state')
+        out.value = self.state
+
+    def _IAccessible__com__get_accValue(self, child_id, out):
+        self._count('value')
+        out.value = self.name
+
+    def _IAccessible__com__set_accValue(self, child_id, value):
+        self._count('set_value')
+        self.name = value
+
+    def _IAccessible__com__get_accDescription(self, child_id, out):
+        self._count('description')
+        out.value = self.name
+
+    def _IAccessible__com_accLocation(self, left, top, width, height,
+                                      child_id):
+        self._count('location')
+        left.value, top.value, width.value, height.value = self.location
+
+    def accSelect(self, flags, child_id=0):
+        self._count('select')
+
+    @property
+    def accChildCount(self):
+        self._count('child_count')
+        return len(self.children)
+
+    @property
+    def accParent(self):
+        self._count('parent')
+        return self.parent
+
+    def QueryInterface(self, interface):
+        return self
+
+
+class _Oleacc(object):
+
+    def WindowFromAccessibleObject(self, i_accessible, hwnd):
+        FakeAcc._count('hwnd')
+        hwnd.value = i_accessible.hwnd
+
+    def AccessibleChildren(self, i_accessible, start, count, children,
+                           obtained):
+        for i, child in enumerate(i_accessible.children):
+            if isinstance(child, FakeAcc):
+                children[i].vt = 9
+            else:
+                # Simple element, value is child id.
+                children[i].vt = 3
+            children[i].value = child
+        obtained.value = len(i_accessible.children)
+
+
+class FakeUser32(object):
+    """
+    Desktop of top level windows that counts calls of user32 functions.
+    """
+
+    def __init__(self, windows=None):
+        """
+        Constructor.
+
+        :param dict windows: hwnd -> (pid, class name, visible, (x, y, w, h),
+        title).
+        """
+        self.windows = windows or dict()
+        self.calls = dict()
+        self.inputs = []
+
+    def _count(self, str_name):
+        self.calls[str_name] = self.calls.get(str_name, 0) + 1
+
+    def EnumWindows(self, proc, lparam):
+        self._count('EnumWindows')
+        for hwnd in list(self.windows):
+            if not proc(hwnd, lparam):
+                break
+        return True
+
+    def IsWindow(self, hwnd):
+        self._count('IsWindow')
+        return hwnd in self.windows
+
+    def GetWindowThreadProcessId(self, hwnd, pid):
+        self._count('GetWindowThreadProcessId')
+        pid.value = self.windows[int(getattr(hwnd, 'value', hwnd))][0]
+        return 1
+
+    def GetClassNameW(self, hwnd, buff, size):
+        self._count('GetClassNameW')
+        buff.value = self.windows[hwnd][1]
+        return len(buff.value)
+
+    def IsWindowVisible(self, hwnd):
+        self._count('IsWindowVisible')
+        return self.windows[hwnd][2]
+
+    def GetWindowRect(self, hwnd, rect):
+        self._count('GetWindowRect')
+        x, y, w, h = self.windows[hwnd][3]
+        rect.left, rect.top, rect.right, rect.bottom = x, y, x + w, y + h
+        return 1
+
+    def GetWindowTextLengthW(self, hwnd):
+        self._count('GetWindowTextLengthW')
+        return len(self.windows[hwnd][4])
+
+    def GetWindowTextW(self, hwnd, buff, size):
+        self._count('GetWindowTextW')
+        buff.value = self.windows[hwnd][4][:size - 1]
+        return len(buff.value)
+
+    def SendInput(self, count, inputs, size):
+        self._count('SendInput')
+        self.inputs.append(inputs)
+        return count
+
+    def GetSystemMetrics(self, index):
+        return {0: 1920, 1: 1080, 76: 0, 77: 0, 78: 1920, 79: 1080}.get(
+            index, 0)
+
+    def _noop(self, *args):
+        return 0
+
+    MapVirtualKeyW = VkKeyScanW = SetCursorPos = GetCursorPos = \
+        mouse_event = keybd_event = GetDesktopWindow = _noop
+
+
+class _Ctypes(object):
+    """
+    ctypes of backend modules, pointers are passed to doubles as is.
+    """
+
+    oledll = types.SimpleNamespace(oleacc=_Oleacc())
+    windll = types.SimpleNamespace(user32=FakeUser32())
+
+    def __getattr__(self, str_name):
+        return getattr(ctypes, str_name)
+
+    @staticmethod
+    def byref(obj):
+        return obj
+
+    @staticmethod
+    def cast(obj, ctype):
+        if isinstance(obj, FakeAcc):
+            return types.SimpleNamespace(value=id(obj))
+        return ctypes.cast(obj, ctype)
+
+    WINFUNCTYPE = staticmethod(ctypes.CFUNCTYPE)
+
+
+fake_ctypes = _Ctypes()
+
+
+def set_desktop(windows):
+    """
+    Replaces desktop windows seen by backend.
+
+    :param dict windows: see FakeUser32.
+    :rtype: FakeUser32
+    :return: user32 double.
+    """
+    user32 = FakeUser32(windows)
+    _Ctypes.windll.user32 = user32
+
+    return user32
+
+
+def build_acc_tree(width=3, depth=2, hwnd=1, simple_leaves=False):
+    """
+    Builds tree of accessible objects, containers are named nodeN and
+    leaves itemN.
+
+    :param int width: number of children of every container.
+    :param int depth: number of container levels.
+    :param int hwnd: window handle of all objects.
+    :param bool simple_leaves: leaves are simple elements (child ids) of
+    their container.
+    :rtype: FakeAcc
+    :return: root object.
+    """
+    counter = itertools.count()
+
+    def build(level):
+        i = next(counter)
+        if level == depth:
+            return FakeAcc(43, 'item%d' % i, hwnd=hwnd)
+        if simple_leaves and level == depth - 1:
+            for _ in range(width):
+                next(counter)
+            return FakeAcc(33, 'node%d' % i, range(1, width + 1), hwnd=hwnd)
+
+        return FakeAcc(16, 'node%d' % i,
+                       [build(level + 1) for _ in range(width)], hwnd=hwnd)
+
+    return build(0)
+
+
+def _install():
+    global WinElement, WinWindowTable, WinSoup, element_module, \
+        win_soup_module
+
+    fake_comtypes = types.ModuleType('comtypes')
+    automation = types.ModuleType('comtypes.automation')
+    client = types.ModuleType('comtypes.client')
+    gen = types.ModuleType('comtypes.gen')
+    automation.VARIANT = Variant
+    automation.BSTR = Box
+    automation.VT_I4 = 3
+    automation.VT_BSTR = 8
+    automation.VT_DISPATCH = 9
+    client.GetModule = lambda *args: None
+    gen.Accessibility = types.SimpleNamespace(IAccessible=FakeAcc)
+    fake_comtypes.automation = automation
+    fake_comtypes.client = client
+    fake_comtypes.gen = gen
+    fake_comtypes.IUnknown = object
+    fake_comtypes.COMError = COMError
+    fake_comtypes.CoInitialize = fake_comtypes.CoUninitialize = \
+        lambda: None
+    for module in (fake_comtypes, automation, client, gen):
+        sys.modules[module.__name__] = module
+
+    package = types.ModuleType('uisoup.win_soup')
+    package.__path__ = [os.path.join(sys.modules['uisoup'].__path__[0],
+                                     'win_soup')]
+    sys.modules['uisoup.win_soup'] = package
+
+    from uisoup.win_soup import element, keyboard, mouse, window_info, \
+        win_soup
+
+    for module in (element, keyboard, mouse, window_info, win_soup):
+        module.ctypes = fake_ctypes
+
+    element_module = element
+    win_soup_module = win_soup
+    WinElement = element.WinElement
+    WinWindowTable = window_info.WinWindowTable
+    WinSoup = win_soup.WinSoup
+
+
+if WIN_DOUBLES:
+    _install()
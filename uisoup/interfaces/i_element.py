@@ -16,13 +16,16 @@
 
 __author__ = 'f1ashhimself@gmail.com'
 
-import re
-from inspect import ismethod
-from types import FunctionType
+from itertools import islice
 from abc import ABCMeta, abstractmethod, abstractproperty
-import xml.dom.minidom
+import io
 
 from ..utils.common import CommonUtils
+from ..utils.element_cache import ElementCache
+from ..utils.locator import Locator
+from ..utils.relation import Relation
+from ..utils.selector import Selector
+from .. import TooSaltyUISoupException
 
 if CommonUtils.is_python_3():
     unicode = str
@@ -34,6 +37,32 @@ class IElement(object):
     """
 
     __metaclass__ = ABCMeta
+    __slots__ = ()
+
+    # Flag that indicates will elements met during search be cached, cache
+    # is created on first search, see _get_element_cache.
+    _is_element_cache_enabled = False
+    _element_cache = None
+
+    # Relative cost of reading property from backend, used to evaluate
+    # cheap conditions first when matching elements.
+    _acc_property_costs = {
+        'role': 1,
+        'role_name': 1,
+        'name': 2,
+        'value': 2,
+        'description': 2,
+        'location': 2,
+        'c_name': 4,
+        'selection': 8,
+        'child_count': 8,
+        'parent_count': 16,
+    }
+
+    # Properties written by toxml and write_xml by default.
+    _XML_ATTRIBUTES = ('name', 'location')
+    _XML_ENTITIES = (('&', '&amp;'), ('<', '&lt;'), ('"', '&quot;'),
+                     ('>', '&gt;'))
 
     @abstractmethod
     def click(self, x_offset=None, y_offset=None):
@@ -78,6 +107,13 @@ class IElement(object):
         :param bool smooth: indicates is it needed to simulate smooth movement.
         """
 
+    @abstractproperty
+    def key(self):
+        """
+        Property for stable element identity, elements with equal keys
+        refer to the same UI object.
+        """
+
     @abstractproperty
     def proc_id(self):
         """
@@ -200,13 +236,35 @@ class IElement(object):
     def __iter__(self):
         """Iterate all child Element"""
 
-    @abstractmethod
-    def find(self, only_visible=True, **kwargs):
+    def refresh(self):
+        """
+        Drops property values cached by element, so they are read from UI
+        on next access.
+        """
+
+    def find(self, only_visible=True, locator=None, max_depth=None,
+             min_depth=None, include_same_process_windows=True, descend=None,
+             prefetch=None, **kwargs):
         """
         Finds first child element.
 
         :param bool only_visible: flag that indicates will we search only
         through visible elements.
+        :param uisoup.utils.locator.Locator locator: precompiled conditions,
+        kwargs if given are added to them.
+        :param int max_depth: maximum depth of found elements, direct
+        children have depth 1.
+        :param int min_depth: minimum depth of found elements.
+        :param bool include_same_process_windows: flag that indicates will
+        we also search through other windows of the same process when
+        searching from top level window.
+        :param descend: function that takes element and returns False if
+        its children shouldn't be searched e.g. lambda x: x.acc_role_name !=
+        'tbl'.
+        :param list[str] prefetch: properties read in bulk for every visited
+        element e.g. ['name', 'role_name', 'location', 'state'], found
+        elements serve them without backend calls until refresh or UI
+        action.
         :param str role: string or lambda e.g. lambda x: x == 13
         :param str name: string or lambda.
         :param str c_name: string or lambda.
@@ -217,17 +275,109 @@ class IElement(object):
         :param str role_name: string or lambda.
         :param str parent_count: string or lambda.
         :param str child_count: string or lambda.
+        :param right_of: element or (left, top, width, height) rect, found
+        element should be to the right of it in the same row.
+        :param below: element or rect, found element should be below it in
+        the same column.
+        :param within: element or rect, found element should lie inside it.
+        :param nearest_to: element or (x, y) point, elements nearest to it
+        are found first. See uisoup.utils.relation.Relation.
         :rtype: IElement
         :return: Element that was found otherwise exception will be raised.
         """
+        relation = Relation.pop(kwargs)
+        locator = Locator.build(locator, **kwargs)
+        # Cached elements don't hold their depth and window so cache can be
+        # used only for unrestricted search.
+        is_scoped = max_depth is not None or min_depth is not None or \
+            descend is not None or not include_same_process_windows or \
+            relation is not None
 
-    @abstractmethod
-    def findall(self, only_visible=True, **kwargs):
+        element_cache = self._get_element_cache()
+        if not is_scoped and element_cache is not None:
+            obj_element = element_cache.find(locator, only_visible)
+            if obj_element is not None:
+                return obj_element
+
+        for obj_element in self._finditer(
+                only_visible, locator, max_depth, min_depth,
+                include_same_process_windows, descend, relation, prefetch):
+            return obj_element
+
+        raise TooSaltyUISoupException(
+            'Can\'t find object with attributes "%s".' % locator)
+
+    def iterfind(self, only_visible=True, locator=None, max_depth=None,
+                 min_depth=None, include_same_process_windows=True,
+                 descend=None, prefetch=None, **kwargs):
+        """
+        Iterates child elements lazily, tree is walked only as far as
+        caller consumes results.
+
+        :param bool only_visible: flag that indicates will we search only
+        through visible elements.
+        :param uisoup.utils.locator.Locator locator: precompiled conditions,
+        kwargs if given are added to them.
+        :param int max_depth: maximum depth of found elements, direct
+        children have depth 1.
+        :param int min_depth: minimum depth of found elements.
+        :param bool include_same_process_windows: flag that indicates will
+        we also search through other windows of the same process when
+        searching from top level window.
+        :param descend: function that takes element and returns False if
+        its children shouldn't be searched e.g. lambda x: x.acc_role_name !=
+        'tbl'.
+        :param list[str] prefetch: properties read in bulk for every visited
+        element e.g. ['name', 'role_name', 'location', 'state'], found
+        elements serve them without backend calls until refresh or UI
+        action.
+        :param str role: string or lambda e.g. lambda x: x == 13
+        :param str name: string or lambda.
+        :param str c_name: string or lambda.
+        :param str location: string or lambda.
+        :param str value: string or lambda.
+        :param str description: string or lambda.
+        :param str selection: string or lambda.
+        :param str role_name: string or lambda.
+        :param str parent_count: string or lambda.
+        :param str child_count: string or lambda.
+        :param right_of: element or (left, top, width, height) rect, found
+        element should be to the right of it in the same row.
+        :param below: element or rect, found element should be below it in
+        the same column.
+        :param within: element or rect, found element should lie inside it.
+        :param nearest_to: element or (x, y) point, elements nearest to it
+        are found first. See uisoup.utils.relation.Relation.
+        :rtype: IElement
+        :return: yield found element.
+        """
+        return self._finditer(only_visible, locator, max_depth, min_depth,
+                              include_same_process_windows, descend,
+                              prefetch=prefetch, **kwargs)
+
+    def findall(self, only_visible=True, locator=None, max_depth=None,
+                min_depth=None, include_same_process_windows=True,
+                descend=None, limit=None, prefetch=None, **kwargs):
         """
         Find all child element.
 
         :param bool only_visible: flag that indicates will we search only
         through visible elements.
+        :param uisoup.utils.locator.Locator locator: precompiled conditions,
+        kwargs if given are added to them.
+        :param int max_depth: maximum depth of found elements, direct
+        children have depth 1.
+        :param int min_depth: minimum depth of found elements.
+        :param bool include_same_process_windows: flag that indicates will
+        we also search through other windows of the same process when
+        searching from top level window.
+        :param descend: function that takes element and returns False if
+        its children shouldn't be searched e.g. lambda x: x.acc_role_name !=
+        'tbl'.
+        :param list[str] prefetch: properties read in bulk for every visited
+        element e.g. ['name', 'role_name', 'location', 'state'], found
+        elements serve them without backend calls until refresh or UI
+        action.
         :param str role: string or lambda e.g. lambda x: x == 13
         :param str name: string or lambda.
         :param str c_name: string or lambda.
@@ -238,17 +388,107 @@ class IElement(object):
         :param str role_name: string or lambda.
         :param str parent_count: string or lambda.
         :param str child_count: string or lambda.
+        :param right_of: element or (left, top, width, height) rect, found
+        element should be to the right of it in the same row.
+        :param below: element or rect, found element should be below it in
+        the same column.
+        :param within: element or rect, found element should lie inside it.
+        :param nearest_to: element or (x, y) point, elements nearest to it
+        are found first. See uisoup.utils.relation.Relation.
+        :param int limit: maximum number of elements to find, search stops
+        as soon as it is reached.
         :rtype: list[IElement]
-        :return: List of all elements that was found otherwise None.
+        :return: List of all elements that was found.
         """
+        iter_ = self.iterfind(only_visible, locator, max_depth, min_depth,
+                              include_same_process_windows, descend,
+                              prefetch, **kwargs)
 
-    @abstractmethod
-    def is_object_exists(self, **kwargs):
+        return list(islice(iter_, limit))
+
+    def count(self, **kwargs):
+        """
+        Counts child elements without collecting them.
+
+        :param kwargs: same arguments as for iterfind.
+        :rtype: int
+        :return: number of elements that was found.
+        """
+        return sum(1 for _ in self.iterfind(**kwargs))
+
+    def find_many(self, locators, only_visible=True, required=None,
+                  max_depth=None, min_depth=None,
+                  include_same_process_windows=True, descend=None):
+        """
+        Finds first child element for each of locators in a single walk
+        through the tree.
+
+        :param dict locators: key to uisoup.utils.locator.Locator or dict
+        with find kwargs e.g. {'ok': {'c_name': 'btnOK'}}.
+        :param bool only_visible: flag that indicates will we search only
+        through visible elements.
+        :param list required: keys of locators that should be found, all
+        keys by default. Search stops as soon as all required elements are
+        found, so other ones are found only if they were met earlier. If no
+        keys are required whole tree is searched for all locators.
+        :param int max_depth: maximum depth of found elements, direct
+        children have depth 1.
+        :param int min_depth: minimum depth of found elements.
+        :param bool include_same_process_windows: flag that indicates will
+        we also search through other windows of the same process when
+        searching from top level window.
+        :param descend: function that takes element and returns False if
+        its children shouldn't be searched e.g. lambda x: x.acc_role_name !=
+        'tbl'.
+        :rtype: dict
+        :return: key to element that was found or None for not required
+        elements, exception will be raised if required element wasn't found.
+        """
+        pending = dict(
+            (key, value if isinstance(value, Locator) else Locator(**value))
+            for key, value in locators.items())
+        required = set(pending if required is None else required)
+        is_optional_search = not required
+        result = dict.fromkeys(pending)
+
+        if pending:
+            for obj_element in self._finditer(
+                    False, Locator(), max_depth, min_depth,
+                    include_same_process_windows, descend):
+                for key, locator in list(pending.items()):
+                    if locator.match(obj_element, only_visible):
+                        result[key] = obj_element
+                        del pending[key]
+                        required.discard(key)
+
+                if not pending or not required and not is_optional_search:
+                    break
+
+        if required:
+            raise TooSaltyUISoupException(
+                'Can\'t find objects "%s".' % '; '.join(
+                    '%s: %s' % (key, pending.get(key)) for key in
+                    sorted(required)))
+
+        return result
+
+    def is_object_exists(self, locator=None, **kwargs):
         """
         Verifies is object exists.
 
         :param bool only_visible: flag that indicates will we search only
         through visible elements.
+        :param uisoup.utils.locator.Locator locator: precompiled conditions,
+        kwargs if given are added to them.
+        :param int max_depth: maximum depth of found elements, direct
+        children have depth 1.
+        :param int min_depth: minimum depth of found elements.
+        :param bool include_same_process_windows: flag that indicates will
+        we also search through other windows of the same process when
+        searching from top level window.
+        :param descend: function that takes element and returns False if
+        its children shouldn't be searched e.g. lambda x: x.acc_role_name !=
+        'tbl'.
         :param str role: string or lambda e.g. lambda x: x == 13
         :param str name: string or lambda.
         :param str c_name: string or lambda.
@@ -259,40 +499,244 @@ class IElement(object):
         :param str role_name: string or lambda.
         :param str parent_count: string or lambda.
         :param str child_count: string or lambda.
+        :param right_of: element or (left, top, width, height) rect, found
+        element should be to the right of it in the same row.
+        :param below: element or rect, found element should be below it in
+        the same column.
+        :param within: element or rect, found element should lie inside it.
+        :param nearest_to: element or (x, y) point, elements nearest to it
+        are found first. See uisoup.utils.relation.Relation.
         :rtype: bool
         :return: True if object exists otherwise False.
         """
+        try:
+            self.find(locator=locator, **kwargs)
+            return True
+        except TooSaltyUISoupException:
+            return False
+
+    def select(self, selector, only_visible=True):
+        """
+        Finds first child element by hierarchical selector.
+
+        :param str | uisoup.utils.selector.Selector selector: selector
+        e.g. 'frm > pane[name="Settings*"] btn[c_name="btnOK"]'.
+        :param bool only_visible: flag that indicates will we search only
+        through visible elements.
+        :rtype: IElement
+        :return: Element that was found otherwise exception will be raised.
+        """
+        for obj_element in Selector.build(selector).iter_matches(
+                self, only_visible):
+            return obj_element
+
+        raise TooSaltyUISoupException(
+            'Can\'t find object by selector "%s".' % selector)
+
+    def selectall(self, selector, only_visible=True):
+        """
+        Finds all child elements by hierarchical selector.
 
-    def toxml(self):
+        :param str | uisoup.utils.selector.Selector selector: selector
+        e.g. 'frm > pane[name="Settings*"] btn[c_name="btnOK"]'.
+        :param bool only_visible: flag that indicates will we search only
+        through visible elements.
+        :rtype: list[IElement]
+        :return: List of all elements that was found.
+        """
+        return list(Selector.build(selector).iter_matches(self, only_visible))
+
+    def snapshot(self, properties=None, max_depth=None):
+        """
+        Captures element subtree into in-memory tree that supports find,
+        findall, toxml and iteration without touching live UI.
+
+        :param list[str] properties: properties to capture, names are the
+        same as find kwargs (e.g. 'name', 'role_name', 'location') or state
+        names (e.g. 'is_enabled'). See SnapshotElement.DEFAULT_PROPERTIES.
+        :param int max_depth: maximum depth of captured elements, direct
+        children have depth 1.
+        :rtype: uisoup.utils.snapshot.SnapshotElement
+        :return: snapshot of this element.
+        """
+        from ..utils.snapshot import SnapshotElement
+
+        return SnapshotElement.capture(self, properties, max_depth)
+
+    def save_snapshot(self, file_path, properties=None, max_depth=None):
+        """
+        Captures element subtree into snapshot file that can be loaded with
+        uisoup.utils.snapshot_file.load_snapshot.
+
+        :param str file_path: path of snapshot file.
+        :param list[str] properties: properties to capture, same as for
+        snapshot method.
+        :param int max_depth: maximum depth of captured elements, direct
+        children have depth 1.
+        :rtype: int
+        :return: number of captured elements.
+        """
+        from ..utils.snapshot_file import save_snapshot
+
+        return save_snapshot(self, file_path, properties, max_depth)
+
+    def to_table(self, max_depth=None):
+        """
+        Captures element subtree into columnar table for vectorized
+        geometry and role queries, requires numpy.
+
+        :param int max_depth: maximum depth of captured elements, direct
+        children have depth 1.
+        :rtype: uisoup.utils.element_table.ElementTable
+        :return: element table.
+        """
+        from ..utils.element_table import ElementTable
+
+        return ElementTable.capture(self, max_depth)
+
+    def toxml(self, attributes=None):
         """
         Convert Element Tree to XML.
+
+        :param list[str] attributes: element properties written as XML
+        attributes, see write_xml.
+        :rtype: str
+        :return: pretty printed XML document.
+        """
+        obj_buffer = io.StringIO()
+        self.write_xml(obj_buffer, attributes)
+
+        return obj_buffer.getvalue()
+
+    def write_xml(self, fileobj, attributes=None):
         """
-        obj_document = xml.dom.minidom.Document()
-        lst_queue = [(self, obj_document)]
+        Writes Element Tree to file as XML. Elements are written as soon as
+        they are walked, so memory usage doesn't depend on tree size.
+
+        :param fileobj: text file-like object.
+        :param list[str] attributes: element properties written as XML
+        attributes, names are the same as find kwargs or state names
+        e.g. ['name', 'location', 'value', 'is_enabled']. Attribute names
+        are property names in CamelCase. Name and Location by default.
+        """
+        lst_attributes = self._get_xml_attributes(attributes)
+
+        fileobj.write(u'<?xml version="1.0" ?>\n')
+        # Stack of elements to write and closing tags of written ones.
+        lst_stack = [(self, u'')]
+
+        while lst_stack:
+            obj_element, str_indent = lst_stack.pop()
+            if not isinstance(obj_element, IElement):
+                fileobj.write(obj_element)
+                continue
 
-        while lst_queue:
-            obj_element, obj_tree = lst_queue.pop(0)
             role_name = obj_element.acc_role_name
-            obj_name = obj_element.acc_name
-            str_name = unicode(obj_name) if obj_name else ''
-            str_location = ','.join(str(x) for x in obj_element.acc_location)
-            obj_sub_tree = xml.dom.minidom.Element(role_name)
-            obj_sub_tree.ownerDocument = obj_document
+            fileobj.write(u'%s<%s' % (str_indent, role_name))
+            for str_attribute, str_property in lst_attributes:
+                fileobj.write(u' %s="%s"' % (
+                    str_attribute,
+                    self._escape_xml(obj_element._get_xml_value(
+                        str_property))))
+
+            lst_children = obj_element._get_export_children()
+            if not lst_children:
+                fileobj.write(u'/>\n')
+                continue
+
+            fileobj.write(u'>\n')
+            lst_stack.append((u'%s</%s>\n' % (str_indent, role_name), None))
+            lst_stack.extend((el, str_indent + u'\t') for el in
+                             reversed(lst_children))
+
+    def to_etree(self, attributes=None):
+        """
+        Builds XML tree of Element Tree in a single walk, lxml is used if it
+        is installed otherwise xml.etree.
 
-            try:
-                obj_sub_tree.attributes['Name'] = str_name
-            except:
-                obj_sub_tree.attributes['Name'] = \
-                    str_name.encode('unicode-escape')
+        :param list[str] attributes: element properties written as XML
+        attributes, see write_xml.
+        :rtype: uisoup.utils.xml_tree.XmlTree
+        :return: XML tree that maps its nodes back to elements.
+        """
+        from ..utils.xml_tree import XmlTree
+
+        return XmlTree.build(self, attributes)
+
+    def xpath(self, expression, attributes=None):
+        """
+        Finds elements by XPath expression over XML tree of element e.g.
+        '//btn[@Name="OK"]'. Full XPath is supported with lxml, xml.etree
+        supports only its XPath subset.
+
+        :param str expression: XPath expression.
+        :param list[str] attributes: element properties available as XML
+        attributes, see write_xml.
+        :rtype: list[IElement]
+        :return: list of found elements.
+        """
+        return self.to_etree(attributes).xpath(expression)
 
-            obj_sub_tree.attributes['Location'] = str_location
-            obj_tree.appendChild(obj_sub_tree)
+    @classmethod
+    def _get_xml_attributes(cls, attributes=None):
+        """
+        Gets XML attribute names of properties.
 
-            if obj_element.acc_child_count:
-                for obj_element_child in obj_element:
-                    lst_queue.append((obj_element_child, obj_sub_tree))
+        :param list[str] attributes: property names.
+        :rtype: list[tuple[str, str]]
+        :return: list of XML attribute and property names.
+        """
+        return [(''.join(x.title() for x in str_property.split('_')),
+                 str_property) for str_property in
+                attributes or cls._XML_ATTRIBUTES]
 
-        return obj_document.toprettyxml()
+    @classmethod
+    def _escape_xml(cls, str_value):
+        """
+        Escapes XML attribute value.
+
+        :param str str_value: attribute value.
+        :rtype: str
+        :return: escaped value.
+        """
+        for str_symbol, str_entity in cls._XML_ENTITIES:
+            str_value = str_value.replace(str_symbol, str_entity)
+
+        return str_value
+
+    def _get_xml_value(self, str_property):
+        """
+        Gets property value as XML attribute value.
+
+        :param str str_property: property name.
+        :rtype: str
+        :return: property value, empty string if it can't be read.
+        """
+        try:
+            value = getattr(self, str_property if
+                            str_property.startswith('is_') else
+                            'acc_' + str_property)
+        except:
+            value = None
+
+        value = CommonUtils.normalize_value(value)
+        if value is None:
+            return u''
+        if isinstance(value, tuple):
+            return u','.join(unicode(x) for x in value)
+        if isinstance(value, bytes) and not isinstance(value, unicode):
+            return value.decode('utf-8', 'replace')
+
+        return unicode(value)
+
+    def __eq__(self, other):
+        return isinstance(other, IElement) and self.key == other.key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key)
 
     def __str__(self):
         result = '[Role: %s | Name: %r | Child count: %d]' % \
@@ -302,12 +746,143 @@ class IElement(object):
 
         return result
 
-    def _match(self, only_visible, **kwargs):
+    def _find_windows_by_same_proc(self):
+        """
+        Find window by same process id.
+
+        :rtype: list[IElement]
+        :return: list of windows.
+        """
+        return []
+
+    def _get_element_cache(self):
+        """
+        Gets cache of elements met during search from this element. Only
+        search roots need it, so it is created on first use.
+
+        :rtype: uisoup.utils.element_cache.ElementCache
+        :return: element cache or None if element doesn't cache.
+        """
+        if self._element_cache is None and self._is_element_cache_enabled:
+            self._element_cache = ElementCache()
+
+        return self._element_cache
+
+    def _get_search_children(self):
+        """
+        Gets direct children that should be visited by search.
+
+        :rtype: list[IElement]
+        :return: list of child elements.
+        """
+        return list(self) if self.acc_child_count else []
+
+    def _get_export_children(self):
+        """
+        Gets direct children written to XML and snapshots of element tree.
+
+        :rtype: list[IElement]
+        :return: list of child elements.
+        """
+        return self._get_search_children()
+
+    def _finditer(self, only_visible, locator=None, max_depth=None,
+                  min_depth=None, include_same_process_windows=True,
+                  descend=None, relation=None, prefetch=None, **kwargs):
+        """
+        Find child element.
+
+        :param bool only_visible: flag that indicates will we search only
+        through visible elements.
+        :param uisoup.utils.locator.Locator locator: precompiled conditions,
+        kwargs if given are added to them.
+        :param int max_depth: maximum depth of found elements, direct
+        children have depth 1.
+        :param int min_depth: minimum depth of found elements.
+        :param bool include_same_process_windows: flag that indicates will
+        we also search through other windows of the same process when
+        searching from top level window.
+        :param descend: function that takes element and returns False if
+        its children shouldn't be searched e.g. lambda x: x.acc_role_name !=
+        'tbl'.
+        :param uisoup.utils.relation.Relation relation: geometric
+        conditions, relation kwargs if given are used otherwise.
+        :param list[str] prefetch: properties read in bulk for every batch
+        of visited siblings.
+        :rtype: IElement
+        :return: yield found element.
+        """
+        relation = relation or Relation.pop(kwargs)
+        locator = Locator.build(locator, **kwargs)
+
+        if relation is not None:
+            # All matched elements are needed to resolve relation.
+            for obj_element in relation.apply(self._finditer(
+                    only_visible, locator, max_depth, min_depth,
+                    include_same_process_windows, descend,
+                    prefetch=prefetch)):
+                yield obj_element
+            return
+
+        lst_children = list(self)
+        # Elements of other windows can be reached more than once so they
+        # are deduplicated by key.
+        set_visited = None
+
+        if include_same_process_windows and self.is_top_level_window:
+            lst_windows = self._find_windows_by_same_proc()
+            if lst_windows:
+                lst_children.extend(lst_windows)
+                set_visited = set()
+
+        if prefetch:
+            self._prefetch(lst_children, prefetch)
+
+        lst_stack = [(el, 1) for el in reversed(lst_children)]
+        element_cache = self._get_element_cache()
+
+        while lst_stack:
+            obj_element, depth = lst_stack.pop()
+            if set_visited is not None:
+                if obj_element in set_visited:
+                    continue
+                set_visited.add(obj_element)
+
+            if element_cache is not None:
+                element_cache.add(obj_element)
+
+            if (min_depth is None or depth >= min_depth) and \
+                    locator.match(obj_element, only_visible):
+                yield obj_element
+
+            if (max_depth is None or depth < max_depth) and \
+                    (descend is None or descend(obj_element)):
+                lst_children = obj_element._get_search_children()
+                if prefetch and lst_children:
+                    self._prefetch(lst_children, prefetch)
+                lst_stack.extend(
+                    (el, depth + 1) for el in reversed(lst_children))
+
+    @classmethod
+    def _prefetch(cls, elements, properties):
+        """
+        Reads properties of sibling elements in bulk, so elements serve
+        them without backend calls. Backends without bulk access don't
+        prefetch anything.
+
+        :param list[IElement] elements: elements with the same parent.
+        :param list[str] properties: property names, same as find kwargs
+        or 'state' for is_visible, is_enabled, is_selected and is_checked.
+        """
+
+    def _match(self, only_visible, locator=None, **kwargs):
         """
         Match method.
 
         :param bool only_visible: flag that indicates will we search only
         through visible elements.
+        :param uisoup.utils.locator.Locator locator: precompiled conditions,
+        kwargs if given are added to them.
         :param str role: string or lambda e.g. lambda x: x == 13
         :param str name: string or lambda.
         :param str c_name: string or lambda.
@@ -321,24 +896,4 @@ class IElement(object):
         :rtype: bool
         :return: True if element was matched otherwise False.
         """
-        try:
-            if only_visible and not self.is_visible:
-                return False
-
-            for str_property, expected_result in kwargs.items():
-                attr = getattr(self, 'acc_' + str_property)
-                if ismethod(attr):
-                    attr = attr()
-
-                if type(expected_result) is FunctionType:
-                    if not expected_result(attr):
-                        return False
-                else:
-                    regex = CommonUtils.convert_wildcard_to_regex(
-                        expected_result)
-                    if not re.match(regex, attr):
-                        return False
-        except:
-            return False
-        else:
-            return True
+        return Locator.build(locator, **kwargs).match(self, only_visible)
@@ -17,8 +17,10 @@
 __author__ = 'f1ashhimself@gmail.com'
 
 from abc import ABCMeta, abstractmethod, abstractproperty
+from functools import partial
 
 from .. import TooSaltyUISoupException
+from ..utils.input_scheduler import InputScheduler
 
 
 class Key(object):
@@ -48,9 +50,23 @@ class Key(object):
 
 
 class IKeyboard(object):
+    """
+    Class to simulate keyboard activities. Implementations call
+    ElementCache.invalidate_all after sending events, because input can
+    change UI.
+    """
 
     __metaclass__ = ABCMeta
 
+    # Scheduler that paces key events, it is shared with mouse.
+    scheduler = InputScheduler.default
+
+    # Seconds given to system to process key or key combination.
+    _KEY_PROCESSING_TIME = .05
+    # Seconds given to system to process modifier key before modified keys
+    # are pressed.
+    _MODIFIER_PROCESSING_TIME = 0
+
     @abstractproperty
     def codes(self):
         """
@@ -95,3 +111,48 @@ class IKeyboard(object):
         :param args: Keys to send.
         :param kwargs: "delay" between keys in seconds.
         """
+
+    def _get_key_events(self, keys, delay=0, start=0.0):
+        """
+        Builds timed events for Keys, modifier is held while its children
+        Keys are sent.
+
+        :param keys: Keys to send.
+        :param float delay: additional time between keys in seconds.
+        :param float start: time of first event.
+        :rtype: tuple[list, float]
+        :return: list of (time, callback) and time after last key was
+        processed.
+        """
+        lst_events = []
+        event_time = start
+        for key in keys:
+            if key.children:
+                lst_events.append(
+                    (event_time, partial(self.press_key_and_hold, key.code)))
+                event_time += self._MODIFIER_PROCESSING_TIME
+                lst_child_events, event_time = self._get_key_events(
+                    key.children, start=event_time)
+                lst_events.extend(lst_child_events)
+                lst_events.append(
+                    (event_time, partial(self.release_key, key.code)))
+            else:
+                lst_events.append(
+                    (event_time, partial(self.press_key, key.code)))
+            event_time += self._KEY_PROCESSING_TIME + delay
+
+        return lst_events, event_time
+
+    def _send_keys(self, keys, delay=0):
+        """
+        Sends Keys by scheduler at deadlines counted from start of sending,
+        so time spent in sending events doesn't accumulate.
+
+        :param keys: Keys to send.
+        :param float delay: additional time between keys in seconds.
+        """
+        lst_events, end_time = self._get_key_events(keys, delay)
+        # Last key is given time to be processed before following actions.
+        lst_events.append((end_time, lambda: None))
+
+        self.scheduler.run(lst_events)
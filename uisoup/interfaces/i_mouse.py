@@ -17,15 +17,27 @@
 __author__ = 'f1ashhimself@gmail.com'
 
 from abc import ABCMeta, abstractmethod, abstractproperty
+from functools import partial
+
+from ..utils.input_scheduler import InputScheduler
+from ..utils.motion import MotionProfile
 
 
 class IMouse(object):
     """
-    Class to simulate mouse activities.
+    Class to simulate mouse activities. Implementations call
+    ElementCache.invalidate_all after sending events, because input can
+    change UI.
     """
 
     __metaclass__ = ABCMeta
 
+    # Motion profile used when move or drag is called without one.
+    motion_profile = MotionProfile.legacy()
+
+    # Scheduler that paces mouse events, it is shared with keyboard.
+    scheduler = InputScheduler.default
+
     @abstractproperty
     def LEFT_BUTTON(self):
         """
@@ -39,17 +51,19 @@ class IMouse(object):
         """
 
     @abstractmethod
-    def move(self, x, y, smooth=True):
+    def move(self, x, y, smooth=True, motion_profile=None):
         """
         Move the mouse to the specified coordinates.
 
         :param int x: x coordinate.
         :param int y: y coordinate.
         :param bool smooth: indicates is it needed to simulate smooth movement.
+        :param uisoup.utils.motion.MotionProfile motion_profile: profile of
+        movement, motion_profile attribute by default.
         """
 
     @abstractmethod
-    def drag(self, x1, y1, x2, y2, smooth=True):
+    def drag(self, x1, y1, x2, y2, smooth=True, motion_profile=None):
         """
         Drags the mouse to the specified coordinates.
 
@@ -58,6 +72,8 @@ class IMouse(object):
         :param int x2: x target coordinate.
         :param int y2: y target coordinate.
         :param bool smooth: indicates is it needed to simulate smooth movement.
+        :param uisoup.utils.motion.MotionProfile motion_profile: profile of
+        movement, motion_profile attribute by default.
         """
 
     @abstractmethod
@@ -110,3 +126,35 @@ class IMouse(object):
         :rtype: tuple[int, int]
         :return: x and y coordinates of current mouse cursor position.
         """
+
+    def _get_motion_path(self, x1, y1, x2, y2, motion_profile=None):
+        """
+        Generates path of movement.
+
+        :param int x1: x start coordinate.
+        :param int y1: y start coordinate.
+        :param int x2: x target coordinate.
+        :param int y2: y target coordinate.
+        :param uisoup.utils.motion.MotionProfile motion_profile: profile of
+        movement, motion_profile attribute by default.
+        :rtype: list[tuple]
+        :return: list of (x, y, time), see MotionProfile.get_path.
+        """
+        return (motion_profile or self.motion_profile).get_path(x1, y1, x2, y2)
+
+    def _play_motion_path(self, path, do_point, smooth=True):
+        """
+        Generates events for points of path at their times by scheduler,
+        so delays of event generation don't accumulate.
+
+        :param list[tuple] path: list of (x, y, time).
+        :param do_point: function that gets x and y and generates event.
+        :param bool smooth: indicates is it needed to keep timing.
+        """
+        if not smooth:
+            for x, y, _ in path:
+                do_point(x, y)
+            return
+
+        self.scheduler.run((point_time, partial(do_point, x, y)) for
+                           x, y, point_time in path)
@@ -17,6 +17,8 @@
 __author__ = 'f1ashhimself@gmail.com'
 
 from abc import ABCMeta, abstractmethod, abstractproperty
+from collections import OrderedDict
+import threading
 
 
 class ISoup(object):
@@ -26,6 +28,12 @@ class ISoup(object):
 
     __metaclass__ = ABCMeta
 
+    # Number of threads used by capture_all by default.
+    DEFAULT_CAPTURE_WORKERS = 4
+    # Limit of capture_all threads for backends that can't work with UI
+    # from several threads, None if there is no limit.
+    MAX_CAPTURE_WORKERS = None
+
     @abstractproperty
     def mouse(self):
         """
@@ -72,20 +80,107 @@ class ISoup(object):
         """
 
     @abstractmethod
-    def get_visible_window_list(self):
+    def get_visible_window_list(self, limit=None):
         """
         Gets list of visible windows.
 
+        :param int limit: maximum number of windows to get.
         :rtype: list[uisoup.interfaces.i_element.IElement]
         :return: list of visible windows.
         """
 
     @abstractmethod
-    def get_visible_object_list(self, window_name):
+    def get_visible_object_list(self, window_name, limit=None):
         """
         Gets list of visible objects for specified window.
 
         :param str window_name: window name.
+        :param int limit: maximum number of objects to get.
         :rtype: list[uisoup.interfaces.i_element.IElement]
         :return: list of visible windows.
         """
+
+    def capture_all(self, workers=None, properties=None, max_depth=None):
+        """
+        Captures snapshots of all visible windows, windows are enumerated
+        once and captured in parallel threads. With one worker windows are
+        captured in calling thread.
+
+        :param int workers: number of threads, DEFAULT_CAPTURE_WORKERS by
+        default, never more than MAX_CAPTURE_WORKERS.
+        :param list[str] properties: properties to capture, see
+        uisoup.interfaces.i_element.IElement.snapshot.
+        :param int max_depth: maximum depth of captured elements.
+        :rtype: collections.OrderedDict
+        :return: window handle to window snapshot in enumeration order,
+        windows that can't be captured (e.g. were closed) are skipped.
+        """
+        lst_handles = self._get_capture_handles()
+        dct_snapshots = dict()
+        iter_handles = iter(lst_handles)
+        lock = threading.Lock()
+
+        def capture():
+            self._init_capture_thread()
+            try:
+                while True:
+                    with lock:
+                        handle = next(iter_handles, None)
+                    if handle is None:
+                        break
+
+                    try:
+                        dct_snapshots[handle] = self._capture_window(
+                            handle, properties, max_depth)
+                    except:
+                        pass
+            finally:
+                self._uninit_capture_thread()
+
+        workers = min(workers or self.DEFAULT_CAPTURE_WORKERS,
+                      self.MAX_CAPTURE_WORKERS or len(lst_handles),
+                      len(lst_handles))
+        if workers <= 1:
+            capture()
+        else:
+            lst_threads = [threading.Thread(target=capture) for _ in
+                           range(workers)]
+            for thread in lst_threads:
+                thread.start()
+            for thread in lst_threads:
+                thread.join()
+
+        return OrderedDict((handle, dct_snapshots[handle]) for handle in
+                           lst_handles if handle in dct_snapshots)
+
+    def _get_capture_handles(self):
+        """
+        Gets handles of visible windows that can be used to get window in
+        any thread.
+
+        :rtype: list
+        :return: list of window handles.
+        """
+        return self.get_visible_window_list()
+
+    def _capture_window(self, handle, properties=None, max_depth=None):
+        """
+        Captures window snapshot in capture thread.
+
+        :param handle: window handle from _get_capture_handles.
+        :param list[str] properties: properties to capture.
+        :param int max_depth: maximum depth of captured elements.
+        :rtype: uisoup.utils.snapshot.SnapshotElement
+        :return: window snapshot.
+        """
+        return handle.snapshot(properties, max_depth)
+
+    def _init_capture_thread(self):
+        """
+        Prepares capture thread for working with UI.
+        """
+
+    def _uninit_capture_thread(self):
+        """
+        Releases resources of capture thread.
+        """
@@ -18,6 +18,7 @@ __author__ = 'f1ashhimself@gmail.com'
 
 from ..interfaces.i_element import IElement
 from ..utils.mac_utils import MacUtils
+from ..utils.element_cache import ElementCache
 from .. import TooSaltyUISoupException
 from .mouse import MacMouse
 
@@ -60,7 +61,23 @@ class MacElement(IElement):
         'AXLink': u'lnk'
     }
 
+    # Most properties are read from the same cached applescript result,
+    # child count executes applescript on every call.
+    _acc_property_costs = {
+        'role': 1,
+        'role_name': 1,
+        'name': 1,
+        'value': 1,
+        'description': 1,
+        'location': 1,
+        'c_name': 2,
+        'selection': 1,
+        'parent_count': 1,
+        'child_count': 50,
+    }
+
     _mouse = MacMouse()
+    _is_element_cache_enabled = True
 
     def __init__(self, obj_selector, layer_num, process_name, process_id,
                  class_id=None):
@@ -78,9 +95,30 @@ class MacElement(IElement):
         self._proc_id = process_id
         self._proc_name = process_name
         self._class_id = class_id
-        self._cached_children = set()
         self._cached_properties = None
 
+    def refresh(self):
+        self._cached_properties = None
+
+    @classmethod
+    def _prefetch(cls, elements, properties):
+        # Element properties are always read all at once, so properties of
+        # all siblings are read by one command regardless of names.
+        lst_elements = [el for el in elements if not el._cached_properties]
+        if not lst_elements:
+            return
+
+        try:
+            lst_properties = \
+                MacUtils.ApplescriptExecutor.get_elements_properties(
+                    [el._object_selector for el in lst_elements],
+                    lst_elements[0]._proc_name)
+        except TooSaltyUISoupException:
+            return
+
+        for obj_element, dct_properties in zip(lst_elements, lst_properties):
+            obj_element._cached_properties = dct_properties
+
     @property
     def _properties(self):
         """
@@ -117,7 +155,7 @@ class MacElement(IElement):
                         self._proc_id, element.class_id) for element in
              axunknown_windows + axdialog_windows]
 
-        return filter(lambda x: x.acc_child_count, mac_elements)
+        return [el for el in mac_elements if el.acc_child_count]
 
     def click(self, x_offset=0, y_offset=0):
         x, y, w, h = self.acc_location
@@ -126,6 +164,7 @@ class MacElement(IElement):
 
         self._mouse.click(x, y)
         self._cached_properties = None
+        ElementCache.invalidate_all()
 
     def right_click(self, x_offset=0, y_offset=0):
         x, y, w, h = self.acc_location
@@ -134,6 +173,7 @@ class MacElement(IElement):
 
         self._mouse.click(x, y, self._mouse.RIGHT_BUTTON)
         self._cached_properties = None
+        ElementCache.invalidate_all()
 
     def double_click(self, x_offset=0, y_offset=0):
         x, y, w, h = self.acc_location
@@ -142,6 +182,7 @@ class MacElement(IElement):
 
         self._mouse.double_click(x, y)
         self._cached_properties = None
+        ElementCache.invalidate_all()
 
     def drag_to(self, x, y, x_offset=None, y_offset=None, smooth=True):
         el_x, el_y, el_w, el_h = self.acc_location
@@ -150,6 +191,11 @@ class MacElement(IElement):
 
         self._mouse.drag(el_x, el_y, x, y, smooth)
         self._cached_properties = None
+        ElementCache.invalidate_all()
+
+    @property
+    def key(self):
+        return self._proc_id, self._object_selector
 
     @property
     def proc_id(self):
@@ -212,6 +258,7 @@ class MacElement(IElement):
     def set_focus(self):
         MacUtils.ApplescriptExecutor.set_element_attribute_value(
             self._object_selector, 'AXFocused', 'true', self._proc_name, False)
+        ElementCache.invalidate_all()
 
     @property
     def acc_c_name(self):
@@ -232,6 +279,7 @@ class MacElement(IElement):
         MacUtils.ApplescriptExecutor.set_element_attribute_value(
             self._object_selector, 'AXValue', value, self._proc_name)
         self._cached_properties = None
+        ElementCache.invalidate_all()
 
     @property
     def acc_description(self):
@@ -287,75 +335,3 @@ class MacElement(IElement):
             yield MacElement(element['selector'], layer_number,
                              self._proc_name, self.proc_id,
                              element['class_id'])
-
-    def __findcacheiter(self, only_visible, **kwargs):
-        """
-        Find child element in the cache.
-
-        :param bool only_visible: flag that indicates will we search only 
-        visible.
-        :rtype: uisoup.interfaces.i_element.IElement
-        :return: yield found element.
-        """
-        for obj_element in self._cached_children:
-            if obj_element._match(only_visible, **kwargs):
-                yield obj_element
-
-    def _finditer(self, only_visible, **kwargs):
-        """
-        Find child element.
-
-        :param bool only_visible: flag that indicates will we search only 
-        visible.
-        :rtype: uisoup.interfaces.i_element.IElement
-        :return: yield found element.
-        """
-        lst_queue = list(self)
-
-        if self.is_top_level_window:
-            lst_queue.extend(self._find_windows_by_same_proc())
-
-        while lst_queue:
-            obj_element = lst_queue.pop(0)
-            self._cached_children.add(obj_element)
-
-            if obj_element._match(only_visible, **kwargs):
-                yield obj_element
-
-            if obj_element.acc_child_count:
-                childs = [el for el in list(obj_element)]
-                lst_queue[:0] = childs
-
-    def find(self, only_visible=True, **kwargs):
-        try:
-            iter_ = next(self.__findcacheiter(only_visible, **kwargs)) if \
-                MacUtils.is_python_3() else self.__findcacheiter(
-                only_visible, **kwargs).next()
-            return iter_
-        except StopIteration:
-            try:
-                iter_ = next(self._finditer(only_visible, **kwargs)) if \
-                    MacUtils.is_python_3() else self._finditer(
-                    only_visible, **kwargs).next()
-                return iter_
-            except StopIteration:
-                items_ = kwargs.items() if MacUtils.is_python_3() else \
-                    kwargs.iteritems()
-                attrs = ['%s=%s' % (k, v) for k, v in items_]
-                raise TooSaltyUISoupException(
-                    'Can\'t find object with attributes "%s".' %
-                    '; '.join(attrs))
-
-    def findall(self, only_visible=True, **kwargs):
-        result = self._finditer(only_visible, **kwargs)
-        if result:
-            result = list(result)
-
-        return result
-
-    def is_object_exists(self, **kwargs):
-        try:
-            self.find(**kwargs)
-            return True
-        except TooSaltyUISoupException:
-            return False
@@ -18,13 +18,15 @@ __author__ = 'alex.jakovenko@gmail.com'
 
 from Quartz import CoreGraphics as CG
 
-from time import sleep
-
 from ..interfaces.i_keyboard import Key, IKeyboard
+from ..utils.element_cache import ElementCache
 
 
 class MacKeyboard(IKeyboard):
 
+    # Modifier is processed before modified keys are pressed.
+    _MODIFIER_PROCESSING_TIME = .05
+
     class _KeyCodes(object):
         """
         Holder for Macintosh keyboard codes stored as Keys.
@@ -152,6 +154,7 @@ class MacKeyboard(IKeyboard):
         CG.CGEventPost(
             CG.kCGHIDEventTap,
             CG.CGEventCreateKeyboardEvent(None, hex_key_code, True))
+        ElementCache.invalidate_all()
 
     def release_key(self, hex_key_code):
         """
@@ -162,6 +165,7 @@ class MacKeyboard(IKeyboard):
         CG.CGEventPost(
             CG.kCGHIDEventTap,
             CG.CGEventCreateKeyboardEvent(None, hex_key_code, False))
+        ElementCache.invalidate_all()
 
     def send(self, *args, **kwargs):
         """
@@ -172,20 +176,4 @@ class MacKeyboard(IKeyboard):
 
         :param args: Keys to send.
         """
-        delay = kwargs.get('delay', 0)
-
-        for key in args:
-            if key.children:
-                self.press_key_and_hold(key.code)
-                self._wait_for_key_combo_to_be_processed()
-                self.send(*key.children)
-                self.release_key(key.code)
-            else:
-                self.press_key(key.code)
-            self._wait_for_key_combo_to_be_processed()
-            sleep(delay)
-
-    def _wait_for_key_combo_to_be_processed(self):
-        # For key combinations timeout is needed to be processed.
-        # This method is expressive shortcut to be used where needed.
-        sleep(.05)
+        self._send_keys(args, kwargs.get('delay', 0))
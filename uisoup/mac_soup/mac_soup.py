@@ -19,11 +19,14 @@ __author__ = 'f1ashhimself@gmail.com'
 
 import sys
 import re
+import time
 
 from Quartz import CoreGraphics as CG
 
 from ..interfaces.i_soup import ISoup
 from ..utils.mac_utils import MacUtils
+from ..utils.element_cache import ElementCache
+from ..utils.spatial_index import SpatialIndex
 from .element import MacElement
 from .mouse import MacMouse
 from .keyboard import MacKeyboard
@@ -39,6 +42,44 @@ class MacSoup(ISoup):
     keyboard = MacKeyboard()
     _default_sys_encoding = sys.stdout.encoding or sys.getdefaultencoding()
 
+    # NSAppleScript can be used only from main thread, so capture_all
+    # captures windows one by one in calling thread.
+    MAX_CAPTURE_WORKERS = 1
+
+    # Seconds during which spatial index of window is reused.
+    SPATIAL_INDEX_TTL = 2.0
+
+    # Window key -> (spatial index, cache generation, build time).
+    _spatial_indexes = dict()
+
+    def _get_spatial_index(self, window):
+        """
+        Gets cached spatial index of window elements, index is rebuilt when
+        it is older than SPATIAL_INDEX_TTL or after UI actions.
+
+        :param MacElement window: window element.
+        :rtype: uisoup.utils.spatial_index.SpatialIndex
+        :return: spatial index of visible window elements.
+        """
+        key = window.key
+        entry = self._spatial_indexes.get(key)
+        if entry is None or entry[1] != ElementCache._generation or \
+                time.time() - entry[2] > self.SPATIAL_INDEX_TTL:
+            entry = (SpatialIndex.from_element(window),
+                     ElementCache._generation, time.time())
+            # Only index of the latest window is kept.
+            self._spatial_indexes.clear()
+            self._spatial_indexes[key] = entry
+
+        return entry[0]
+
+    @classmethod
+    def invalidate_spatial_index(cls):
+        """
+        Drops cached spatial indexes of windows.
+        """
+        cls._spatial_indexes.clear()
+
     def get_object_by_coordinates(self, x, y):
         result = None
 
@@ -47,23 +88,7 @@ class MacSoup(ISoup):
                 MacUtils.ApplescriptExecutor.get_frontmost_window_name()
 
             window = self.get_window(window_handle)
-
-            # Sorting by layer from big to small.
-            if MacUtils.is_python_3():
-                sorted_objects = \
-                    sorted(window.findall(), key=lambda x: x._layer_num,
-                           reverse=True)
-            else:
-                sorted_objects = \
-                    sorted(window.findall(),
-                           lambda x, y: y._layer_num - x._layer_num)
-
-            cur_x, cur_y = self.mouse.get_position()
-            for element in sorted_objects:
-                x, y, w, h = element.acc_location
-                if x <= cur_x < x + w and y <= cur_y < y + h:
-                    result = element
-                    break
+            result = self._get_spatial_index(window).hit_test(x, y)
         except:
             pass
 
@@ -119,20 +144,30 @@ class MacSoup(ISoup):
 
         return MacElement(selector, 0, process_name, process_id)
 
-    def get_visible_window_list(self):
+    def _get_visible_window_names(self):
+        """
+        Gets combined names (window name + process name) of visible
+        windows.
+
+        :rtype: list[str]
+        :return: list of window names.
+        """
         win_list = CG.CGWindowListCopyWindowInfo(
             CG.kCGWindowListOptionOnScreenOnly |
             CG.kCGWindowListExcludeDesktopElements,
             CG.kCGNullWindowID)
 
-        win_names = \
+        return \
             [w.get('kCGWindowName', '') + w.get('kCGWindowOwnerName', '') for
              w in win_list if w.get('kCGWindowName', '') and 0 not in
              [int(w.get('kCGWindowBounds', 0)['Height']),
               int(w.get('kCGWindowBounds', 0)['Width'])]]
 
+    def get_visible_window_list(self, limit=None):
         windows = list()
-        for win_name in win_names:
+        for win_name in self._get_visible_window_names():
+            if limit is not None and len(windows) >= limit:
+                break
             try:
                 windows.append(self.get_window(win_name))
             except TooSaltyUISoupException:
@@ -140,10 +175,17 @@ class MacSoup(ISoup):
 
         return windows
 
-    def get_visible_object_list(self, window_name):
+    def get_visible_object_list(self, window_name, limit=None):
         window = self.get_window(window_name)
         objects = window.findall(
             only_visible=True,
+            limit=limit,
             location=lambda x: 0 not in x[2:])
 
         return objects
+
+    def _get_capture_handles(self):
+        return self._get_visible_window_names()
+
+    def _capture_window(self, handle, properties=None, max_depth=None):
+        return self.get_window(handle).snapshot(properties, max_depth)
@@ -19,14 +19,10 @@ __author__ = 'alex.jakovenko@gmail.com'
 
 from Quartz import CoreGraphics as CG
 
-from time import sleep
-
 from ..interfaces.i_mouse import IMouse
+from ..utils.element_cache import ElementCache
 from ..utils.mac_utils import MacUtils
 
-if MacUtils.is_python_3():
-    xrange = range
-
 
 class MacMouse(IMouse):
 
@@ -87,6 +83,9 @@ class MacMouse(IMouse):
             CG.kCGHIDEventTap,
             CG.CGEventCreateMouseEvent(None, code, (x, y), button)
         )
+        # Input could change UI, so cached elements and properties can't
+        # be trusted anymore.
+        ElementCache.invalidate_all()
 
     def _do_events(self, codes, x, y):
         """
@@ -99,30 +98,28 @@ class MacMouse(IMouse):
         for code in codes:
             self._do_event(code, x, y)
 
-    def move(self, x, y, smooth=True):
+    def move(self, x, y, smooth=True, motion_profile=None):
         MacUtils.verify_xy_coordinates(x, y)
 
         old_x, old_y = self.get_position()
 
-        for i in xrange(100):
-            intermediate_x = old_x + (x - old_x) * (i + 1) / 100.0
-            intermediate_y = old_y + (y - old_y) * (i + 1) / 100.0
-            smooth and sleep(.01)
-
-            self._do_event(CG.kCGEventMouseMoved, int(intermediate_x),
-                           int(intermediate_y))
+        self._play_motion_path(
+            self._get_motion_path(old_x, old_y, x, y, motion_profile),
+            lambda point_x, point_y: self._do_event(
+                CG.kCGEventMouseMoved, int(point_x), int(point_y)),
+            smooth)
 
-    def drag(self, x1, y1, x2, y2, smooth=True):
+    def drag(self, x1, y1, x2, y2, smooth=True, motion_profile=None):
         MacUtils.verify_xy_coordinates(x1, y1)
         MacUtils.verify_xy_coordinates(x2, y2)
 
         self.press_button(x1, y1, self.LEFT_BUTTON)
 
-        for i in xrange(100):
-            x = x1 + (x2 - x1) * (i + 1) / 100.0
-            y = y1 + (y2 - y1) * (i + 1) / 100.0
-            smooth and sleep(.01)
-            self._do_event(CG.kCGEventLeftMouseDragged, x, y)
+        self._play_motion_path(
+            self._get_motion_path(x1, y1, x2, y2, motion_profile),
+            lambda point_x, point_y: self._do_event(
+                CG.kCGEventLeftMouseDragged, point_x, point_y),
+            smooth)
 
         self.release_button(self.LEFT_BUTTON)
 
@@ -178,6 +175,7 @@ class MacMouse(IMouse):
         CG.CGEventPost(CG.kCGHIDEventTap, event)
         CG.CGEventSetType(event, up)
         CG.CGEventPost(CG.kCGHIDEventTap, event)
+        ElementCache.invalidate_all()
 
     def get_position(self):
         position = CG.CGEventGetLocation(CG.CGEventCreate(None))
@@ -82,6 +82,21 @@ class CommonUtils(object):
                 'Button name should be one of supported %s.' %
                 repr(supported_names))
 
+    @classmethod
+    def normalize_value(cls, value):
+        """
+        Converts sequences and one-shot iterators (e.g. map on python 3)
+        to tuple, other values are returned as is.
+
+        :param value: property value.
+        :return: tuple or value as is.
+        """
+        if isinstance(value, (tuple, list)) or hasattr(value, '__next__') \
+                or hasattr(value, 'next'):
+            return tuple(value)
+
+        return value
+
     @classmethod
     def is_python_3(cls):
         """
@@ -0,0 +1,214 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+from collections import OrderedDict, deque
+
+
+class ElementCache(object):
+    """
+    Bounded LRU cache of elements met during search with lazily built
+    indexes by property value.
+
+    Elements are added without reading anything from them, their keys are
+    computed only when cache is queried. Index only narrows candidates,
+    every candidate is matched against live element properties before it is
+    returned. Candidates are tried in order elements were first met, which
+    is document order for elements met by unscoped searches, so cached
+    find returns the same element as search through the tree does. All
+    caches are dropped when generation is changed by invalidate_all, e.g.
+    after UI actions.
+    """
+
+    DEFAULT_MAX_SIZE = 2048
+    INDEXED_PROPERTIES = ('role_name', 'name', 'c_name')
+
+    _generation = 0
+
+    def __init__(self, max_size=None):
+        """
+        Constructor.
+
+        :param int max_size: maximum number of cached elements.
+        """
+        self.max_size = max_size or self.DEFAULT_MAX_SIZE
+        self.hits = 0
+        self.misses = 0
+        self._generation_seen = ElementCache._generation
+        # Elements added since last query, older ones would be evicted
+        # anyway.
+        self._pending = deque(maxlen=self.max_size)
+        # Element key -> (element, dict of indexed property values), least
+        # recently used first.
+        self._entries = OrderedDict()
+        # Element keys in order elements were first met.
+        self._met_order = OrderedDict()
+        # Property name -> property value -> set of element keys.
+        self._indexes = dict((str_property, dict()) for str_property in
+                             self.INDEXED_PROPERTIES)
+
+    @classmethod
+    def invalidate_all(cls):
+        """
+        Starts new generation so all caches are dropped on next access.
+        """
+        cls._generation += 1
+
+    @classmethod
+    def _get_key(cls, obj_element):
+        """
+        Gets element key in cache.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: element.
+        :return: key.
+        """
+        return obj_element.key
+
+    def _check_generation(self):
+        """
+        Drops cached elements if they belong to previous generation.
+        """
+        if self._generation_seen != ElementCache._generation:
+            self.clear()
+            self._generation_seen = ElementCache._generation
+
+    def clear(self):
+        """
+        Removes all elements from cache.
+        """
+        self._pending.clear()
+        self._entries.clear()
+        self._met_order.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    def add(self, obj_element):
+        """
+        Adds element to cache evicting least recently used ones.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: element.
+        """
+        self._check_generation()
+        self._pending.append(obj_element)
+
+    def _add_pending(self):
+        """
+        Puts pending elements into cache by their keys.
+        """
+        self._check_generation()
+
+        while self._pending:
+            obj_element = self._pending.popleft()
+            key = self._get_key(obj_element)
+            if key in self._entries:
+                # Keep the latest wrapper of the same UI object.
+                self._entries[key] = (obj_element, self._entries.pop(key)[1])
+                continue
+
+            self._entries[key] = (obj_element, dict())
+            self._met_order[key] = None
+
+            while len(self._entries) > self.max_size:
+                self._remove(*self._entries.popitem(last=False))
+
+    def _remove(self, key, entry):
+        """
+        Removes element from indexes.
+
+        :param key: element key.
+        :param tuple entry: element and its indexed property values.
+        """
+        del self._met_order[key]
+        for str_property, value in entry[1].items():
+            keys = self._indexes[str_property].get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._indexes[str_property][value]
+
+    def _build_index(self, str_property):
+        """
+        Indexes property value of elements that were not indexed yet.
+
+        :param str str_property: property name.
+        """
+        index = self._indexes[str_property]
+        for key, (obj_element, values) in self._entries.items():
+            if str_property in values:
+                continue
+
+            try:
+                value = getattr(obj_element, 'acc_' + str_property)
+            except:
+                value = None
+
+            values[str_property] = value
+            index.setdefault(value, set()).add(key)
+
+    def _get_candidates(self, locator):
+        """
+        Gets cached elements that can satisfy locator in order they were
+        first met.
+
+        :param uisoup.utils.locator.Locator locator: element conditions.
+        :rtype: list[tuple]
+        :return: list of element keys and elements.
+        """
+        exact_conditions = locator.exact_conditions
+        for str_property in self.INDEXED_PROPERTIES:
+            if str_property in exact_conditions:
+                self._build_index(str_property)
+                keys = self._indexes[str_property].get(
+                    exact_conditions[str_property], ())
+
+                return [(key, self._entries[key][0]) for key in
+                        self._met_order if key in keys]
+
+        return [(key, self._entries[key][0]) for key in self._met_order]
+
+    def find(self, locator, only_visible=True):
+        """
+        Finds cached element that currently satisfies locator.
+
+        :param uisoup.utils.locator.Locator locator: element conditions.
+        :param bool only_visible: flag that indicates will we search only
+        through visible elements.
+        :rtype: uisoup.interfaces.i_element.IElement
+        :return: element that was found otherwise None.
+        """
+        self._add_pending()
+
+        for key, obj_element in self._get_candidates(locator):
+            if locator.match(obj_element, only_visible):
+                self.hits += 1
+                self._entries[key] = self._entries.pop(key)
+                return obj_element
+
+        self.misses += 1
+
+        return None
+
+    def __len__(self):
+        self._add_pending()
+
+        return len(self._entries)
+
+    def __iter__(self):
+        self._add_pending()
+
+        return iter([entry[0] for entry in self._entries.values()])
@@ -0,0 +1,248 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .snapshot import SnapshotElement
+from .. import TooSaltyUISoupException
+
+
+class ElementTable(object):
+    """
+    Columnar table of captured element subtree for vectorized geometry and
+    role queries. Requires numpy.
+
+    Row i describes i-th element in preorder, root is row 0:
+      locations - (N, 4) int32 array of left, top, width, height;
+      role_codes - int32 array of indexes in role_names;
+      parent_indices - int32 array of parent rows, -1 for root.
+    """
+
+    UNKNOWN_ROLE = u'unknown'
+
+    def __init__(self, locations, role_codes, parent_indices, role_names,
+                 elements=None):
+        """
+        Constructor.
+
+        :param locations: (N, 4) array of element locations.
+        :param role_codes: array of element role codes.
+        :param parent_indices: array of parent rows.
+        :param list[str] role_names: role name of every role code.
+        :param list elements: elements of table rows.
+        """
+        self._check_numpy()
+
+        self.locations = numpy.asarray(locations, dtype=numpy.int32).reshape(
+            -1, 4)
+        self.role_codes = numpy.asarray(role_codes, dtype=numpy.int32)
+        self.parent_indices = numpy.asarray(parent_indices,
+                                            dtype=numpy.int32)
+        self.role_names = list(role_names)
+        self.elements = elements
+
+    @classmethod
+    def _check_numpy(cls):
+        """
+        Checks that numpy is available.
+        """
+        if numpy is None:
+            raise TooSaltyUISoupException(
+                'numpy is required for element table, install it with '
+                '"pip install UISoup[table]".')
+
+    @classmethod
+    def _get_role_names(cls, obj_element):
+        """
+        Gets role names known by element backend, their order defines role
+        codes.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: element.
+        :rtype: list[str]
+        :return: list of role names.
+        """
+        role_name_map = getattr(obj_element, '_acc_role_name_map', None) or \
+            dict()
+
+        return sorted(set(role_name_map.values())) + [cls.UNKNOWN_ROLE]
+
+    @classmethod
+    def capture(cls, obj_element, max_depth=None):
+        """
+        Captures element subtree into table.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: root
+        element.
+        :param int max_depth: maximum depth of captured elements.
+        :rtype: ElementTable
+        :return: element table.
+        """
+        cls._check_numpy()
+
+        role_names = cls._get_role_names(obj_element)
+        role_codes_map = dict((role_name, i) for i, role_name in
+                              enumerate(role_names))
+        locations = []
+        role_codes = []
+        parent_indices = []
+        elements = []
+
+        for _, obj_live_element, parent_index, _, _, _ in \
+                SnapshotElement._walk(obj_element, max_depth):
+            location = SnapshotElement._read_property(obj_live_element,
+                                                      'location')
+            locations.append(tuple(location) if location else (0, 0, 0, 0))
+
+            role_name = SnapshotElement._read_property(obj_live_element,
+                                                       'role_name') or \
+                cls.UNKNOWN_ROLE
+            if role_name not in role_codes_map:
+                role_codes_map[role_name] = len(role_names)
+                role_names.append(role_name)
+            role_codes.append(role_codes_map[role_name])
+
+            parent_indices.append(parent_index)
+            elements.append(obj_live_element)
+
+        return cls(locations, role_codes, parent_indices, role_names,
+                   elements)
+
+    def __len__(self):
+        return len(self.locations)
+
+    def __getitem__(self, index):
+        return self.elements[index]
+
+    def get_elements(self, indices):
+        """
+        Gets elements of table rows.
+
+        :param indices: row indexes or boolean mask.
+        :rtype: list[uisoup.interfaces.i_element.IElement]
+        :return: list of elements.
+        """
+        indices = numpy.asarray(indices)
+        if indices.dtype == bool:
+            indices = numpy.flatnonzero(indices)
+
+        return [self.elements[i] for i in indices]
+
+    def role_code(self, role_name):
+        """
+        Gets code of role name.
+
+        :param str role_name: role name.
+        :rtype: int
+        :return: role code or -1 if role is not in table.
+        """
+        try:
+            return self.role_names.index(role_name)
+        except ValueError:
+            return -1
+
+    def inside(self, rect, role_name=None):
+        """
+        Finds elements that lie entirely inside rectangle.
+
+        :param tuple rect: left, top, width and height of rectangle.
+        :param str role_name: role name of elements, any role by default.
+        :rtype: numpy.ndarray
+        :return: array of row indexes.
+        """
+        left, top, width, height = rect
+        x, y, w, h = self.locations.T.astype(numpy.int64)
+        mask = (x >= left) & (y >= top) & (x + w <= left + width) & \
+            (y + h <= top + height)
+        if role_name is not None:
+            mask &= self.role_codes == self.role_code(role_name)
+
+        return numpy.flatnonzero(mask)
+
+    def zero_size(self):
+        """
+        Finds elements with zero width or height.
+
+        :rtype: numpy.ndarray
+        :return: array of row indexes.
+        """
+        return numpy.flatnonzero((self.locations[:, 2] <= 0) |
+                                 (self.locations[:, 3] <= 0))
+
+    def overlapping_pairs(self, siblings_only=False):
+        """
+        Finds pairs of elements whose rectangles intersect, elements with
+        zero size never overlap.
+
+        :param bool siblings_only: indicates whether only elements with the
+        same parent should be paired, containment of child in parent is
+        reported otherwise.
+        :rtype: numpy.ndarray
+        :return: (M, 2) array of row index pairs, lower index first.
+        """
+        locations = self.locations.astype(numpy.int64)
+        indices = numpy.flatnonzero((locations[:, 2] > 0) &
+                                    (locations[:, 3] > 0))
+        # Sweep along x: candidates of every element are elements that
+        # start before its right edge.
+        indices = indices[numpy.argsort(locations[indices, 0],
+                                        kind='mergesort')]
+        left = locations[indices, 0]
+        top = locations[indices, 1]
+        right = left + locations[indices, 2]
+        bottom = top + locations[indices, 3]
+        parents = self.parent_indices[indices]
+        ends = numpy.searchsorted(left, right, side='left')
+
+        lst_pairs = []
+        for i in range(len(indices)):
+            candidates = numpy.arange(i + 1, ends[i])
+            if not len(candidates):
+                continue
+            mask = (top[candidates] < bottom[i]) & \
+                (bottom[candidates] > top[i])
+            if siblings_only:
+                mask &= parents[candidates] == parents[i]
+            candidates = candidates[mask]
+            if len(candidates):
+                lst_pairs.append(numpy.column_stack(
+                    (numpy.full(len(candidates), indices[i]),
+                     indices[candidates])))
+
+        if not lst_pairs:
+            return numpy.empty((0, 2), dtype=numpy.int64)
+
+        pairs = numpy.sort(numpy.concatenate(lst_pairs), axis=1)
+
+        return pairs[numpy.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def role_histogram(self):
+        """
+        Counts elements of every role.
+
+        :rtype: dict[str, int]
+        :return: role name to number of elements, only present roles.
+        """
+        counts = numpy.bincount(self.role_codes,
+                                minlength=len(self.role_names))
+
+        return dict((self.role_names[i], int(counts[i])) for i in
+                    numpy.flatnonzero(counts))
@@ -0,0 +1,231 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import threading
+import time
+
+# perf_counter is absent in python 2.
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+class InputScheduleReport(object):
+    """
+    Requested and achieved dispatch times of scheduled events, times are
+    offsets from start of schedule in seconds.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.requested = []
+        self.achieved = []
+
+    def add(self, requested, achieved):
+        """
+        Adds dispatched event.
+
+        :param float requested: requested time.
+        :param float achieved: time event was dispatched at.
+        """
+        self.requested.append(requested)
+        self.achieved.append(achieved)
+
+    @property
+    def lags(self):
+        """
+        Property for delays of events relative to requested times.
+        """
+        return [a - r for r, a in zip(self.requested, self.achieved)]
+
+    @property
+    def max_lag(self):
+        """
+        Property for maximum delay.
+        """
+        return max(self.lags) if self.requested else 0.0
+
+    @property
+    def mean_lag(self):
+        """
+        Property for average delay.
+        """
+        return sum(self.lags) / len(self.requested) if self.requested else 0.0
+
+    @property
+    def jitter(self):
+        """
+        Property for standard deviation of delays.
+        """
+        if not self.requested:
+            return 0.0
+
+        mean_lag = self.mean_lag
+
+        return (sum((x - mean_lag) ** 2 for x in self.lags) /
+                len(self.requested)) ** 0.5
+
+    def __len__(self):
+        return len(self.requested)
+
+    def __repr__(self):
+        return 'InputScheduleReport(events=%d, max_lag=%.6f, ' \
+               'mean_lag=%.6f, jitter=%.6f)' % \
+               (len(self), self.max_lag, self.mean_lag, self.jitter)
+
+
+class InputScheduler(object):
+    """
+    Dispatches input events at their deadlines. Deadlines are counted from
+    start of schedule by perf_counter, so time spent in event generation
+    doesn't accumulate. Waiting sleeps until deadline is close and spins
+    for the rest, because sleep alone oversleeps on loaded machines.
+    """
+
+    # Remaining seconds below which scheduler spins instead of sleeping.
+    DEFAULT_SPIN_THRESHOLD = .002
+
+    # Shared scheduler of mouse and keyboard, set after class definition.
+    default = None
+
+    def __init__(self, spin_threshold=None, clock=None, sleep=None):
+        """
+        Constructor.
+
+        :param float spin_threshold: seconds before deadline when spinning
+        starts, DEFAULT_SPIN_THRESHOLD by default.
+        :param clock: function that returns current time in seconds,
+        perf_counter by default.
+        :param sleep: function that sleeps given seconds, time.sleep by
+        default.
+        """
+        self.spin_threshold = self.DEFAULT_SPIN_THRESHOLD if \
+            spin_threshold is None else spin_threshold
+        self.clock = clock or _clock
+        self._sleep = sleep or time.sleep
+        self.last_report = None
+
+    def wait_until(self, deadline):
+        """
+        Waits until deadline.
+
+        :param float deadline: clock time to wait for.
+        """
+        while True:
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                return
+            if remaining > self.spin_threshold:
+                self._sleep(remaining - self.spin_threshold)
+            else:
+                # Gives other threads chance to run while spinning.
+                self._sleep(0)
+
+    def sleep(self, seconds):
+        """
+        Waits given time precisely.
+
+        :param float seconds: time to wait in seconds.
+        """
+        if seconds > 0:
+            self.wait_until(self.clock() + seconds)
+
+    def run(self, events, stop_event=None):
+        """
+        Dispatches events at their times.
+
+        :param events: iterable of (time, callback), time is offset from
+        start of schedule in seconds, callback is called without arguments.
+        Events with equal time are dispatched in given order.
+        :param threading.Event stop_event: event that stops dispatching.
+        :rtype: InputScheduleReport
+        :return: requested and achieved times of dispatched events.
+        """
+        lst_events = sorted(events, key=lambda event: event[0])
+        report = InputScheduleReport()
+        start = self.clock()
+
+        for event_time, callback in lst_events:
+            if stop_event is not None and stop_event.is_set():
+                break
+            self.wait_until(start + event_time)
+            report.add(event_time, self.clock() - start)
+            callback()
+
+        self.last_report = report
+
+        return report
+
+    def start(self, events):
+        """
+        Dispatches events in background thread.
+
+        :param events: iterable of (time, callback), see run.
+        :rtype: InputSchedulerThread
+        :return: started thread.
+        """
+        thread = InputSchedulerThread(self, events)
+        thread.start()
+
+        return thread
+
+
+class InputSchedulerThread(threading.Thread):
+    """
+    Thread that dispatches events by scheduler, report is available after
+    thread is finished.
+    """
+
+    def __init__(self, scheduler, events):
+        """
+        Constructor.
+
+        :param InputScheduler scheduler: scheduler.
+        :param events: iterable of (time, callback), see InputScheduler.run.
+        """
+        super(InputSchedulerThread, self).__init__()
+        self.daemon = True
+        self.report = None
+        self._scheduler = scheduler
+        self._events = list(events)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        self.report = self._scheduler.run(self._events, self._stop_event)
+
+    def stop(self):
+        """
+        Stops dispatching, events that weren't dispatched are dropped.
+        """
+        self._stop_event.set()
+
+    def wait(self, timeout=None):
+        """
+        Waits for thread to finish.
+
+        :param float timeout: timeout in seconds.
+        :rtype: InputScheduleReport
+        :return: report or None if thread isn't finished.
+        """
+        self.join(timeout)
+
+        return self.report
+
+
+InputScheduler.default = InputScheduler()
@@ -0,0 +1,218 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import re
+from inspect import ismethod
+
+from .common import CommonUtils
+
+if CommonUtils.is_python_3():
+    basestring = str
+
+_PATTERN_TYPE = type(re.compile(''))
+_WILDCARD_SYMBOLS = ('*', '?')
+
+
+class Locator(object):
+    """
+    Set of element conditions compiled once and reusable across find, findall
+    and is_object_exists calls.
+
+    Conditions are the same as find kwargs: wildcard strings, callables,
+    compiled regular expressions or plain values compared for equality.
+    """
+
+    # Matchers order is recalculated with observed selectivity after this
+    # number of matched elements.
+    _REORDER_INTERVAL = 64
+    _DEFAULT_PROPERTY_COST = 4
+
+    def __init__(self, **kwargs):
+        """
+        Constructor.
+
+        :param kwargs: element conditions e.g. role_name='btn', name='OK*'.
+        """
+        self._conditions = kwargs
+        self._exact_conditions = dict(
+            (str_property, expected_result) for str_property, expected_result
+            in kwargs.items() if isinstance(expected_result, basestring) and
+            not any(symbol in expected_result for symbol in _WILDCARD_SYMBOLS))
+        self._matchers = [(str_property, self._compile(expected_result))
+                          for str_property, expected_result in
+                          sorted(kwargs.items())]
+        # Property name -> [evaluated count, rejected count].
+        self._stats = dict((str_property, [0, 0]) for str_property in kwargs)
+        # Element class -> matchers in evaluation order.
+        self._orders = dict()
+        self._match_count = 0
+
+    @classmethod
+    def build(cls, locator=None, **kwargs):
+        """
+        Gets locator for find arguments.
+
+        :param Locator locator: already compiled locator.
+        :param kwargs: additional element conditions.
+        :rtype: Locator
+        :return: locator that holds all given conditions.
+        """
+        if locator is None:
+            return cls(**kwargs)
+        if kwargs:
+            conditions = dict(locator.conditions)
+            conditions.update(kwargs)
+            return cls(**conditions)
+
+        return locator
+
+    @classmethod
+    def _compile(cls, expected_result):
+        """
+        Compiles condition into matcher function.
+
+        :param expected_result: wildcard string, callable, compiled pattern
+        or plain value.
+        :rtype: callable
+        :return: function that takes property value and returns bool.
+        """
+        if isinstance(expected_result, _PATTERN_TYPE):
+            return lambda x: expected_result.match(x) is not None
+
+        if not isinstance(expected_result, basestring):
+            if callable(expected_result):
+                return expected_result
+
+            return lambda x: x == expected_result
+
+        wildcard_count = sum(expected_result.count(symbol) for symbol in
+                             _WILDCARD_SYMBOLS)
+        if not wildcard_count:
+            return lambda x: x == expected_result
+
+        if wildcard_count == 1 and '?' not in expected_result:
+            if expected_result.endswith('*'):
+                prefix = expected_result[:-1]
+                return lambda x: x.startswith(prefix)
+            if expected_result.startswith('*'):
+                suffix = expected_result[1:]
+                return lambda x: x.endswith(suffix)
+
+        regex = re.compile(
+            CommonUtils.convert_wildcard_to_regex(expected_result))
+
+        return lambda x: regex.match(x) is not None
+
+    @property
+    def conditions(self):
+        """
+        Property for element conditions locator was compiled from.
+        """
+        return self._conditions
+
+    @property
+    def exact_conditions(self):
+        """
+        Property for conditions that require property to be equal to string
+        without wildcards.
+        """
+        return self._exact_conditions
+
+    def _get_score(self, str_property, property_costs):
+        """
+        Gets evaluation score of condition, conditions with lower score are
+        evaluated first.
+
+        :param str str_property: property name.
+        :param dict property_costs: property name to relative cost of reading
+        it from backend.
+        :rtype: float
+        :return: property cost divided by observed rejection rate.
+        """
+        cost = property_costs.get(str_property, self._DEFAULT_PROPERTY_COST)
+        evaluated, rejected = self._stats[str_property]
+
+        return cost * (evaluated + 2.0) / (rejected + 1.0)
+
+    def _get_matchers(self, obj_element):
+        """
+        Gets matchers ordered for element backend.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: element.
+        :rtype: list[tuple]
+        :return: list of property name and matcher pairs.
+        """
+        self._match_count += 1
+        if self._match_count % self._REORDER_INTERVAL == 0:
+            self._orders.clear()
+
+        element_class = obj_element.__class__
+        matchers = self._orders.get(element_class)
+        if matchers is None:
+            property_costs = getattr(obj_element, '_acc_property_costs', {})
+            matchers = sorted(self._matchers,
+                              key=lambda x: self._get_score(x[0],
+                                                            property_costs))
+            self._orders[element_class] = matchers
+
+        return matchers
+
+    def match(self, obj_element, only_visible=True):
+        """
+        Verifies that element satisfies all locator conditions.
+
+        Conditions are evaluated from cheap and selective to expensive ones
+        according to element backend property costs and rejections observed
+        by this locator.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: element.
+        :param bool only_visible: flag that indicates will we match only
+        visible elements.
+        :rtype: bool
+        :return: True if element was matched otherwise False.
+        """
+        stats = None
+        try:
+            if only_visible and not obj_element.is_visible:
+                return False
+
+            for str_property, matcher in self._get_matchers(obj_element):
+                stats = self._stats[str_property]
+                stats[0] += 1
+                attr = getattr(obj_element, 'acc_' + str_property)
+                if ismethod(attr):
+                    attr = attr()
+
+                if not matcher(attr):
+                    stats[1] += 1
+                    return False
+        except:
+            if stats is not None:
+                stats[1] += 1
+            return False
+        else:
+            return True
+
+    def __str__(self):
+        return '; '.join('%s=%s' % (k, v) for k, v in
+                         sorted(self._conditions.items()))
+
+    def __repr__(self):
+        return 'Locator(%s)' % ', '.join(
+            '%s=%r' % (k, v) for k, v in sorted(self._conditions.items()))
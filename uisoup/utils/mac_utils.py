@@ -308,12 +308,50 @@ class MacUtils(CommonUtils):
                    '  return res',
                    'end tell']
 
-            event_descriptors_list = list(
+            return cls._unpack_properties(
                 MacUtils.execute_applescript_command(cmd))
 
-            # Unpacking properties to dict.
+        @classmethod
+        def get_elements_properties(cls, obj_selectors, process_name):
+            """
+            Gets all properties of several elements by one command.
+
+            :param list[str] obj_selectors: object selectors.
+            :param str process_name: name of process.
+            :rtype: list[dict]
+            :return: List of dicts with element properties in order of
+            selectors.
+            """
+            cmd = ['tell application "System Events" to tell application process "%s"' % process_name,
+                   '  set visible to true',
+                   '  set res to {}',
+                   '  repeat with uiElement in {%s}' % ', '.join(obj_selectors),
+                   '    set elementRes to {}',
+                   '    repeat with attr in attributes of uiElement',
+                   '      try',
+                   '        set elementRes to elementRes & {{name of attr, value of attr}}',
+                   '      end try',
+                   '    end repeat',
+                   '    set end of res to elementRes',
+                   '  end repeat',
+                   '  return res',
+                   'end tell']
+
+            return [cls._unpack_properties(event_descriptor) for
+                    event_descriptor in
+                    list(MacUtils.execute_applescript_command(cmd))]
+
+        @classmethod
+        def _unpack_properties(cls, event_descriptor):
+            """
+            Unpacks list of property name and value pairs.
+
+            :param AppleEventDescriptor event_descriptor: list of pairs.
+            :rtype: dict
+            :return: Dict with element properties.
+            """
             el_properties = dict()
-            for prop in event_descriptors_list:
+            for prop in list(event_descriptor):
                 prop = list(prop)
                 prop_name = prop[0].string_value
                 prop_value = [e.string_value for e in list(prop[1])] if \
@@ -0,0 +1,171 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .. import TooSaltyUISoupException
+
+# Easing functions map movement progress (0..1) to passed part of path
+# (0..1). They use only arithmetic, so they work for numbers and numpy
+# arrays alike.
+EASINGS = {
+    'linear': lambda t: t,
+    'ease_in': lambda t: t * t,
+    'ease_out': lambda t: t * (2 - t),
+    'ease_in_out': lambda t: t * t * (3 - 2 * t),
+}
+
+
+class MotionProfile(object):
+    """
+    Describes how mouse moves between two points: how long movement takes,
+    how many intermediate points are generated and how they are spread
+    along the path.
+
+    Duration is given directly, derived from speed and distance or, if
+    neither is given, from number of steps and step interval. Number of
+    steps is given directly or derived from duration and step interval,
+    but never exceeds distance in pixels.
+    """
+
+    DEFAULT_STEP_INTERVAL = .01
+
+    def __init__(self, steps=None, duration=None, speed=None,
+                 easing='linear', step_interval=None):
+        """
+        Constructor.
+
+        :param int steps: number of generated points.
+        :param float duration: duration of movement in seconds.
+        :param float speed: speed of movement in pixels per second.
+        :param str | callable easing: name of easing from EASINGS or
+        function of movement progress, it gets numpy arrays if numpy is
+        installed.
+        :param float step_interval: seconds between points when number of
+        steps is derived, DEFAULT_STEP_INTERVAL by default.
+        """
+        if duration is not None and speed is not None:
+            raise TooSaltyUISoupException(
+                'Only one of duration and speed can be specified.')
+        if speed is not None and speed <= 0:
+            raise TooSaltyUISoupException('Speed should be positive.')
+        if steps is not None and steps < 1:
+            raise TooSaltyUISoupException('Steps should be positive.')
+
+        if not callable(easing):
+            if easing not in EASINGS:
+                raise TooSaltyUISoupException(
+                    'Easing should be one of %s.' % sorted(EASINGS))
+            easing = EASINGS[easing]
+
+        self.steps = steps
+        self.duration = duration
+        self.speed = speed
+        self.easing = easing
+        self.step_interval = step_interval or self.DEFAULT_STEP_INTERVAL
+
+    @classmethod
+    def teleport(cls):
+        """
+        Profile that moves to target point at once.
+
+        :rtype: MotionProfile
+        """
+        return cls(steps=1, duration=0)
+
+    @classmethod
+    def legacy(cls):
+        """
+        Profile of 100 points 10 ms apart regardless of distance.
+
+        :rtype: MotionProfile
+        """
+        return cls(steps=100, duration=1.0)
+
+    def get_duration(self, distance):
+        """
+        Gets duration of movement.
+
+        :param float distance: distance in pixels.
+        :rtype: float
+        :return: duration in seconds.
+        """
+        if self.speed is not None:
+            return distance / float(self.speed)
+        if self.duration is not None:
+            return float(self.duration)
+
+        return (self.steps or 1) * self.step_interval
+
+    def get_steps(self, distance, duration):
+        """
+        Gets number of generated points.
+
+        :param float distance: distance in pixels.
+        :param float duration: duration in seconds.
+        :rtype: int
+        :return: number of points.
+        """
+        if self.steps is not None:
+            return self.steps
+
+        steps = int(math.ceil(duration / self.step_interval))
+
+        # Points closer than pixel don't move cursor.
+        return max(1, min(steps, int(math.ceil(distance))))
+
+    def get_path(self, x1, y1, x2, y2):
+        """
+        Generates path of movement, last point is always target one.
+
+        :param int x1: x start coordinate.
+        :param int y1: y start coordinate.
+        :param int x2: x target coordinate.
+        :param int y2: y target coordinate.
+        :rtype: list[tuple]
+        :return: list of (x, y, time) where time is offset from start of
+        movement in seconds.
+        """
+        distance = math.hypot(x2 - x1, y2 - y1)
+        duration = self.get_duration(distance)
+        steps = self.get_steps(distance, duration)
+
+        if numpy is not None:
+            progress = numpy.arange(1, steps + 1) / float(steps)
+            fraction = self.easing(progress)
+            xs = (x1 + (x2 - x1) * fraction).astype(int)
+            ys = (y1 + (y2 - y1) * fraction).astype(int)
+
+            return list(zip(xs.tolist(), ys.tolist(),
+                            (progress * duration).tolist()))
+
+        result = []
+        for i in range(1, steps + 1):
+            progress = i / float(steps)
+            fraction = self.easing(progress)
+            result.append((int(x1 + (x2 - x1) * fraction),
+                           int(y1 + (y2 - y1) * fraction),
+                           progress * duration))
+
+        return result
@@ -0,0 +1,202 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+from .. import TooSaltyUISoupException
+
+
+class Relation(object):
+    """
+    Geometric conditions of search relative to other elements:
+      right_of - element or rect, found element should start to the right
+      of it and share some rows with it;
+      below - element or rect, found element should start below it and
+      share some columns with it;
+      within - element or rect, found element should lie entirely inside
+      it;
+      nearest_to - element or (x, y) point, found elements are ordered by
+      distance to it (to element center).
+
+    Location of every element matched by other conditions is read once and
+    checked against all relations. Results are ordered by distance to
+    nearest_to, right_of or below anchor (first given).
+    """
+
+    KWARGS = ('right_of', 'below', 'within', 'nearest_to')
+
+    def __init__(self, right_of=None, below=None, within=None,
+                 nearest_to=None):
+        """
+        Constructor.
+
+        :param right_of: element or (left, top, width, height) rect.
+        :param below: element or (left, top, width, height) rect.
+        :param within: element or (left, top, width, height) rect.
+        :param nearest_to: element or (x, y) point.
+        """
+        self._right_of = self._get_rect(right_of)
+        self._below = self._get_rect(below)
+        self._within = self._get_rect(within)
+        self._nearest_to = self._get_point(nearest_to)
+        # Anchor elements are never returned.
+        self._anchors = [x for x in (right_of, below, within, nearest_to) if
+                         x is not None and not isinstance(x, (tuple, list))]
+
+    @classmethod
+    def pop(cls, kwargs):
+        """
+        Removes relation conditions from find kwargs.
+
+        :param dict kwargs: find kwargs.
+        :rtype: Relation
+        :return: relation or None if there are no relation conditions.
+        """
+        relation_kwargs = dict((name, kwargs.pop(name)) for name in
+                               cls.KWARGS if name in kwargs)
+
+        return cls(**relation_kwargs) if relation_kwargs else None
+
+    @classmethod
+    def _get_rect(cls, obj_anchor):
+        """
+        Gets rect of anchor.
+
+        :param obj_anchor: element, rect or None.
+        :rtype: tuple[int]
+        :return: left, top, right and bottom or None.
+        """
+        if obj_anchor is None:
+            return None
+
+        rect = obj_anchor if isinstance(obj_anchor, (tuple, list)) else \
+            obj_anchor.acc_location
+        # Location is map on Mac with python 3.
+        rect = tuple(rect) if rect else ()
+        if len(rect) != 4:
+            raise TooSaltyUISoupException(
+                'Can\'t get location of "%s".' % (obj_anchor,))
+
+        left, top, width, height = [int(x) for x in rect]
+
+        return left, top, left + width, top + height
+
+    @classmethod
+    def _get_point(cls, obj_anchor):
+        """
+        Gets point of anchor.
+
+        :param obj_anchor: element, point or None.
+        :rtype: tuple[float]
+        :return: x and y or None.
+        """
+        if obj_anchor is None or isinstance(obj_anchor, (tuple, list)):
+            return obj_anchor
+
+        left, top, right, bottom = cls._get_rect(obj_anchor)
+
+        return (left + right) / 2.0, (top + bottom) / 2.0
+
+    @classmethod
+    def _get_distance(cls, rect, x, y):
+        """
+        Gets distance from point to rect.
+
+        :param tuple rect: left, top, right and bottom.
+        :param float x: x coordinate.
+        :param float y: y coordinate.
+        :rtype: float
+        :return: distance, 0 if point is inside rect.
+        """
+        dx = max(rect[0] - x, 0, x - rect[2])
+        dy = max(rect[1] - y, 0, y - rect[3])
+
+        return (dx * dx + dy * dy) ** 0.5
+
+    def _is_satisfied(self, rect):
+        """
+        Checks element against relations.
+
+        :param tuple rect: left, top, right and bottom of element.
+        :rtype: bool
+        :return: True if element satisfies relation.
+        """
+        if self._right_of and not (
+                rect[0] >= self._right_of[2] and
+                rect[1] < self._right_of[3] and self._right_of[1] < rect[3]):
+            return False
+        if self._below and not (
+                rect[1] >= self._below[3] and
+                rect[0] < self._below[2] and self._below[0] < rect[2]):
+            return False
+        if self._within and not (
+                self._within[0] <= rect[0] and self._within[1] <= rect[1] and
+                rect[2] <= self._within[2] and rect[3] <= self._within[3]):
+            return False
+
+        return True
+
+    def _get_sort_key(self, rect):
+        """
+        Gets order of element in results.
+
+        :param tuple rect: left, top, right and bottom of element.
+        :return: sort key.
+        """
+        if self._nearest_to:
+            # Smaller element is preferred when point is inside of several.
+            return self._get_distance(rect, *self._nearest_to), \
+                (rect[2] - rect[0]) * (rect[3] - rect[1])
+        if self._right_of:
+            return rect[0] - self._right_of[2]
+        if self._below:
+            return rect[1] - self._below[3]
+
+        return 0
+
+    def apply(self, elements):
+        """
+        Filters and orders elements by relation.
+
+        :param elements: iterable of elements matched by other conditions.
+        :rtype: list[uisoup.interfaces.i_element.IElement]
+        :return: list of elements that satisfy relation.
+        """
+        lst_rects = []
+        for obj_element in elements:
+            if obj_element in self._anchors:
+                continue
+            try:
+                location = tuple(obj_element.acc_location or ())
+            except:
+                continue
+            if len(location) != 4:
+                continue
+
+            left, top, width, height = [int(x) for x in location]
+            if width <= 0 or height <= 0:
+                continue
+
+            rect = left, top, left + width, top + height
+            if self._is_satisfied(rect):
+                lst_rects.append((obj_element, rect))
+
+        # Sort is stable, so found order is kept for elements with equal
+        # distance.
+        lst_rects.sort(key=lambda x: self._get_sort_key(x[1]))
+
+        return [x[0] for x in lst_rects]
@@ -0,0 +1,221 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import re
+
+from .locator import Locator
+from .. import TooSaltyUISoupException
+
+_STEP_REGEX = re.compile(
+    r'(?P<role_name>\*|[A-Za-z_]\w*)?'
+    r'(?P<conditions>(?:\[[^\]"\']*(?:"(?:[^"\\]|\\.)*"|'
+    r'\'(?:[^\'\\]|\\.)*\')?\s*\])*)')
+_CONDITION_REGEX = re.compile(
+    r'\[\s*(?P<name>[A-Za-z_]\w*)\s*=\s*'
+    r'(?:"(?P<dq>(?:[^"\\]|\\.)*)"|\'(?P<sq>(?:[^\'\\]|\\.)*)\'|'
+    r'(?P<bare>[^\]\s]+))\s*\]')
+_ESCAPE_REGEX = re.compile(r'\\(.)')
+_WHITESPACE_REGEX = re.compile(r'\s*')
+
+
+class Selector(object):
+    """
+    Hierarchical element selector compiled from expression such as
+    'frm > pane[name="Settings*"] btn[c_name="btnOK"]'.
+
+    Every step is an element role name (or "*" for any role) with optional
+    [property=value] conditions that accept same wildcards as find kwargs.
+    Steps separated by ">" should be direct children, steps separated by
+    whitespace should be descendants. Search descends only into subtrees
+    where remaining steps still can be matched.
+    """
+
+    CHILD = '>'
+    DESCENDANT = ' '
+
+    def __init__(self, expression):
+        """
+        Constructor.
+
+        :param str expression: selector expression.
+        """
+        self._expression = expression
+        self._steps = self._parse(expression)
+
+    @classmethod
+    def build(cls, selector):
+        """
+        Gets compiled selector.
+
+        :param str | Selector selector: selector expression or already
+        compiled selector.
+        :rtype: Selector
+        :return: compiled selector.
+        """
+        return selector if isinstance(selector, Selector) else cls(selector)
+
+    @classmethod
+    def _parse_value(cls, match):
+        """
+        Gets condition value from parsed condition.
+
+        :param match: condition regex match.
+        :return: unescaped string or int for unquoted digits.
+        """
+        if match.group('bare') is not None:
+            value = match.group('bare')
+            return int(value) if value.isdigit() else value
+
+        value = match.group('dq') if match.group('dq') is not None else \
+            match.group('sq')
+
+        return _ESCAPE_REGEX.sub(r'\1', value)
+
+    @classmethod
+    def _parse(cls, expression):
+        """
+        Parses selector expression.
+
+        :param str expression: selector expression.
+        :rtype: list[tuple[str, Locator]]
+        :return: list of steps with axis and step locator.
+        """
+        steps = []
+        axis = cls.DESCENDANT
+        pos = _WHITESPACE_REGEX.match(expression).end()
+
+        while pos < len(expression):
+            if expression[pos] == cls.CHILD:
+                if axis == cls.CHILD:
+                    raise TooSaltyUISoupException(
+                        'Invalid selector "%s": unexpected ">" at %d.' %
+                        (expression, pos))
+                axis = cls.CHILD
+                pos = _WHITESPACE_REGEX.match(expression, pos + 1).end()
+                continue
+
+            step_match = _STEP_REGEX.match(expression, pos)
+            if step_match.end() == pos:
+                raise TooSaltyUISoupException(
+                    'Invalid selector "%s": unexpected symbol at %d.' %
+                    (expression, pos))
+
+            conditions = dict()
+            str_conditions = step_match.group('conditions')
+            condition_pos = 0
+            for condition_match in _CONDITION_REGEX.finditer(str_conditions):
+                if condition_match.start() != condition_pos:
+                    break
+                conditions[condition_match.group('name')] = \
+                    cls._parse_value(condition_match)
+                condition_pos = condition_match.end()
+            if condition_pos != len(str_conditions):
+                raise TooSaltyUISoupException(
+                    'Invalid selector "%s": wrong condition at %d.' %
+                    (expression, step_match.start('conditions') +
+                     condition_pos))
+
+            role_name = step_match.group('role_name')
+            if role_name and role_name != '*':
+                conditions['role_name'] = role_name
+
+            steps.append((axis, Locator(**conditions)))
+            axis = cls.DESCENDANT
+            pos = step_match.end()
+
+            next_pos = _WHITESPACE_REGEX.match(expression, pos).end()
+            if next_pos == pos and pos < len(expression) and \
+                    expression[pos] != cls.CHILD:
+                raise TooSaltyUISoupException(
+                    'Invalid selector "%s": unexpected symbol at %d.' %
+                    (expression, pos))
+            pos = next_pos
+
+        if not steps or axis == cls.CHILD:
+            raise TooSaltyUISoupException(
+                'Invalid selector "%s": element step is expected.' %
+                expression)
+
+        return steps
+
+    def _get_child_states(self, obj_element, states, only_visible):
+        """
+        Matches element against steps it is candidate for.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: element.
+        :param tuple[int] states: indexes of steps element can match.
+        :param bool only_visible: flag that indicates will we match only
+        visible elements.
+        :rtype: tuple[bool, tuple[int]]
+        :return: indicator whether element matches last step and indexes of
+        steps its children can match.
+        """
+        last_step = len(self._steps) - 1
+        is_matched = False
+        child_states = set()
+
+        for step in states:
+            axis, locator = self._steps[step]
+            if locator.match(obj_element, only_visible):
+                if step == last_step:
+                    is_matched = True
+                else:
+                    child_states.add(step + 1)
+                    # Descendants of element are searched for the next
+                    # descendant step anyway, so nested matches of current
+                    # step can't give new results.
+                    if self._steps[step + 1][0] == self.DESCENDANT:
+                        continue
+
+            if axis == self.DESCENDANT:
+                child_states.add(step)
+
+        return is_matched, tuple(sorted(child_states))
+
+    def iter_matches(self, obj_element, only_visible=True):
+        """
+        Iterates elements matched by selector in the element subtree.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: root
+        element, root itself is never matched.
+        :param bool only_visible: flag that indicates will we search only
+        through visible elements.
+        :rtype: uisoup.interfaces.i_element.IElement
+        :return: yield found element.
+        """
+        lst_stack = [(el, (0,)) for el in reversed(list(obj_element))]
+
+        while lst_stack:
+            obj_element, states = lst_stack.pop()
+            is_matched, child_states = \
+                self._get_child_states(obj_element, states, only_visible)
+
+            if is_matched:
+                yield obj_element
+
+            if child_states:
+                lst_stack.extend(
+                    (el, child_states) for el in
+                    reversed(obj_element._get_search_children()))
+
+    def __str__(self):
+        return self._expression
+
+    def __repr__(self):
+        return 'Selector(%r)' % self._expression
@@ -0,0 +1,333 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+from ..interfaces.i_element import IElement
+from .common import CommonUtils
+from .. import TooSaltyUISoupException
+
+
+class SnapshotSchema(object):
+    """
+    Data shared by all elements of one snapshot.
+    """
+
+    __slots__ = ('properties', 'indexes', 'proc_id', 'is_top_level_window',
+                 'root_parent_count')
+
+    def __init__(self, properties, proc_id=None, is_top_level_window=False,
+                 root_parent_count=None):
+        """
+        Constructor.
+
+        :param list[str] properties: captured property names.
+        :param int proc_id: process id of captured elements.
+        :param bool is_top_level_window: indicates is snapshot root top
+        level window.
+        :param int root_parent_count: parent count of snapshot root, None
+        if it couldn't be read.
+        """
+        self.properties = tuple(properties)
+        self.indexes = dict((name, i) for i, name in enumerate(properties))
+        self.proc_id = proc_id
+        self.is_top_level_window = is_top_level_window
+        self.root_parent_count = root_parent_count
+
+    def get_parent_count(self, depth):
+        """
+        Gets parent count of captured element.
+
+        :param int depth: depth of element in snapshot.
+        :rtype: int
+        :return: parent count.
+        """
+        if self.root_parent_count is None:
+            raise TooSaltyUISoupException(
+                'Parent count of snapshot root was not captured.')
+
+        return self.root_parent_count + depth
+
+
+class SnapshotElement(IElement):
+    """
+    Element of UI tree captured into memory. Supports the same search and
+    export methods as live elements but doesn't make any backend calls,
+    actions are not supported.
+    """
+
+    __slots__ = ('_schema', '_values', '_children', '_parent', '_depth',
+                 '_key')
+
+    DEFAULT_PROPERTIES = ('role_name', 'name', 'value', 'description',
+                          'location', 'is_visible', 'is_enabled',
+                          'is_selected', 'is_checked')
+    # Properties that are always captured, search relies on them.
+    _REQUIRED_PROPERTIES = ('is_visible',)
+
+    _acc_property_costs = {}
+
+    def __init__(self, schema, values, parent=None, depth=0, key=None):
+        """
+        Constructor.
+
+        :param SnapshotSchema schema: snapshot schema.
+        :param tuple values: property values in schema order.
+        :param SnapshotElement parent: parent element.
+        :param int depth: depth of element in snapshot, root has depth 0.
+        :param key: element key, snapshot and element position by default.
+        """
+        self._schema = schema
+        self._values = values
+        self._children = []
+        self._parent = parent
+        self._depth = depth
+        self._key = key
+
+    @classmethod
+    def _read_property(cls, obj_element, name):
+        """
+        Reads property of live element.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: element.
+        :param str name: property name.
+        :return: property value or None if it can't be read.
+        """
+        try:
+            return CommonUtils.normalize_value(getattr(
+                obj_element, name if name.startswith('is_') else 'acc_' + name))
+        except:
+            return None
+
+    @classmethod
+    def _walk(cls, obj_element, max_depth=None):
+        """
+        Walks element subtree in preorder numbering elements so children of
+        every element have consecutive indexes.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: root
+        element.
+        :param int max_depth: maximum depth of walked elements.
+        :rtype: tuple
+        :return: yield element index, element, parent index (-1 for root),
+        depth, index of first child and child count.
+        """
+        lst_stack = [(obj_element, 0, -1, 0)]
+        next_index = 1
+
+        while lst_stack:
+            obj_element, index, parent_index, depth = lst_stack.pop()
+            if max_depth is not None and depth >= max_depth:
+                children = []
+            else:
+                children = list(obj_element._get_export_children())
+
+            first_child = next_index
+            next_index += len(children)
+
+            yield (index, obj_element, parent_index, depth, first_child,
+                   len(children))
+
+            lst_stack.extend(
+                (children[i], first_child + i, index, depth + 1) for i in
+                reversed(range(len(children))))
+
+    @classmethod
+    def _make_schema(cls, obj_element, properties=None):
+        """
+        Makes schema for capturing element subtree.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: root
+        element.
+        :param list[str] properties: properties to capture.
+        :rtype: tuple[SnapshotSchema, bool]
+        :return: schema and indicator whether live keys should be captured.
+        """
+        properties = list(properties or cls.DEFAULT_PROPERTIES)
+        for name in cls._REQUIRED_PROPERTIES:
+            if name not in properties:
+                properties.append(name)
+
+        capture_key = 'key' in properties
+        # Parent and child counts are known from snapshot structure, only
+        # parent count of root is read from live element. It is read even if
+        # it wasn't asked for, as search by parent count relies on it.
+        root_parent_count = cls._read_property(obj_element, 'parent_count')
+        properties = [name for name in properties if name not in
+                      ('key', 'parent_count', 'child_count')]
+
+        try:
+            proc_id = obj_element.proc_id
+        except:
+            proc_id = None
+
+        schema = SnapshotSchema(
+            properties, proc_id,
+            bool(cls._read_property(obj_element, 'is_top_level_window')),
+            root_parent_count)
+
+        return schema, capture_key
+
+    @classmethod
+    def capture(cls, obj_element, properties=None, max_depth=None):
+        """
+        Captures live element subtree.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: root
+        element.
+        :param list[str] properties: properties to capture, 'key' captures
+        live element keys.
+        :param int max_depth: maximum depth of captured elements.
+        :rtype: SnapshotElement
+        :return: snapshot root element.
+        """
+        schema, capture_key = cls._make_schema(obj_element, properties)
+        nodes = dict()
+
+        for index, obj_live_element, parent_index, depth, _, _ in \
+                cls._walk(obj_element, max_depth):
+            key = obj_live_element.key if capture_key else \
+                (id(schema), index)
+            values = tuple(cls._read_property(obj_live_element, name) for
+                           name in schema.properties)
+            parent = nodes.get(parent_index)
+            node = cls(schema, values, parent, depth, key)
+            if parent is not None:
+                parent._children.append(node)
+
+            nodes[index] = node
+
+        return nodes[0]
+
+    def _get(self, name):
+        """
+        Gets captured property value.
+
+        :param str name: property name.
+        :return: property value.
+        """
+        try:
+            return self._values[self._schema.indexes[name]]
+        except KeyError:
+            raise TooSaltyUISoupException(
+                'Property "%s" was not captured in snapshot.' % name)
+
+    def _raise_not_supported(self):
+        """
+        Raises exception for actions that need live element.
+        """
+        raise TooSaltyUISoupException(
+            'Actions are not supported by snapshot elements.')
+
+    def click(self, x_offset=None, y_offset=None):
+        self._raise_not_supported()
+
+    def right_click(self, x_offset=None, y_offset=None):
+        self._raise_not_supported()
+
+    def double_click(self, x_offset=None, y_offset=None):
+        self._raise_not_supported()
+
+    def drag_to(self, x, y, x_offset=None, y_offset=None, smooth=True):
+        self._raise_not_supported()
+
+    def set_focus(self):
+        self._raise_not_supported()
+
+    def set_value(self, value):
+        self._raise_not_supported()
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def proc_id(self):
+        return self._schema.proc_id
+
+    @property
+    def is_top_level_window(self):
+        return self._parent is None and self._schema.is_top_level_window
+
+    @property
+    def is_selected(self):
+        return self._get('is_selected')
+
+    @property
+    def is_checked(self):
+        return self._get('is_checked')
+
+    @property
+    def is_visible(self):
+        return self._get('is_visible')
+
+    @property
+    def is_enabled(self):
+        return self._get('is_enabled')
+
+    @property
+    def acc_parent_count(self):
+        return self._schema.get_parent_count(self._depth)
+
+    @property
+    def acc_child_count(self):
+        return len(self._children)
+
+    @property
+    def acc_name(self):
+        return self._get('name')
+
+    @property
+    def acc_c_name(self):
+        if 'c_name' in self._schema.indexes:
+            return self._get('c_name')
+
+        return self.acc_role_name + self.acc_name if self.acc_name else ''
+
+    @property
+    def acc_location(self):
+        return self._get('location')
+
+    @property
+    def acc_value(self):
+        return self._get('value')
+
+    @property
+    def acc_description(self):
+        return self._get('description')
+
+    @property
+    def acc_parent(self):
+        return self._parent
+
+    @property
+    def acc_selection(self):
+        return self._get('selection')
+
+    @property
+    def acc_focused_element(self):
+        return self._get('focused_element')
+
+    @property
+    def acc_role_name(self):
+        return self._get('role_name')
+
+    def __iter__(self):
+        return iter(self._children)
+
+    def _get_search_children(self):
+        return self._children
@@ -0,0 +1,373 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import hashlib
+import mmap
+import shutil
+import struct
+import tempfile
+
+from .common import CommonUtils
+from .snapshot import SnapshotSchema, SnapshotElement
+from .. import TooSaltyUISoupException
+
+if CommonUtils.is_python_3():
+    basestring = unicode = str
+    long = int
+
+# File layout (little-endian):
+#   header, property names (uint16 length + utf-8 bytes each),
+#   node records, values.
+# Node record is parent index, first child index, child count, depth (all
+# int32) and offset of value from start of values (uint64) for every
+# property. Value is type tag byte followed by payload, equal values are
+# stored once.
+_MAGIC = b'UISOUPSN'
+_VERSION = 2
+_HEADER = struct.Struct('<8sHHiqiIIQQ')
+_NAME_LENGTH = struct.Struct('<H')
+_NODE_FIELDS = 4
+# Longer encoded values are remembered by digest while snapshot is saved.
+_MAX_VALUE_KEY_LENGTH = 20
+
+_TYPE_NONE = 0
+_TYPE_FALSE = 1
+_TYPE_TRUE = 2
+_TYPE_INT = 3
+_TYPE_FLOAT = 4
+_TYPE_STRING = 5
+_TYPE_INT_TUPLE = 6
+
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_LENGTH = struct.Struct('<I')
+
+
+def _get_record_struct(property_count):
+    """
+    Gets struct of node record.
+
+    :param int property_count: number of properties in record.
+    :rtype: struct.Struct
+    :return: node record struct.
+    """
+    return struct.Struct('<%di%dQ' % (_NODE_FIELDS, property_count))
+
+
+def _encode_value(value):
+    """
+    Encodes property value.
+
+    :param value: property value.
+    :rtype: bytes
+    :return: encoded value.
+    """
+    value = CommonUtils.normalize_value(value)
+    if value is None:
+        return struct.pack('<B', _TYPE_NONE)
+    if value is True or value is False:
+        return struct.pack('<B', _TYPE_TRUE if value else _TYPE_FALSE)
+    if isinstance(value, (int, long)):
+        return struct.pack('<B', _TYPE_INT) + _INT.pack(value)
+    if isinstance(value, float):
+        return struct.pack('<B', _TYPE_FLOAT) + _FLOAT.pack(value)
+    if isinstance(value, tuple) and \
+            all(isinstance(x, (int, long)) for x in value):
+        return struct.pack('<BI%dq' % len(value), _TYPE_INT_TUPLE,
+                           len(value), *value)
+
+    if not isinstance(value, basestring):
+        value = unicode(value)
+    if isinstance(value, unicode):
+        value = value.encode('utf-8')
+
+    return struct.pack('<B', _TYPE_STRING) + _LENGTH.pack(len(value)) + value
+
+
+def _decode_value(buff, offset):
+    """
+    Decodes property value.
+
+    :param buff: buffer with encoded value.
+    :param int offset: value offset in buffer.
+    :return: property value.
+    """
+    type_ = struct.unpack_from('<B', buff, offset)[0]
+    offset += 1
+
+    if type_ == _TYPE_NONE:
+        return None
+    if type_ in (_TYPE_FALSE, _TYPE_TRUE):
+        return type_ == _TYPE_TRUE
+    if type_ == _TYPE_INT:
+        return _INT.unpack_from(buff, offset)[0]
+    if type_ == _TYPE_FLOAT:
+        return _FLOAT.unpack_from(buff, offset)[0]
+
+    length = _LENGTH.unpack_from(buff, offset)[0]
+    offset += _LENGTH.size
+    if type_ == _TYPE_INT_TUPLE:
+        return struct.unpack_from('<%dq' % length, buff, offset)
+    if type_ == _TYPE_STRING:
+        return buff[offset:offset + length].decode('utf-8')
+
+    raise TooSaltyUISoupException('Unknown value type %d in snapshot.' %
+                                  type_)
+
+
+def _get_value_key(value):
+    """
+    Gets key that identifies encoded value among written ones.
+
+    :param bytes value: encoded value.
+    :rtype: bytes
+    :return: value itself if it is short otherwise its digest.
+    """
+    if len(value) <= _MAX_VALUE_KEY_LENGTH:
+        return value
+
+    return hashlib.sha1(value).digest()
+
+
+def save_snapshot(obj_element, file_path, properties=None, max_depth=None):
+    """
+    Captures element subtree into snapshot file. Node records and values
+    are written to file as soon as element is walked, only offsets of
+    written values are kept in memory.
+
+    :param uisoup.interfaces.i_element.IElement obj_element: root element,
+    live or snapshot one.
+    :param str file_path: path of snapshot file.
+    :param list[str] properties: properties to capture.
+    :param int max_depth: maximum depth of captured elements.
+    :rtype: int
+    :return: number of captured elements.
+    """
+    schema, _ = SnapshotElement._make_schema(obj_element, properties)
+    record = _get_record_struct(len(schema.properties))
+    # Value key -> offset of value from start of values.
+    value_offsets = dict()
+    values_size = 0
+    node_count = 0
+
+    # Number of nodes is unknown until walk is finished, so values are
+    # written to temporary file and appended after node records.
+    with open(file_path, 'w+b') as file_, \
+            tempfile.TemporaryFile() as values_file:
+        file_.write(b'\0' * _HEADER.size)
+        for name in schema.properties:
+            name = name.encode('utf-8')
+            file_.write(_NAME_LENGTH.pack(len(name)) + name)
+        nodes_offset = file_.tell()
+
+        for index, obj_live_element, parent_index, depth, first_child, \
+                child_count in SnapshotElement._walk(obj_element, max_depth):
+            fields = [parent_index, first_child, child_count, depth]
+            for name in schema.properties:
+                value = _encode_value(
+                    SnapshotElement._read_property(obj_live_element, name))
+                value_key = _get_value_key(value)
+                if value_key not in value_offsets:
+                    value_offsets[value_key] = values_size
+                    values_file.write(value)
+                    values_size += len(value)
+                fields.append(value_offsets[value_key])
+
+            file_.seek(nodes_offset + index * record.size)
+            file_.write(record.pack(*fields))
+            node_count += 1
+
+        values_offset = nodes_offset + node_count * record.size
+        file_.seek(values_offset)
+        values_file.seek(0)
+        shutil.copyfileobj(values_file, file_)
+
+        file_.seek(0)
+        file_.write(_HEADER.pack(
+            _MAGIC, _VERSION, len(schema.properties),
+            -1 if schema.root_parent_count is None else
+            schema.root_parent_count,
+            -1 if schema.proc_id is None else schema.proc_id,
+            int(schema.is_top_level_window), node_count, len(value_offsets),
+            nodes_offset, values_offset))
+
+    return node_count
+
+
+class MappedSnapshot(object):
+    """
+    Snapshot file mapped into memory. Node records and values are decoded
+    only when elements are accessed.
+    """
+
+    def __init__(self, file_path):
+        """
+        Constructor.
+
+        :param str file_path: path of snapshot file.
+        """
+        self._file = open(file_path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+
+        magic, version, property_count, root_parent_count, proc_id, \
+            is_top_level_window, self.node_count, self.value_count, \
+            self._nodes_offset, self._values_offset = \
+            _HEADER.unpack_from(self._buffer, 0)
+
+        if magic != _MAGIC:
+            self.close()
+            raise TooSaltyUISoupException(
+                'File "%s" is not UISoup snapshot.' % file_path)
+        if version != _VERSION:
+            self.close()
+            raise TooSaltyUISoupException(
+                'Snapshot version %d is not supported.' % version)
+
+        properties = []
+        offset = _HEADER.size
+        for _ in range(property_count):
+            length = _NAME_LENGTH.unpack_from(self._buffer, offset)[0]
+            offset += _NAME_LENGTH.size
+            properties.append(
+                self._buffer[offset:offset + length].decode('utf-8'))
+            offset += length
+
+        self.schema = SnapshotSchema(
+            properties, None if proc_id == -1 else proc_id,
+            bool(is_top_level_window),
+            None if root_parent_count == -1 else root_parent_count)
+        self._record = _get_record_struct(property_count)
+        self._values = dict()
+
+    @property
+    def root(self):
+        """
+        Property for snapshot root element.
+        """
+        return MappedSnapshotElement(self, 0)
+
+    def read_record(self, index):
+        """
+        Reads node record.
+
+        :param int index: node index.
+        :rtype: tuple[int]
+        :return: parent index, first child index, child count, depth and
+        value offsets.
+        """
+        return self._record.unpack_from(
+            self._buffer, self._nodes_offset + index * self._record.size)
+
+    def read_value(self, offset):
+        """
+        Reads value.
+
+        :param int offset: offset of value from start of values.
+        :return: property value.
+        """
+        if offset not in self._values:
+            self._values[offset] = _decode_value(
+                self._buffer, self._values_offset + offset)
+
+        return self._values[offset]
+
+    def close(self):
+        """
+        Closes snapshot file.
+        """
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MappedSnapshotElement(SnapshotElement):
+    """
+    Element of memory-mapped snapshot file.
+    """
+
+    __slots__ = ('_snapshot', '_index')
+
+    def __init__(self, snapshot, index):
+        """
+        Constructor.
+
+        :param MappedSnapshot snapshot: snapshot file.
+        :param int index: node index.
+        """
+        self._snapshot = snapshot
+        self._index = index
+        self._schema = snapshot.schema
+        self._key = (id(snapshot), index)
+
+    def _get(self, name):
+        try:
+            property_index = self._schema.indexes[name]
+        except KeyError:
+            raise TooSaltyUISoupException(
+                'Property "%s" was not captured in snapshot.' % name)
+
+        return self._snapshot.read_value(self._snapshot.read_record(
+            self._index)[_NODE_FIELDS + property_index])
+
+    @property
+    def is_top_level_window(self):
+        return self._index == 0 and self._schema.is_top_level_window
+
+    @property
+    def acc_parent_count(self):
+        return self._schema.get_parent_count(
+            self._snapshot.read_record(self._index)[3])
+
+    @property
+    def acc_child_count(self):
+        return self._snapshot.read_record(self._index)[2]
+
+    @property
+    def acc_parent(self):
+        parent_index = self._snapshot.read_record(self._index)[0]
+
+        return None if parent_index < 0 else \
+            MappedSnapshotElement(self._snapshot, parent_index)
+
+    def __iter__(self):
+        return iter(self._get_search_children())
+
+    def _get_search_children(self):
+        _, first_child, child_count = \
+            self._snapshot.read_record(self._index)[:3]
+
+        return [MappedSnapshotElement(self._snapshot, index) for index in
+                range(first_child, first_child + child_count)]
+
+
+def load_snapshot(file_path):
+    """
+    Loads snapshot file lazily.
+
+    :param str file_path: path of snapshot file.
+    :rtype: MappedSnapshot
+    :return: mapped snapshot, its root property holds root element.
+    """
+    return MappedSnapshot(file_path)
@@ -0,0 +1,190 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+
+class SpatialIndex(object):
+    """
+    Uniform grid over element rectangles. Every rectangle is registered in
+    grid cells it covers, so point and rectangle queries check only
+    rectangles of few cells instead of all of them.
+
+    Rectangles are (left, top, width, height) and contain points with
+    left <= x < left + width and top <= y < top + height. Rectangles that
+    cover more than MAX_RECT_CELLS cells, e.g. virtualized lists reporting
+    their full scroll height, are kept aside and checked linearly, so they
+    don't fill the grid.
+    """
+
+    DEFAULT_CELL_SIZE = 64
+    MAX_RECT_CELLS = 1024
+
+    def __init__(self, cell_size=None):
+        """
+        Constructor.
+
+        :param int cell_size: grid cell size in pixels.
+        """
+        self.cell_size = cell_size or self.DEFAULT_CELL_SIZE
+        # List of (left, top, right, bottom, depth, value).
+        self._entries = []
+        # Cell coordinates -> list of entry indexes.
+        self._cells = dict()
+        # Indexes of entries that cover too many cells.
+        self._large = []
+
+    @classmethod
+    def from_element(cls, obj_element, only_visible=True, cell_size=None):
+        """
+        Builds index over descendants of element, their depth is taken from
+        acc_parent_count.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: root
+        element.
+        :param bool only_visible: flag that indicates will we index only
+        visible elements.
+        :param int cell_size: grid cell size in pixels.
+        :rtype: SpatialIndex
+        :return: spatial index with elements as values.
+        """
+        index = cls(cell_size)
+        for obj_child in obj_element.iterfind(only_visible):
+            try:
+                location = obj_child.acc_location
+                depth = obj_child.acc_parent_count
+            except:
+                continue
+
+            if location:
+                index.insert(location, obj_child, depth)
+
+        return index
+
+    def _get_cell_range(self, left, top, right, bottom):
+        """
+        Gets cells covered by rectangle.
+
+        :rtype: tuple[int]
+        :return: first and last cell column and first and last cell row.
+        """
+        return (left // self.cell_size, (right - 1) // self.cell_size,
+                top // self.cell_size, (bottom - 1) // self.cell_size)
+
+    def insert(self, rect, value, depth=0):
+        """
+        Adds rectangle to index, rectangles with zero size are ignored.
+
+        :param tuple rect: left, top, width and height.
+        :param value: value returned by queries, e.g. element.
+        :param int depth: depth of rectangle, deeper ones are returned first.
+        """
+        left, top, width, height = [int(x) for x in rect]
+        if width <= 0 or height <= 0:
+            return
+
+        right, bottom = left + width, top + height
+        i_entry = len(self._entries)
+        self._entries.append((left, top, right, bottom, depth, value))
+
+        first_col, last_col, first_row, last_row = \
+            self._get_cell_range(left, top, right, bottom)
+        if (last_col - first_col + 1) * (last_row - first_row + 1) > \
+                self.MAX_RECT_CELLS:
+            self._large.append(i_entry)
+            return
+
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                self._cells.setdefault((col, row), []).append(i_entry)
+
+    def _sort(self, entry_indexes):
+        """
+        Sorts entries deepest first, entries with equal depth are kept in
+        insertion order.
+
+        :param entry_indexes: entry indexes.
+        :rtype: list
+        :return: list of entry values.
+        """
+        return [self._entries[i][5] for i in
+                sorted(entry_indexes, key=lambda i: (-self._entries[i][4], i))]
+
+    def query_point(self, x, y):
+        """
+        Finds rectangles that contain point.
+
+        :param int x: x coordinate.
+        :param int y: y coordinate.
+        :rtype: list
+        :return: list of values, deepest first.
+        """
+        lst_entries = self._cells.get((x // self.cell_size,
+                                       y // self.cell_size), [])
+
+        return self._sort(
+            i for i in lst_entries + self._large if
+            self._entries[i][0] <= x < self._entries[i][2] and
+            self._entries[i][1] <= y < self._entries[i][3])
+
+    def hit_test(self, x, y):
+        """
+        Finds deepest rectangle that contains point.
+
+        :param int x: x coordinate.
+        :param int y: y coordinate.
+        :return: value of found rectangle otherwise None.
+        """
+        lst_values = self.query_point(x, y)
+
+        return lst_values[0] if lst_values else None
+
+    def query_rect(self, rect):
+        """
+        Finds rectangles that intersect rectangle.
+
+        :param tuple rect: left, top, width and height.
+        :rtype: list
+        :return: list of values, deepest first.
+        """
+        left, top, width, height = [int(x) for x in rect]
+        if width <= 0 or height <= 0:
+            return []
+
+        right, bottom = left + width, top + height
+        first_col, last_col, first_row, last_row = \
+            self._get_cell_range(left, top, right, bottom)
+        set_entries = set(self._large)
+        if (last_col - first_col + 1) * (last_row - first_row + 1) > \
+                len(self._cells):
+            # Rectangle covers more cells than are occupied.
+            for (col, row), lst_entries in self._cells.items():
+                if first_col <= col <= last_col and \
+                        first_row <= row <= last_row:
+                    set_entries.update(lst_entries)
+        else:
+            for col in range(first_col, last_col + 1):
+                for row in range(first_row, last_row + 1):
+                    set_entries.update(self._cells.get((col, row), ()))
+
+        return self._sort(
+            i for i in set_entries if
+            self._entries[i][0] < right and left < self._entries[i][2] and
+            self._entries[i][1] < bottom and top < self._entries[i][3])
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,133 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import ctypes
+
+_MOUSEEVENTF_ABSOLUTE = 0x8000  # absolute move
+_MOUSEEVENTF_VIRTUALDESK = 0x4000  # map to entire virtual desktop
+
+_INPUT_MOUSE = 0
+
+pointer_unsigned_long = ctypes.POINTER(ctypes.c_ulong)
+
+
+class KeyboardInput(ctypes.Structure):
+    """
+    Keyboard input C struct definition.
+    """
+
+    _fields_ = [("wVk", ctypes.c_ushort),
+                ("wScan", ctypes.c_ushort),
+                ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong),
+                ("dwExtraInfo", pointer_unsigned_long)]
+
+
+class HardwareInput(ctypes.Structure):
+    """
+    Hardware input C struct definition.
+    """
+
+    _fields_ = [("uMsg", ctypes.c_ulong),
+                ("wParamL", ctypes.c_short),
+                ("wParamH", ctypes.c_ushort)]
+
+
+class MouseInput(ctypes.Structure):
+    """
+    Hardware input C struct definition.
+    """
+
+    _fields_ = [("dx", ctypes.c_long),
+                ("dy", ctypes.c_long),
+                ("mouseData", ctypes.c_ulong),
+                ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong),
+                ("dwExtraInfo", pointer_unsigned_long)]
+
+
+class EventStorage(ctypes.Union):
+    """
+    Event storage C struct definition.
+    """
+
+    _fields_ = [("ki", KeyboardInput),
+                ("mi", MouseInput),
+                ("hi", HardwareInput)]
+
+
+class Input(ctypes.Structure):
+    """
+    Input C struct definition.
+    """
+
+    _fields_ = [("type", ctypes.c_ulong),
+                ("ii", EventStorage)]
+
+
+def normalize_point(x, y, metrics):
+    """
+    Converts screen coordinates to absolute coordinates of virtual desktop,
+    i.e. 0..65535 range.
+
+    :param int x: x coordinate.
+    :param int y: y coordinate.
+    :param tuple[int] metrics: left, top, width and height of virtual
+    desktop.
+    :rtype: tuple[int]
+    :return: normalized x and y.
+    """
+    left, top, width, height = metrics
+
+    return (int(round((x - left) * 65535.0 / max(width - 1, 1))),
+            int(round((y - top) * 65535.0 / max(height - 1, 1))))
+
+
+def build_mouse_inputs(events, get_metrics):
+    """
+    Builds Input structs for mouse events. Metrics are refreshed once if
+    point of absolute event is out of virtual desktop, as display
+    configuration could have been changed.
+
+    :param list[tuple] events: list of (flags, x, y, data), coordinates of
+    absolute events are screen coordinates.
+    :param get_metrics: function that returns left, top, width and height
+    of virtual desktop, called with refresh=True to reread them.
+    :return: ctypes array of Input structs.
+    """
+    metrics = get_metrics()
+    is_refreshed = False
+    inputs = (Input * len(events))()
+    for obj_input, (flags, x, y, data) in zip(inputs, events):
+        if flags & _MOUSEEVENTF_ABSOLUTE:
+            left, top, width, height = metrics
+            if not is_refreshed and not (left <= x < left + width and
+                                         top <= y < top + height):
+                metrics = get_metrics(refresh=True)
+                is_refreshed = True
+            x, y = normalize_point(x, y, metrics)
+            flags |= _MOUSEEVENTF_VIRTUALDESK
+
+        obj_input.type = _INPUT_MOUSE
+        obj_input.ii.mi.dx = x
+        obj_input.ii.mi.dy = y
+        obj_input.ii.mi.mouseData = data
+        obj_input.ii.mi.dwFlags = flags
+
+    return inputs
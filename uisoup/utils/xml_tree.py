@@ -0,0 +1,121 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+try:
+    from lxml import etree
+    IS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as etree
+    IS_LXML = False
+
+
+class XmlTree(object):
+    """
+    XML tree of elements, tag of node is element role name and attributes
+    are element properties. Every node remembers element it was built from,
+    so XPath results are mapped back to elements without searching UI.
+    """
+
+    def __init__(self, root, elements):
+        """
+        Constructor.
+
+        :param root: root node.
+        :param dict elements: node to element map.
+        """
+        self._root = root
+        self._elements = elements
+        if not IS_LXML:
+            # xml.etree evaluates paths relative to node, so root is put
+            # into document node to let absolute paths match root itself.
+            self._document = etree.Element('document')
+            self._document.append(root)
+
+    @classmethod
+    def build(cls, obj_element, attributes=None):
+        """
+        Builds XML tree of element subtree.
+
+        :param uisoup.interfaces.i_element.IElement obj_element: root
+        element.
+        :param list[str] attributes: element properties written as XML
+        attributes.
+        :rtype: XmlTree
+        :return: XML tree.
+        """
+        lst_attributes = obj_element._get_xml_attributes(attributes)
+        elements = dict()
+        root = None
+        lst_stack = [(obj_element, None)]
+
+        while lst_stack:
+            obj_element, obj_parent_node = lst_stack.pop()
+            tag = obj_element.acc_role_name
+            dct_attributes = dict(
+                (str_attribute, obj_element._get_xml_value(str_property))
+                for str_attribute, str_property in lst_attributes)
+
+            if obj_parent_node is None:
+                obj_node = root = etree.Element(tag, dct_attributes)
+            else:
+                obj_node = etree.SubElement(obj_parent_node, tag,
+                                            dct_attributes)
+            elements[obj_node] = obj_element
+
+            lst_stack.extend((el, obj_node) for el in
+                             reversed(obj_element._get_export_children()))
+
+        return cls(root, elements)
+
+    def getroot(self):
+        """
+        Gets root node.
+        """
+        return self._root
+
+    def get_element(self, node):
+        """
+        Gets element of node.
+
+        :param node: XML tree node.
+        :rtype: uisoup.interfaces.i_element.IElement
+        :return: element or None if node doesn't belong to tree.
+        """
+        return self._elements.get(node)
+
+    def xpath(self, expression):
+        """
+        Evaluates XPath expression e.g. '//btn[@Name="OK"]'. Full XPath is
+        supported with lxml, xml.etree supports only its XPath subset.
+
+        :param str expression: XPath expression.
+        :return: list of elements for matched nodes, other results
+        (e.g. attribute values or count()) are returned as is.
+        """
+        if IS_LXML:
+            result = self._root.xpath(expression)
+        else:
+            if expression.startswith('/'):
+                expression = '.' + expression
+            result = self._document.findall(expression)
+
+        if not isinstance(result, list):
+            return result
+
+        return [self._elements.get(x, x) for x in result]
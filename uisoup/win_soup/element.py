@@ -18,14 +18,17 @@ __author__ = 'f1ashhimself@gmail.com'
 
 import ctypes
 import ctypes.wintypes
+import functools
+import time
 import comtypes
 import comtypes.automation
 import comtypes.client
 
 from .mouse import WinMouse
+from .window_info import WinWindowTable
 from ..interfaces.i_element import IElement
 from ..utils.win_utils import WinUtils
-from .. import TooSaltyUISoupException
+from ..utils.element_cache import ElementCache
 
 if WinUtils.is_python_3():
     xrange = range
@@ -33,6 +36,22 @@ if WinUtils.is_python_3():
 CO_E_OBJNOTCONNECTED = -2147220995
 
 
+def _cached(fn):
+    """
+    Serves property from element property cache when it is enabled.
+
+    :param fn: property getter.
+    :return: wrapped getter.
+    """
+    str_property = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(self):
+        return self._get_cached_property(str_property, fn)
+
+    return wrapper
+
+
 class WinElement(IElement):
     """
     http://msdn.microsoft.com/en-us/library/dd318466(v=VS.85).aspx
@@ -105,7 +124,39 @@ class WinElement(IElement):
         64: u'obtn'  # OutlineButton
     }
 
+    # Each property is a COM call, parent count walks accParent chain.
+    _acc_property_costs = {
+        'role': 1,
+        'role_name': 1,
+        'name': 2,
+        'value': 2,
+        'description': 2,
+        'location': 2,
+        'c_name': 5,
+        'selection': 8,
+        'child_count': 8,
+        'parent_count': 20,
+    }
+
     _mouse = WinMouse()
+    _is_element_cache_enabled = True
+
+    # Seconds during which property values read from COM are reused, None
+    # disables property cache. Cache is also dropped after UI actions.
+    PROPERTY_CACHE_TTL = None
+
+    # Prefetched property name -> cached getters that serve it.
+    _prefetch_getters = {
+        'role': ('_role',),
+        'role_name': ('_role',),
+        'name': ('acc_name',),
+        'c_name': ('_role', 'acc_name'),
+        'location': ('acc_location',),
+        'value': ('acc_value',),
+        'description': ('acc_description',),
+        'child_count': ('acc_child_count',),
+        'state': ('_acc_state',),
+    }
 
     class _StateFlag(object):
         SYSTEM_NORMAL = 0
@@ -151,33 +202,21 @@ class WinElement(IElement):
         REMOVESELECTION = 0x10
         VALID = 0x20
 
-    class _EnumWindowsCallback(object):
-
-        same_proc_handles = set()
-
-        @classmethod
-        def callback(cls, handle, proc_id):
-
-            curr_proc_id = ctypes.c_long()
-
-            ctypes.windll.user32.GetWindowThreadProcessId(
-                handle, ctypes.byref(curr_proc_id))
-
-            if curr_proc_id.value == proc_id:
-                cls.same_proc_handles.add(handle)
-
-            return True
-
-    def __init__(self, obj_handle, i_object_id):
+    def __init__(self, obj_handle, i_object_id, lineage=None, depth=None):
         """
         Constructor.
 
         :param obj_handle: instance of i_accessible or window handle.
         :param int i_object_id: object id.
+        :param tuple lineage: parent element and index of element among
+        parent children, used to build element key.
+        :param int depth: parent count of element if it is known.
         """
         if isinstance(obj_handle, comtypes.gen.Accessibility.IAccessible):
             i_accessible = obj_handle
         else:
+            # Element of window handle is the root of its window path.
+            lineage = ()
             i_accessible = ctypes.POINTER(
                 comtypes.gen.Accessibility.IAccessible)()
             ctypes.oledll.oleacc.AccessibleObjectFromWindow(
@@ -188,7 +227,57 @@ class WinElement(IElement):
 
         self._i_accessible = i_accessible
         self._i_object_id = i_object_id
-        self._cached_children = set()
+        self._lineage = lineage
+        self._depth = depth
+        self._key = None
+        # Property name -> (value, read time, cache generation).
+        self._cached_properties = dict()
+
+    def _get_cached_property(self, str_property, fn):
+        """
+        Gets property value from cache or reads and caches it.
+
+        :param str str_property: property name.
+        :param fn: property getter.
+        :return: property value.
+        """
+        entry = self._cached_properties.get(str_property)
+        # Prefetched values have no read time and don't expire by TTL.
+        if entry is not None and entry[1] is None and \
+                entry[2] == ElementCache._generation:
+            return entry[0]
+
+        if self.PROPERTY_CACHE_TTL is None:
+            return fn(self)
+
+        now = time.time()
+        if entry is None or entry[2] != ElementCache._generation or \
+                now - entry[1] > self.PROPERTY_CACHE_TTL:
+            entry = (fn(self), now, ElementCache._generation)
+            self._cached_properties[str_property] = entry
+
+        return entry[0]
+
+    def refresh(self):
+        self._cached_properties.clear()
+
+    @classmethod
+    def _prefetch(cls, elements, properties):
+        # MSAA has no bulk property access, so every requested property is
+        # read once per element and kept until refresh or UI action.
+        set_getters = set()
+        for str_property in properties:
+            set_getters.update(cls._prefetch_getters.get(str_property, ()))
+
+        for obj_element in elements:
+            for str_getter in set_getters:
+                try:
+                    value = getattr(obj_element, str_getter)
+                except:
+                    continue
+
+                obj_element._cached_properties[str_getter] = \
+                    (value, None, ElementCache._generation)
 
     def _check_state(self, state):
         """
@@ -208,23 +297,21 @@ class WinElement(IElement):
         :rtype: list
         :return: list of windows.
         """
-        enum_windows_proc = \
-            ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_long,
-                               ctypes.c_long)
-        self._EnumWindowsCallback.same_proc_handles = set()
-        ctypes.windll.user32.EnumWindows(
-            enum_windows_proc(
-                self._EnumWindowsCallback.callback), self.proc_id)
-
-        if self._hwnd in self._EnumWindowsCallback.same_proc_handles:
-            self._EnumWindowsCallback.same_proc_handles.remove(self._hwnd)
-
-        result = [WinElement(hwnd, 0) for hwnd in
-                  self._EnumWindowsCallback.same_proc_handles]
+        hwnd = self._hwnd
+        result = []
+        for obj_window in WinWindowTable.get_by_proc(self.proc_id):
+            if obj_window.hwnd == hwnd:
+                continue
+            try:
+                result.append(obj_window.element)
+            except:
+                # Window was closed after enumeration.
+                continue
 
         return result
 
     @property
+    @_cached
     def _hwnd(self):
         """
         Property for window handler.
@@ -236,6 +323,7 @@ class WinElement(IElement):
         return hwnd.value
 
     @property
+    @_cached
     def _role(self):
         """
         Property for element role.
@@ -263,6 +351,7 @@ class WinElement(IElement):
         y += y_offset if y_offset is not None else h / 2
 
         self._mouse.click(x, y)
+        ElementCache.invalidate_all()
 
     def right_click(self, x_offset=0, y_offset=0):
         x, y, w, h = self.acc_location
@@ -270,6 +359,7 @@ class WinElement(IElement):
         y += y_offset if y_offset is not None else h / 2
 
         self._mouse.click(x, y, self._mouse.RIGHT_BUTTON)
+        ElementCache.invalidate_all()
 
     def double_click(self, x_offset=0, y_offset=0):
         x, y, w, h = self.acc_location
@@ -277,6 +367,7 @@ class WinElement(IElement):
         y += y_offset if y_offset is not None else h / 2
 
         self._mouse.double_click(x, y)
+        ElementCache.invalidate_all()
 
     def drag_to(self, x, y, x_offset=None, y_offset=None, smooth=True):
         el_x, el_y, el_w, el_h = self.acc_location
@@ -284,6 +375,49 @@ class WinElement(IElement):
         el_y += y_offset if y_offset is not None else el_h / 2
 
         self._mouse.drag(el_x, el_y, x, y, smooth)
+        ElementCache.invalidate_all()
+
+    @property
+    def key(self):
+        """
+        Window handle, child id and path of child indexes from the element
+        of that window. Path of elements which origin is unknown (e.g.
+        parent or element by coordinates) starts with address of their COM
+        object. Key is computed on first access.
+        """
+        if self._key is None:
+            if self._lineage:
+                obj_parent, index = self._lineage
+                parent_hwnd, _, parent_path = obj_parent.key
+                # Simple children belong to window of their container.
+                hwnd = parent_hwnd if \
+                    self._i_accessible is obj_parent._i_accessible else \
+                    self._get_hwnd_safely()
+                path = parent_path + (index,) if hwnd == parent_hwnd else ()
+            elif self._lineage is None:
+                hwnd = self._get_hwnd_safely()
+                i_unknown = self._i_accessible.QueryInterface(
+                    comtypes.IUnknown)
+                path = ((ctypes.cast(i_unknown, ctypes.c_void_p).value,),)
+            else:
+                hwnd = self._get_hwnd_safely()
+                path = ()
+
+            self._key = hwnd, self._i_object_id, path
+
+        return self._key
+
+    def _get_hwnd_safely(self):
+        """
+        Safely gets window handle.
+
+        :rtype: int
+        :return: window handle, 0 if it can't be retrieved.
+        """
+        try:
+            return self._hwnd
+        except OSError:
+            return 0
 
     @property
     def proc_id(self):
@@ -317,15 +451,21 @@ class WinElement(IElement):
 
     @property
     def acc_parent_count(self):
-        parent_count = 0
-        parent = self.acc_parent
-        while parent:
-            parent_count += 1
-            parent = parent.acc_parent
+        # Depth is passed to children and parents, so accParent chain is
+        # walked only for elements of unknown origin.
+        if self._depth is None:
+            parent_count = 0
+            parent = self.acc_parent
+            while parent:
+                parent_count += 1
+                parent = parent.acc_parent
 
-        return parent_count
+            self._depth = parent_count
+
+        return self._depth
 
     @property
+    @_cached
     def acc_child_count(self):
         if self._i_object_id == 0:
             return self._get_child_count_safely(self._i_accessible)
@@ -333,6 +473,7 @@ class WinElement(IElement):
             return 0
 
     @property
+    @_cached
     def acc_name(self):
         obj_child_id = comtypes.automation.VARIANT()
         obj_child_id.vt = comtypes.automation.VT_I4
@@ -348,12 +489,14 @@ class WinElement(IElement):
 
     def set_focus(self):
         self._select(self._SelectionFlag.TAKEFOCUS)
+        ElementCache.invalidate_all()
 
     @property
     def acc_c_name(self):
         return self.acc_role_name + self.acc_name if self.acc_name else ''
 
     @property
+    @_cached
     def acc_location(self):
         obj_child_id = comtypes.automation.VARIANT()
         obj_child_id.vt = comtypes.automation.VT_I4
@@ -371,6 +514,7 @@ class WinElement(IElement):
         return obj_l.value, obj_t.value, obj_w.value, obj_h.value
 
     @property
+    @_cached
     def acc_value(self):
         obj_child_id = comtypes.automation.VARIANT()
         obj_child_id.vt = comtypes.automation.VT_I4
@@ -387,8 +531,10 @@ class WinElement(IElement):
         obj_child_id.value = self._i_object_id
 
         self._i_accessible._IAccessible__com__set_accValue(obj_child_id, value)
+        ElementCache.invalidate_all()
 
     @property
+    @_cached
     def acc_description(self):
         obj_child_id = comtypes.automation.VARIANT()
         obj_child_id.vt = comtypes.automation.VT_I4
@@ -403,8 +549,9 @@ class WinElement(IElement):
     def acc_parent(self):
         result = None
         if self._i_accessible.accParent:
-            result = \
-                WinElement(self._i_accessible.accParent, self._i_object_id)
+            result = WinElement(
+                self._i_accessible.accParent, self._i_object_id,
+                depth=None if self._depth is None else self._depth - 1)
 
         return result
 
@@ -417,6 +564,7 @@ class WinElement(IElement):
         return obj_children.value
 
     @property
+    @_cached
     def _acc_state(self):
         obj_child_id = comtypes.automation.VARIANT()
         obj_child_id.vt = comtypes.automation.VT_I4
@@ -454,84 +602,36 @@ class WinElement(IElement):
             obj_acc_child_array,
             ctypes.byref(obj_acc_child_count))
 
+        # Depth of element is found once, children get it from here.
+        # Simple children share accessible object of their container, so
+        # they have the same accParent chain.
+        depth = self.acc_parent_count
         for i in xrange(obj_acc_child_count.value):
             obj_acc_child = obj_acc_child_array[i]
             if obj_acc_child.vt == comtypes.automation.VT_DISPATCH:
                 yield WinElement(obj_acc_child.value.QueryInterface(
-                    comtypes.gen.Accessibility.IAccessible), 0)
+                    comtypes.gen.Accessibility.IAccessible), 0, (self, i),
+                    depth + 1)
             else:
-                yield WinElement(self._i_accessible, obj_acc_child.value)
+                yield WinElement(self._i_accessible, obj_acc_child.value,
+                                 (self, i), depth)
 
-    def __findcacheiter(self, only_visible, **kwargs):
-        """
-        Find child element in the cache.
+    def _get_search_children(self):
+        if not self.acc_child_count:
+            return []
 
-        :param bool only_visible: flag that indicates will we search only
-        :rtype: WinElement
-        :return: yield found element.
-        """
-        for obj_element in self._cached_children:
-            if obj_element._match(only_visible, **kwargs):
-                yield obj_element
+        # Skip children that refer back to the same accessible object.
+        return [el for el in self if el._i_accessible != self._i_accessible]
 
-    def _finditer(self, only_visible, **kwargs):
-        """
-        Find child element.
-
-        :param bool only_visible: flag that indicates will we search only
-        :rtype: WinElement
-        :return: yield found element.
-        """
-        lst_queue = list(self)
-
-        if self.is_top_level_window:
-            lst_queue.extend(self._find_windows_by_same_proc())
-
-        while lst_queue:
-            obj_element = lst_queue.pop(0)
-            self._cached_children.add(obj_element)
-
-            if obj_element._match(only_visible, **kwargs):
-                yield obj_element
-
-            if obj_element.acc_child_count:
-                childs = [el for el in list(obj_element) if
-                          el._i_accessible != obj_element._i_accessible]
-                lst_queue[:0] = childs
+    def _get_export_children(self):
+        if not self.acc_child_count:
+            return []
 
-    def find(self, only_visible=True, **kwargs):
-        try:
-            iter_ = next(self.__findcacheiter(only_visible, **kwargs)) if \
-                WinUtils.is_python_3() else self.__findcacheiter(
-                only_visible, **kwargs).next()
-            return iter_
-        except StopIteration:
-            try:
-                iter_ = next(self._finditer(only_visible, **kwargs)) if \
-                    WinUtils.is_python_3() else self.__findcacheiter(
-                    only_visible, **kwargs).next()
-                return iter_
-            except StopIteration:
-                items_ = kwargs.items() if WinUtils.is_python_3() else \
-                    kwargs.iteritems()
-                attrs = ['%s=%s' % (k, v) for k, v in items_]
-                raise TooSaltyUISoupException(
-                    'Can\'t find object with attributes "%s".' %
-                    '; '.join(attrs))
-
-    def findall(self, only_visible=True, **kwargs):
-        result = self._finditer(only_visible, **kwargs)
-        if result:
-            result = list(result)
-
-        return result
-
-    def is_object_exists(self, **kwargs):
-        try:
-            self.find(**kwargs)
-            return True
-        except TooSaltyUISoupException:
-            return False
+        # Simple children (list, menu and tree items) are kept, only full
+        # children that refer back to the same accessible object are
+        # skipped.
+        return [el for el in self if el._i_object_id or
+                el._i_accessible != self._i_accessible]
 
     def _get_child_count_safely(self, i_accessible):
         """
@@ -17,66 +17,10 @@
 __author__ = 'f1ashhimself@gmail.com'
 
 import ctypes
-from time import sleep
 
 from ..interfaces.i_keyboard import Key, IKeyboard
-
-send_input = ctypes.windll.user32.SendInput
-pointer_unsigned_long = ctypes.POINTER(ctypes.c_ulong)
-
-
-class KeyboardInput(ctypes.Structure):
-    """
-    Keyboard input C struct definition.
-    """
-
-    _fields_ = [("wVk", ctypes.c_ushort),
-                ("wScan", ctypes.c_ushort),
-                ("dwFlags", ctypes.c_ulong),
-                ("time", ctypes.c_ulong),
-                ("dwExtraInfo", pointer_unsigned_long)]
-
-
-class HardwareInput(ctypes.Structure):
-    """
-    Hardware input C struct definition.
-    """
-
-    _fields_ = [("uMsg", ctypes.c_ulong),
-                ("wParamL", ctypes.c_short),
-                ("wParamH", ctypes.c_ushort)]
-
-
-class MouseInput(ctypes.Structure):
-    """
-    Hardware input C struct definition.
-    """
-
-    _fields_ = [("dx", ctypes.c_long),
-                ("dy", ctypes.c_long),
-                ("mouseData", ctypes.c_ulong),
-                ("dwFlags", ctypes.c_ulong),
-                ("time", ctypes.c_ulong),
-                ("dwExtraInfo", pointer_unsigned_long)]
-
-
-class EventStorage(ctypes.Union):
-    """
-    Event storage C struct definition.
-    """
-
-    _fields_ = [("ki", KeyboardInput),
-                ("mi", MouseInput),
-                ("hi", HardwareInput)]
-
-
-class Input(ctypes.Structure):
-    """
-    Input C struct definition.
-    """
-
-    _fields_ = [("type", ctypes.c_ulong),
-                ("ii", EventStorage)]
+from ..utils.element_cache import ElementCache
+from ..utils.win_input import KeyboardInput, EventStorage, Input
 
 
 class WinKeyboard(IKeyboard):
@@ -215,7 +159,9 @@ class WinKeyboard(IKeyboard):
         ii_ = EventStorage()
         ii_.ki = KeyboardInput(hex_key_code, 0x48, 0, 0, ctypes.pointer(extra))
         x = Input(ctypes.c_ulong(1), ii_)
-        send_input(1, ctypes.pointer(x), ctypes.sizeof(x))
+        ctypes.windll.user32.SendInput(1, ctypes.pointer(x),
+                                       ctypes.sizeof(x))
+        ElementCache.invalidate_all()
 
     def release_key(self, hex_key_code):
         """
@@ -228,7 +174,9 @@ class WinKeyboard(IKeyboard):
         ii_.ki = KeyboardInput(
             hex_key_code, 0x48, 0x0002, 0, ctypes.pointer(extra))
         x = Input(ctypes.c_ulong(1), ii_)
-        send_input(1, ctypes.pointer(x), ctypes.sizeof(x))
+        ctypes.windll.user32.SendInput(1, ctypes.pointer(x),
+                                       ctypes.sizeof(x))
+        ElementCache.invalidate_all()
 
     def send(self, *args, **kwargs):
         """
@@ -239,19 +187,4 @@ class WinKeyboard(IKeyboard):
 
         :param args: keys to send.
         """
-        delay = kwargs.get('delay', 0)
-
-        for key in args:
-            if key.children:
-                self.press_key_and_hold(key.code)
-                self.send(*key.children)
-                self.release_key(key.code)
-            else:
-                self.press_key(key.code)
-            self._wait_for_key_combo_to_be_processed()
-            sleep(delay)
-
-    def _wait_for_key_combo_to_be_processed(self):
-        # For key combinations timeout is needed to be processed.
-        # This method is expressive shortcut to be used where needed.
-        sleep(.05)
+        self._send_keys(args, kwargs.get('delay', 0))
@@ -18,14 +18,13 @@ __author__ = 'f1ashhimself@gmail.com'
 
 import ctypes
 import ctypes.wintypes
-from time import sleep
+import time
 
 from ..interfaces.i_mouse import IMouse
+from ..utils.element_cache import ElementCache
+from ..utils.win_input import Input, build_mouse_inputs
 from ..utils.win_utils import WinUtils
 
-if WinUtils.is_python_3():
-    xrange = range
-
 
 class WinMouse(IMouse):
     _MOUSEEVENTF_MOVE = 0x0001  # mouse move
@@ -40,14 +39,99 @@ class WinMouse(IMouse):
     _MOUSEEVENTF_XUP = 0x0100  # X button up
     _MOUSEEVENTF_WHEEL = 0x0800  # wheel button is rotated
     _MOUSEEVENTF_HWHEEL = 0x01000  # wheel button is tilted
+    _MOUSEEVENTF_VIRTUALDESK = 0x4000  # map to entire virtual desktop
+
+    _SM_XVIRTUALSCREEN = 76
+    _SM_YVIRTUALSCREEN = 77
+    _SM_CXVIRTUALSCREEN = 78
+    _SM_CYVIRTUALSCREEN = 79
+
+    # Seconds during which screen metrics are reused, metrics are also
+    # reread when point is out of cached virtual desktop.
+    SCREEN_METRICS_TTL = 1.0
 
-    _SM_CXSCREEN = 0
-    _SM_CYSCREEN = 1
+    _screen_metrics = None
+    _screen_metrics_time = 0
 
     LEFT_BUTTON = u'b1c'
     RIGHT_BUTTON = u'b3c'
     _SUPPORTED_BUTTON_NAMES = [LEFT_BUTTON, RIGHT_BUTTON]
 
+    def __init__(self, submit=None):
+        """
+        Constructor.
+
+        :param submit: function that sends ctypes array of Input structs,
+        SendInput by default. It can be swapped e.g. to record events.
+        """
+        self._submit = submit or self._send_input
+
+    @classmethod
+    def _send_input(cls, inputs):
+        """
+        Sends events with one SendInput call.
+
+        :param inputs: ctypes array of Input structs.
+        :rtype: int
+        :return: number of sent events.
+        """
+        return ctypes.windll.user32.SendInput(len(inputs), inputs,
+                                              ctypes.sizeof(Input))
+
+    @classmethod
+    def _read_screen_metrics(cls):
+        """
+        Reads virtual desktop metrics.
+
+        :rtype: tuple[int]
+        :return: left, top, width and height of virtual desktop.
+        """
+        get_system_metrics = ctypes.windll.user32.GetSystemMetrics
+
+        return (get_system_metrics(cls._SM_XVIRTUALSCREEN),
+                get_system_metrics(cls._SM_YVIRTUALSCREEN),
+                get_system_metrics(cls._SM_CXVIRTUALSCREEN),
+                get_system_metrics(cls._SM_CYVIRTUALSCREEN))
+
+    @classmethod
+    def get_screen_metrics(cls, refresh=False):
+        """
+        Gets cached virtual desktop metrics.
+
+        :param bool refresh: flag that indicates will we reread metrics.
+        :rtype: tuple[int]
+        :return: left, top, width and height of virtual desktop.
+        """
+        now = time.time()
+        if refresh or cls._screen_metrics is None or \
+                now - cls._screen_metrics_time > cls.SCREEN_METRICS_TTL:
+            cls._screen_metrics = cls._read_screen_metrics()
+            cls._screen_metrics_time = now
+
+        return cls._screen_metrics
+
+    def _build_inputs(self, events):
+        """
+        Builds Input structs for mouse events.
+
+        :param list[tuple] events: list of (flags, x, y, data), coordinates
+        of absolute events are screen coordinates.
+        :return: ctypes array of Input structs.
+        """
+        return build_mouse_inputs(events, self.get_screen_metrics)
+
+    def _do_events(self, events):
+        """
+        Sends mouse events in one batch.
+
+        :param list[tuple] events: list of (flags, x, y, data), see _do_event.
+        """
+        if events:
+            self._submit(self._build_inputs(events))
+            # Input could change UI, so cached elements and properties
+            # can't be trusted anymore.
+            ElementCache.invalidate_all()
+
     def _compose_mouse_event(self, name, press=True, release=False):
         """
         Composes mouse event based on button name and action flags.
@@ -112,32 +196,35 @@ class WinMouse(IMouse):
         :param int extra_info: value with additional value associated with
         the mouse event.
         """
-        x_metric = ctypes.windll.user32.GetSystemMetrics(self._SM_CXSCREEN)
-        y_metric = ctypes.windll.user32.GetSystemMetrics(self._SM_CYSCREEN)
-        x_calc = 65536 * x / x_metric + 1
-        y_calc = 65536 * y / y_metric + 1
-        ctypes.windll.user32.mouse_event(
-            flags, int(x_calc), int(y_calc), data, extra_info)
+        self._do_events([(flags, x, y, data)])
 
-    def move(self, x, y, smooth=True):
+    def move(self, x, y, smooth=True, motion_profile=None):
         WinUtils.verify_xy_coordinates(x, y)
 
         old_x, old_y = self.get_position()
+        lst_path = self._get_motion_path(old_x, old_y, x, y, motion_profile)
+        flags = self._MOUSEEVENTF_MOVE + self._MOUSEEVENTF_ABSOLUTE
 
-        for i in xrange(100):
-            intermediate_x = old_x + (x - old_x) * (i + 1) / 100.0
-            intermediate_y = old_y + (y - old_y) * (i + 1) / 100.0
-            smooth and sleep(.01)
+        if not smooth:
+            # Whole path is sent in one SendInput call.
+            self._do_events([(flags, int(point_x), int(point_y), 0) for
+                             point_x, point_y, _ in lst_path])
+            return
 
-            self._do_event(self._MOUSEEVENTF_MOVE + self._MOUSEEVENTF_ABSOLUTE,
-                           int(intermediate_x), int(intermediate_y), 0, 0)
+        # Every point has its own deadline, so paced path is sent by one
+        # SendInput call per point. Batching it would deliver all points at
+        # once, which is what smooth=False does.
+        self._play_motion_path(
+            lst_path,
+            lambda point_x, point_y: self._do_events(
+                [(flags, int(point_x), int(point_y), 0)]))
 
-    def drag(self, x1, y1, x2, y2, smooth=True):
+    def drag(self, x1, y1, x2, y2, smooth=True, motion_profile=None):
         WinUtils.verify_xy_coordinates(x1, y1)
         WinUtils.verify_xy_coordinates(x2, y2)
 
         self.press_button(x1, y1, self.LEFT_BUTTON)
-        self.move(x2, y2, smooth=smooth)
+        self.move(x2, y2, smooth=smooth, motion_profile=motion_profile)
         self.release_button(self.LEFT_BUTTON)
 
     def press_button(self, x, y, button_name=LEFT_BUTTON):
@@ -174,12 +261,9 @@ class WinMouse(IMouse):
                                           self._SUPPORTED_BUTTON_NAMES)
 
         self.move(x, y)
-        self._do_event(
-            self._compose_mouse_event(button_name, press=True, release=True),
-            0, 0, 0, 0)
-        self._do_event(
-            self._compose_mouse_event(button_name, press=True, release=True),
-            0, 0, 0, 0)
+        flags = self._compose_mouse_event(button_name, press=True,
+                                          release=True)
+        self._do_events([(flags, 0, 0, 0), (flags, 0, 0, 0)])
 
     def get_position(self):
         obj_point = ctypes.wintypes.POINT()
@@ -29,6 +29,7 @@ from ..utils.win_utils import WinUtils
 from .. import TooSaltyUISoupException
 from ..interfaces.i_soup import ISoup
 from .element import WinElement
+from .window_info import WinWindowInfo, WinWindowTable
 from .mouse import WinMouse
 from .keyboard import WinKeyboard
 
@@ -44,25 +45,6 @@ class WinSoup(ISoup):
     keyboard = WinKeyboard()
     _default_sys_encoding = sys.stdout.encoding or sys.getdefaultencoding()
 
-    class _EnumWindowsCallback(object):
-
-        last_handle = None
-
-        @classmethod
-        def callback(cls, handle, wildcard):
-            wildcard = ctypes.cast(wildcard, ctypes.c_wchar_p).value
-
-            wildcard = WinUtils.replace_inappropriate_symbols(wildcard)
-            length = ctypes.windll.user32.GetWindowTextLengthW(handle) + 1
-            buff = ctypes.create_unicode_buffer(length)
-            ctypes.windll.user32.GetWindowTextW(handle, buff, length)
-            win_text = WinUtils.replace_inappropriate_symbols(buff.value)
-
-            if re.match(wildcard, win_text):
-                cls.last_handle = handle
-
-            return True
-
     def get_object_by_coordinates(self, x, y):
         obj_point = ctypes.wintypes.POINT()
         obj_point.x = x
@@ -77,35 +59,103 @@ class WinSoup(ISoup):
         return WinElement(i_accessible, obj_child_id.value or 0)
 
     def is_window_exists(self, obj_handle):
+        if isinstance(obj_handle, basestring):
+            return bool(self._find_window_records(unicode(obj_handle),
+                                                  limit=1))
+        if obj_handle not in (0, None):
+            return bool(ctypes.windll.user32.IsWindow(obj_handle))
+
         try:
             self.get_window(obj_handle)
             return True
         except TooSaltyUISoupException:
             return False
 
-    def get_window(self, obj_handle=None):
-        if obj_handle in (0, None):
+    def _find_window_records(self, pattern=None, pid=None, class_name=None,
+                             limit=None, only_visible=False):
+        """
+        Finds top level windows in shared window table. Process id and
+        class name are checked before title is read. Matches from cached
+        table are revalidated and their titles are read again, so windows
+        closed or renamed by input are not reported. Table is rebuilt once
+        if nothing is found in cached one, so recently opened windows are
+        found.
+
+        :param str pattern: window title wildcard.
+        :param int pid: process id.
+        :param str class_name: window class name.
+        :param int limit: maximum number of windows to find.
+        :param bool only_visible: skip hidden windows.
+        :rtype: list[uisoup.win_soup.window_info.WinWindowInfo]
+        :return: list of matching windows in z-order.
+        """
+        regex = None
+        if pattern is not None:
+            regex = re.compile(WinUtils.replace_inappropriate_symbols(
+                WinUtils.convert_wildcard_to_regex(pattern)))
+
+        is_fresh_table = not WinWindowTable.is_fresh()
+        while True:
+            result = list()
+            is_stale_table = False
+            for obj_window in WinWindowTable.get_windows():
+                if limit is not None and len(result) >= limit:
+                    break
+                if pid is not None and obj_window.proc_id != pid:
+                    continue
+                if class_name is not None and \
+                        obj_window.class_name != class_name:
+                    continue
+                if not is_fresh_table and not obj_window.revalidate():
+                    is_stale_table = True
+                    continue
+                if only_visible and not obj_window.is_visible:
+                    continue
+                if regex and not regex.match(obj_window.title):
+                    continue
+                result.append(obj_window)
+
+            if is_stale_table:
+                WinWindowTable.invalidate()
+
+            if result or is_fresh_table:
+                return result
+
+            WinWindowTable.refresh()
+            is_fresh_table = True
+
+    def get_window(self, obj_handle=None, pid=None, class_name=None):
+        """
+        Gets window, if several windows match topmost one is returned.
+        When window is looked up only by process id hidden windows are
+        skipped, as processes often own hidden helper windows (IME, GDI+)
+        that are above their main window.
+
+        :param str | int obj_handle: window name (string) or window
+        handler (int) otherwise Desktop Window will be checked.
+        :param int pid: process id window should belong to.
+        :param str class_name: window class name.
+        :rtype: uisoup.win_soup.element.WinElement
+        :return: window object.
+        """
+        if isinstance(obj_handle, basestring) or pid is not None or \
+                class_name is not None:
+            obj_name = obj_handle and unicode(obj_handle)
+
+            lst_windows = self._find_window_records(
+                obj_name, pid, class_name, limit=1,
+                only_visible=obj_name is None and class_name is None)
+
+            if not lst_windows:
+                obj_name = (obj_name or '').encode(
+                    self._default_sys_encoding, errors='ignore')
+                raise TooSaltyUISoupException(
+                    'Can\'t find window "%s" (pid=%r, class_name=%r).' %
+                    (obj_name, pid, class_name))
+
+            obj_handle = lst_windows[0].hwnd
+        elif obj_handle in (0, None):
             obj_handle = ctypes.windll.user32.GetDesktopWindow()
-        elif isinstance(obj_handle, basestring):
-            obj_name = unicode(obj_handle)
-
-            regex = WinUtils.convert_wildcard_to_regex(obj_name)
-
-            enum_windows_proc = \
-                ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.POINTER(ctypes.c_int),
-                                   ctypes.POINTER(ctypes.c_int))
-            self._EnumWindowsCallback.last_handle = None
-            ctypes.windll.user32.EnumWindows(enum_windows_proc(
-                self._EnumWindowsCallback.callback),
-                ctypes.c_wchar_p(regex))
-
-            obj_handle = self._EnumWindowsCallback.last_handle
-
-            if not obj_handle:
-                obj_name = obj_name.encode(self._default_sys_encoding,
-                                           errors='ignore')
-                raise TooSaltyUISoupException('Can\'t find window "%s".' %
-                                              obj_name)
 
         try:
             return WinElement(obj_handle, 0)
@@ -113,20 +163,81 @@ class WinSoup(ISoup):
             raise TooSaltyUISoupException(
                 'Error when retrieving window with handle=%r' % obj_handle)
 
-    def get_visible_window_list(self):
-        result = self.get_window().findall(
-            only_visible=True,
-            name=lambda x: x,
-            role_name=lambda x: x in ['frm', 'pane'],
-            location=lambda x: 0 not in x[2:])
+    def get_windows(self, pattern=None, pid=None, class_name=None,
+                    limit=None):
+        """
+        Gets all top level windows that match conditions.
+
+        :param str pattern: window title wildcard, any title if None.
+        :param int pid: process id windows should belong to.
+        :param str class_name: window class name.
+        :param int limit: maximum number of windows to get.
+        :rtype: list[uisoup.win_soup.element.WinElement]
+        :return: list of windows in z-order.
+        """
+        result = list()
+        for obj_window in self._find_window_records(
+                pattern and unicode(pattern), pid, class_name, limit):
+            try:
+                result.append(obj_window.element)
+            except:
+                # Window was closed after enumeration.
+                continue
+
+        return result
+
+    def get_visible_window_records(self, limit=None):
+        """
+        Gets records of visible top level windows without creating
+        elements for them.
+
+        :param int limit: maximum number of windows to get.
+        :rtype: list[uisoup.win_soup.window_info.WinWindowInfo]
+        :return: list of visible windows in z-order.
+        """
+        result = list()
+        for obj_window in WinWindowInfo.enumerate():
+            if limit is not None and len(result) >= limit:
+                break
+            if obj_window.is_shown:
+                result.append(obj_window)
+
+        return result
+
+    def get_visible_window_list(self, limit=None):
+        result = list()
+        for obj_window in self.get_visible_window_records():
+            if limit is not None and len(result) >= limit:
+                break
+            try:
+                result.append(obj_window.element)
+            except:
+                # Window was closed after enumeration.
+                continue
 
         return result
 
-    def get_visible_object_list(self, window_name):
+    def get_visible_object_list(self, window_name, limit=None):
         window = self.get_window(window_name)
         objects = window.findall(
             only_visible=True,
+            limit=limit,
             role_name=lambda x: x != 'frm',
             location=lambda x: 0 not in x[2:])
 
         return objects
+
+    def _get_capture_handles(self):
+        # COM objects can't be used in other threads, so windows are
+        # passed by handle.
+        return [obj_window.hwnd for obj_window in
+                self.get_visible_window_records()]
+
+    def _capture_window(self, handle, properties=None, max_depth=None):
+        return self.get_window(handle).snapshot(properties, max_depth)
+
+    def _init_capture_thread(self):
+        comtypes.CoInitialize()
+
+    def _uninit_capture_thread(self):
+        comtypes.CoUninitialize()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+
+#    Copyright (c) 2014-2017 Max Beloborodko.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+__author__ = 'f1ashhimself@gmail.com'
+
+import ctypes
+import ctypes.wintypes
+import threading
+import time
+
+from ..utils.win_utils import WinUtils
+from ..utils.element_cache import ElementCache
+
+
+class WinWindowInfo(object):
+    """
+    Lightweight record of top level window read by plain user32 calls.
+    Title is read on first access and element is created on first access,
+    so enumeration doesn't touch accessibility API.
+    """
+
+    __slots__ = ('hwnd', 'proc_id', 'class_name', 'is_visible', 'rect',
+                 '_title', '_element')
+
+    _CLASS_NAME_LENGTH = 256
+
+    def __init__(self, hwnd, proc_id, class_name, is_visible, rect):
+        """
+        Constructor.
+
+        :param int hwnd: window handle.
+        :param int proc_id: process id.
+        :param str class_name: window class name.
+        :param bool is_visible: indicates whether window is visible.
+        :param tuple[int] rect: left, top, width and height of window.
+        """
+        self.hwnd = hwnd
+        self.proc_id = proc_id
+        self.class_name = class_name
+        self.is_visible = is_visible
+        self.rect = rect
+        self._title = None
+        self._element = None
+
+    @classmethod
+    def from_hwnd(cls, hwnd):
+        """
+        Reads window record.
+
+        :param int hwnd: window handle.
+        :rtype: WinWindowInfo
+        :return: window record.
+        """
+        user32 = ctypes.windll.user32
+
+        proc_id = ctypes.wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(proc_id))
+
+        buff = ctypes.create_unicode_buffer(cls._CLASS_NAME_LENGTH)
+        user32.GetClassNameW(hwnd, buff, cls._CLASS_NAME_LENGTH)
+
+        obj_rect = ctypes.wintypes.RECT()
+        user32.GetWindowRect(hwnd, ctypes.byref(obj_rect))
+
+        return cls(hwnd, proc_id.value, buff.value,
+                   bool(user32.IsWindowVisible(hwnd)),
+                   (obj_rect.left, obj_rect.top,
+                    obj_rect.right - obj_rect.left,
+                    obj_rect.bottom - obj_rect.top))
+
+    @classmethod
+    def enumerate(cls):
+        """
+        Enumerates top level windows in one EnumWindows pass.
+
+        :rtype: list[WinWindowInfo]
+        :return: list of window records in z-order.
+        """
+        lst_handles = []
+
+        def callback(hwnd, _):
+            lst_handles.append(hwnd)
+            return True
+
+        enum_windows_proc = ctypes.WINFUNCTYPE(
+            ctypes.wintypes.BOOL, ctypes.wintypes.HWND,
+            ctypes.wintypes.LPARAM)
+        ctypes.windll.user32.EnumWindows(enum_windows_proc(callback), 0)
+
+        return [cls.from_hwnd(hwnd) for hwnd in lst_handles]
+
+    def revalidate(self):
+        """
+        Checks that window of record still exists and drops cached title
+        and visibility, so record of cached table can be trusted.
+
+        :rtype: bool
+        :return: True if window exists and belongs to the same process.
+        """
+        user32 = ctypes.windll.user32
+        if not user32.IsWindow(self.hwnd):
+            return False
+
+        # Handle of closed window can be reused by another process.
+        proc_id = ctypes.wintypes.DWORD()
+        user32.GetWindowThreadProcessId(self.hwnd, ctypes.byref(proc_id))
+        if proc_id.value != self.proc_id:
+            return False
+
+        self.is_visible = bool(user32.IsWindowVisible(self.hwnd))
+        self._title = None
+
+        return True
+
+    @property
+    def title(self):
+        """
+        Property for window title.
+        """
+        if self._title is None:
+            user32 = ctypes.windll.user32
+            length = user32.GetWindowTextLengthW(self.hwnd) + 1
+            buff = ctypes.create_unicode_buffer(length)
+            user32.GetWindowTextW(self.hwnd, buff, length)
+            self._title = WinUtils.replace_inappropriate_symbols(buff.value)
+
+        return self._title
+
+    @property
+    def is_shown(self):
+        """
+        Property that indicates whether window is visible, has title and
+        non zero size, i.e. can be listed as visible window.
+        """
+        return self.is_visible and 0 not in self.rect[2:] and \
+            bool(self.title)
+
+    @property
+    def element(self):
+        """
+        Property for window element.
+        """
+        if self._element is None:
+            from .element import WinElement
+
+            # Top level windows have 2 parents.
+            self._element = WinElement(self.hwnd, 0, depth=2)
+
+        return self._element
+
+    def __repr__(self):
+        return 'WinWindowInfo(hwnd=%r, proc_id=%r, class_name=%r)' % \
+            (self.hwnd, self.proc_id, self.class_name)
+
+
+class WinWindowTable(object):
+    """
+    Shared table of top level windows built by one enumeration. Table is
+    reused until it is older than TTL or UI action changes ElementCache
+    generation, refresh rebuilds it explicitly.
+    """
+
+    # Seconds during which table is reused.
+    TTL = 0.5
+
+    _windows = None
+    _by_hwnd = None
+    _by_proc = None
+    _build_time = 0
+    _generation = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def refresh(cls):
+        """
+        Rebuilds table.
+
+        :rtype: list[WinWindowInfo]
+        :return: list of window records in z-order.
+        """
+        lst_windows = WinWindowInfo.enumerate()
+        dct_by_proc = dict()
+        for obj_window in lst_windows:
+            dct_by_proc.setdefault(obj_window.proc_id, []).append(obj_window)
+
+        with cls._lock:
+            cls._windows = lst_windows
+            cls._by_hwnd = dict((obj_window.hwnd, obj_window) for
+                                obj_window in lst_windows)
+            cls._by_proc = dct_by_proc
+            cls._build_time = time.time()
+            cls._generation = ElementCache._generation
+
+        return lst_windows
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Drops table, it is rebuilt on next access.
+        """
+        with cls._lock:
+            cls._windows = None
+
+    @classmethod
+    def is_fresh(cls):
+        """
+        Indicates whether table can be reused.
+
+        :rtype: bool
+        :return: True if table is built and not expired.
+        """
+        return cls._windows is not None and \
+            cls._generation == ElementCache._generation and \
+            time.time() - cls._build_time <= cls.TTL
+
+    @classmethod
+    def get_windows(cls):
+        """
+        Gets top level windows.
+
+        :rtype: list[WinWindowInfo]
+        :return: list of window records in z-order.
+        """
+        if not cls.is_fresh():
+            return cls.refresh()
+
+        return cls._windows
+
+    @classmethod
+    def get_by_hwnd(cls, hwnd):
+        """
+        Gets top level window by handle.
+
+        :param int hwnd: window handle.
+        :rtype: WinWindowInfo
+        :return: window record or None.
+        """
+        cls.get_windows()
+
+        return cls._by_hwnd.get(hwnd)
+
+    @classmethod
+    def get_by_proc(cls, proc_id):
+        """
+        Gets top level windows of process.
+
+        :param int proc_id: process id.
+        :rtype: list[WinWindowInfo]
+        :return: list of window records in z-order.
+        """
+        cls.get_windows()
+
+        return list(cls._by_proc.get(proc_id, ()))